@@ -0,0 +1,85 @@
+"""
+Benchmark the Python complexity analyzer against the original engine.
+
+Usage: python benchmarks/bench_complexity.py [--depth N] [--repeat N]
+
+Times analysis of already-read source (parsing included) for:
+  * synthetic modules with closures nested --depth levels deep, where the
+    original engine re-walks every inner function once per enclosing one
+  * every Python file in the repository
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from legacy_complexity import LegacyComplexityAnalyzer  # noqa: E402
+
+from cognitive_guard.core.complexity import ComplexityAnalyzer  # noqa: E402
+
+
+def nested_closures(depth: int, copies: int = 20) -> str:
+    """Build a module of functions each nesting closures depth levels deep"""
+    lines: list[str] = []
+    for copy in range(copies):
+        for level in range(depth):
+            indent = "    " * level
+            lines.append(f"{indent}def level_{copy}_{level}(x):")
+            lines.append(f"{indent}    if x and x > {level}:")
+            lines.append(f"{indent}        for i in range(x):")
+            lines.append(f"{indent}            x = x - 1 if i else x")
+        lines.append("    " * depth + "return x")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def repository_sources() -> list[str]:
+    return [
+        path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(ROOT.rglob("*.py"))
+        if ".git" not in path.parts
+    ]
+
+
+def best_time(analyze: Callable[[str], object], sources: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for source in sources:
+            analyze(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=30, help="closure nesting depth")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (best is kept)")
+    args = parser.parse_args()
+
+    cases = {
+        f"nested closures (depth {args.depth})": [nested_closures(args.depth)],
+        "repository .py files": repository_sources(),
+    }
+    engines: dict[str, Callable[[str], object]] = {
+        "original": lambda source: LegacyComplexityAnalyzer().analyze_source(source),
+        "current": lambda source: ComplexityAnalyzer().analyze_source(source),
+    }
+
+    print(f"{'case':<32} {'engine':<10} {'seconds':>9} {'speedup':>8}")
+    for case, sources in cases.items():
+        baseline = None
+        for engine, analyze in engines.items():
+            seconds = best_time(analyze, sources, args.repeat)
+            baseline = baseline or seconds
+            print(f"{case:<32} {engine:<10} {seconds:>9.4f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
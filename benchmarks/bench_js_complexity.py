@@ -0,0 +1,135 @@
+"""
+Benchmark the JavaScript engine against Lizard on large bundles.
+
+Usage: python benchmarks/bench_js_complexity.py [--modules N] [--repeat N] [FILE ...]
+
+Times measuring already-read source, doc comments included, for:
+  * a synthetic webpack-style bundle of --modules modules mixing classes,
+    callbacks, arrow functions, template literals, regexes and JSDoc
+  * each FILE given, e.g. a real bundle from node_modules
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cognitive_guard.parsers.javascript import JavaScriptParser  # noqa: E402
+
+MODULE = """\
+/* {index} */ function(module, exports, __webpack_require__) {{
+  "use strict";
+  var utils = __webpack_require__({dependency});
+
+  /**
+   * Client for resource {index}.
+   */
+  class Client{index} extends utils.Base {{
+    constructor(options) {{
+      super(options);
+      this.retries = options && options.retries || 3;
+      this.pattern = /^\\/api\\/v\\d+\\/[\\w-]+$/i;
+    }}
+
+    /**
+     * Fetch a page of records, retrying on failure.
+     */
+    async fetch(page, filter) {{
+      for (let attempt = 0; attempt < this.retries; attempt++) {{
+        try {{
+          const response = await utils.request(`/api/v1/items/${{page}}?q=${{filter ?? ""}}`);
+          if (response.status === 200) {{
+            return response.body.items.filter(item => item.active && !item.deleted);
+          }} else if (response.status === 404) {{
+            return [];
+          }}
+        }} catch (error) {{
+          if (attempt === this.retries - 1) throw error;
+        }}
+      }}
+    }}
+
+    summarize(items) {{
+      return items.reduce((totals, item) => {{
+        switch (item.kind) {{
+          case "a": totals.a += item.value > 0 ? item.value : 0; break;
+          case "b": totals.b += 1; break;
+          default: if (item.value) totals.other += item.value;
+        }}
+        return totals;
+      }}, {{ a: 0, b: 0, other: 0 }});
+    }}
+  }}
+
+  function format{index}(value, depth) {{
+    if (depth > 3) return "...";
+    if (Array.isArray(value)) {{
+      return "[" + value.map(v => format{index}(v, depth + 1)).join(", ") + "]";
+    }}
+    return typeof value === "string" ? JSON.stringify(value) : String(value);
+  }}
+
+  exports.Client = Client{index};
+  exports.format = format{index};
+}}"""
+
+
+def bundle(modules: int) -> str:
+    """Build a webpack-style bundle of similar but distinct modules"""
+    body = ",\n".join(
+        MODULE.format(index=index, dependency=(index * 7) % modules) for index in range(modules)
+    )
+    return f"(function(modules) {{\n  return modules;\n}})([\n{body}\n]);\n"
+
+
+def lines(source: bytes) -> int:
+    return source.count(b"\n")
+
+
+def best_time(measure: Callable[[bytes], object], sources: list[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for source in sources:
+            measure(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=500, help="modules in the synthetic bundle")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best is kept)")
+    parser.add_argument("files", nargs="*", type=Path, help="real bundles to measure as well")
+    args = parser.parse_args()
+
+    synthetic = bundle(args.modules).encode()
+    cases = {f"synthetic bundle ({lines(synthetic)} lines)": [synthetic]}
+    for path in args.files:
+        source = path.read_bytes()
+        cases[f"{path.name} ({lines(source)} lines)"] = [source]
+
+    native = JavaScriptParser()
+    engines: dict[str, Callable[[bytes], object]] = {
+        "lizard": lambda source: native.fallback().parse_source(source, "bundle.js"),
+        "native": lambda source: native.parse_source(source, "bundle.js"),
+    }
+
+    print(f"{'case':<40} {'engine':<8} {'functions':>9} {'seconds':>9} {'speedup':>8}")
+    for case, sources in cases.items():
+        baseline = None
+        for engine, measure in engines.items():
+            functions = sum(len(measure(source)) for source in sources)
+            seconds = best_time(measure, sources, args.repeat)
+            baseline = baseline or seconds
+            print(
+                f"{case:<40} {engine:<8} {functions:>9} {seconds:>9.4f} {baseline / seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure peak memory of a full scan over a synthetic repository.
+
+Usage: python benchmarks/bench_memory.py [--files N] [--functions N] [--jobs N]
+
+Generates the repository in a temporary directory, scans it once without
+the result cache and reports the peak RSS of the scanning process along
+with the number of results kept alive.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cognitive_guard.core.config import Config  # noqa: E402
+from cognitive_guard.core.scanner import CodeScanner  # noqa: E402
+
+FUNCTION = '''
+def function_{index}(items, limit=None):
+    """Filter items, optionally up to a limit"""
+    kept = []
+    for item in items:
+        if item is None or (limit is not None and len(kept) >= limit):
+            continue
+        try:
+            kept.append(item.value if hasattr(item, "value") else item)
+        except AttributeError:
+            pass
+    return kept
+'''
+
+
+def generate(root: Path, files: int, functions: int) -> None:
+    for file_index in range(files):
+        package = root / f"pkg{file_index % 20}"
+        package.mkdir(exist_ok=True)
+        source = "".join(FUNCTION.format(index=i) for i in range(functions))
+        (package / f"module{file_index}.py").write_text(source)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000, help="files to generate")
+    parser.add_argument("--functions", type=int, default=100, help="functions per file")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate(Path(tmpdir), args.files, args.functions)
+        os.chdir(tmpdir)
+
+        baseline = peak_rss_mb()
+        start = time.perf_counter()
+        results = CodeScanner(Config(), jobs=args.jobs).scan_all()
+        elapsed = time.perf_counter() - start
+
+        functions = sum(file.total_functions for file in results.files)
+        print(f"files:        {len(results.files)}")
+        print(f"functions:    {functions}")
+        print(f"scan time:    {elapsed:.2f}s")
+        print(f"peak RSS:     {peak_rss_mb():.1f} MB (before scan: {baseline:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Frozen copy of the original ComplexityAnalyzer, kept as a benchmark baseline.
+
+It walks the whole module with ast.walk and re-walks every function body in
+full, nested functions included, so nested code is traversed (and scored)
+once per enclosing function.
+"""
+
+import ast
+
+from cognitive_guard.core.complexity import ComplexityResult
+
+
+class LegacyComplexityAnalyzer:
+    """The analyzer as it was before single-pass analysis"""
+
+    def __init__(self) -> None:
+        self.complexity = 0
+        self.nesting_level = 0
+        self.function_name = None
+
+    def analyze_function(self, node):
+        self.complexity = 0
+        self.nesting_level = 0
+        self.function_name = node.name
+
+        self._analyze_node(node)
+
+        return ComplexityResult(
+            name=node.name,
+            line_number=node.lineno,
+            complexity=self.complexity,
+            has_docstring=ast.get_docstring(node) is not None,
+        )
+
+    def _analyze_node(self, node):
+        """Recursively analyze AST node for complexity"""
+        if isinstance(node, (ast.If, ast.While, ast.For, ast.AsyncFor)):
+            self.complexity += 1 + self.nesting_level
+            self._analyze_nested(node)
+        elif isinstance(node, (ast.ExceptHandler,)):
+            self.complexity += 1 + self.nesting_level
+            self._analyze_nested(node)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            self.complexity += 1
+            self._analyze_nested(node)
+        elif isinstance(node, ast.BoolOp):
+            self.complexity += len(node.values) - 1
+            for child in ast.iter_child_nodes(node):
+                self._analyze_node(child)
+        elif isinstance(node, ast.IfExp):
+            self.complexity += 1
+            for child in ast.iter_child_nodes(node):
+                self._analyze_node(child)
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name) and self.function_name:
+                if node.func.id == self.function_name:
+                    self.complexity += 2
+            for child in ast.iter_child_nodes(node):
+                self._analyze_node(child)
+        else:
+            for child in ast.iter_child_nodes(node):
+                self._analyze_node(child)
+
+    def _analyze_nested(self, node):
+        self.nesting_level += 1
+        for child in ast.iter_child_nodes(node):
+            self._analyze_node(child)
+        self.nesting_level -= 1
+
+    def analyze_source(self, source, filename="<unknown>"):
+        try:
+            tree = ast.parse(source, filename=filename)
+        except SyntaxError:
+            return []
+
+        return [
+            self.analyze_function(node)
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
@@ -3,19 +3,111 @@ Main CLI entry point for Cognitive Guard
 """
 
 import sys
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Optional
 
 import click
+from git import GitCommandError
 from rich.console import Console
 
+from cognitive_guard.core.cache import ResultCache
 from cognitive_guard.core.config import Config
-from cognitive_guard.core.scanner import CodeScanner
+from cognitive_guard.core.sarif import write_sarif
+from cognitive_guard.core.scanner import CodeScanner, FileResult, ScanResults
 from cognitive_guard.hooks.installer import HookInstaller
 from cognitive_guard.tui.app import CognitiveGuardApp
+from cognitive_guard.utils.profiler import profiler
 from cognitive_guard.utils.stats import StatsTracker
 
 console = Console()
+err_console = Console(stderr=True)
+
+jobs_option = click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parallel worker processes (default: CPU count)",
+)
+no_cache_option = click.option(
+    "--no-cache", is_flag=True, help="Re-analyze every file instead of using cached results"
+)
+format_option = click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "plain", "json", "ndjson", "sarif"]),
+    default=None,
+    help=(
+        "Output format (default: table on a terminal, plain otherwise); "
+        "plain, json, ndjson and sarif are written to stdout as results arrive"
+    ),
+)
+limit_option = click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only show the N most complex violations (table and plain formats)",
+)
+verbose_option = click.option(
+    "--verbose", "-v", is_flag=True, help="Show cache statistics and other diagnostics"
+)
+profile_option = click.option(
+    "--profile", is_flag=True, help="Show time spent per phase and the slowest files"
+)
+
+
+def parse_thresholds(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[list[int]]:
+    """Parse a comma-separated list of complexity thresholds"""
+    if value is None:
+        return None
+    try:
+        thresholds = sorted({int(item) for item in value.split(",") if item.strip()})
+    except ValueError:
+        raise click.BadParameter("expected comma-separated integers, e.g. 5,10,15,20") from None
+    if not thresholds or thresholds[0] < 1:
+        raise click.BadParameter("thresholds must be positive integers")
+    return thresholds
+
+
+def resolve_format(output_format: Optional[str], limit: Optional[int] = None) -> str:
+    """Pick the output format, defaulting to plain when stdout isn't a terminal"""
+    if output_format is None:
+        output_format = "table" if sys.stdout.isatty() else "plain"
+    if limit is not None and output_format not in ("table", "plain"):
+        raise click.UsageError("--limit only supports the table and plain formats")
+    return output_format
+
+
+def render_results(
+    results: ScanResults,
+    stream: Iterable[FileResult],
+    output_format: str,
+    limit: Optional[int] = None,
+) -> None:
+    """Consume a stream of file results into results, printing them as they arrive"""
+    # Scanning work pulled in by the renderer is profiled under its own phases
+    with profiler.phase("render"):
+        if output_format == "json":
+            results.write_json(sys.stdout, stream)
+        elif output_format == "ndjson":
+            results.write_ndjson(sys.stdout, stream)
+        elif output_format == "sarif":
+            write_sarif(sys.stdout, results, stream)
+        elif output_format == "plain":
+            results.write_plain(sys.stdout, stream, limit=limit)
+        else:
+            results.display_stream(console, stream, limit=limit)
+
+
+def report_cache(cache: Optional[ResultCache]) -> None:
+    """Print cache hit/miss counts to stderr"""
+    if cache is None:
+        err_console.print("[dim]Cache: disabled[/dim]")
+    else:
+        err_console.print(f"[dim]Cache: {cache.hits} hit(s), {cache.misses} miss(es)[/dim]")
 
 
 @click.group()
@@ -109,23 +201,57 @@ def init(force: bool, interactive: bool) -> None:
 
 @main.command()
 @click.option("--staged", is_flag=True, help="Only check staged files")
-@click.option("--json", "json_output", is_flag=True, help="Output results as JSON")
-def check(staged: bool, json_output: bool) -> None:
+@click.option("--since", metavar="REF", help="Only re-analyze files changed since a git ref")
+@click.option(
+    "--incremental", is_flag=True, help="Only re-analyze files changed since the last full scan"
+)
+@click.option("--json", "json_output", is_flag=True, help="Output results as JSON (--format json)")
+@format_option
+@limit_option
+@jobs_option
+@no_cache_option
+@verbose_option
+@profile_option
+def check(
+    staged: bool,
+    since: Optional[str],
+    incremental: bool,
+    json_output: bool,
+    output_format: Optional[str],
+    limit: Optional[int],
+    jobs: Optional[int],
+    no_cache: bool,
+    verbose: bool,
+    profile: bool,
+) -> None:
     """Check code for documentation violations"""
+    output_format = resolve_format("json" if json_output else output_format, limit)
+    if profile:
+        profiler.enable()
+
     try:
         config = Config.load()
-        scanner = CodeScanner(config)
+        cache = None if no_cache else ResultCache()
+        scanner = CodeScanner(config, jobs=jobs, cache=cache)
 
         if staged:
-            results = scanner.scan_staged()
+            stream = iter(scanner.scan_staged().files)
+        elif since or incremental:
+            stream = iter(scanner.scan_incremental(since).files)
         else:
-            results = scanner.scan_all()
+            stream = scanner.iter_scan()
 
-        if json_output:
+        # Results are printed while the scan runs and totalled as they go,
+        # keeping the files only for the snapshot
+        results = ScanResults(config=config, keep_files=not staged)
+        render_results(results, stream, output_format, limit)
 
-            console.print_json(data=results.to_dict())
-        else:
-            results.display(console)
+        if not staged:
+            scanner.save_snapshot(results)
+        if verbose:
+            report_cache(cache)
+        if profile:
+            profiler.display(err_console)
 
         if results.has_violations():
             sys.exit(1)
@@ -144,25 +270,82 @@ def check(staged: bool, json_output: bool) -> None:
 
 @main.command()
 @click.option("--fail-under", type=float, help="Fail if coverage is below this threshold (0.0-1.0)")
-def scan(fail_under: Optional[float]) -> None:
+@click.option(
+    "--thresholds",
+    callback=parse_thresholds,
+    help="Compare several complexity thresholds, e.g. 5,10,15,20",
+)
+@click.option("--rev", metavar="COMMIT", help="Scan a git revision without checking it out")
+@format_option
+@limit_option
+@jobs_option
+@no_cache_option
+@verbose_option
+@profile_option
+def scan(
+    fail_under: Optional[float],
+    thresholds: Optional[list[int]],
+    rev: Optional[str],
+    output_format: Optional[str],
+    limit: Optional[int],
+    jobs: Optional[int],
+    no_cache: bool,
+    verbose: bool,
+    profile: bool,
+) -> None:
     """Scan entire codebase and generate coverage report"""
+    if thresholds:
+        if output_format not in (None, "table") or limit is not None:
+            raise click.UsageError("--thresholds only supports the table format")
+        output_format = "table"
+    output_format = resolve_format(output_format, limit)
+    if profile:
+        profiler.enable()
+
     try:
         config = Config.load()
-        scanner = CodeScanner(config)
+        cache = None if no_cache else ResultCache()
+        scanner = CodeScanner(config, jobs=jobs, cache=cache)
 
-        console.print("[bold]🔍 Scanning codebase...[/bold]")
-        results = scanner.scan_all()
-        results.display(console)
+        # Keep machine-readable output on stdout free of status messages
+        status = console if output_format == "table" else err_console
+
+        if rev:
+            status.print(f"[bold]🔍 Scanning codebase at {rev}...[/bold]")
+            stream = iter(scanner.scan_revision(rev).files)
+        else:
+            status.print("[bold]🔍 Scanning codebase...[/bold]")
+            stream = scanner.iter_scan()
+
+        if thresholds:
+            results = ScanResults(files=list(stream), config=config)
+            console.print()
+            with profiler.phase("render"):
+                results.display_thresholds(console, thresholds)
+        else:
+            # Files are only kept for the snapshot, which isn't taken of a revision
+            results = ScanResults(config=config, keep_files=not rev)
+            render_results(results, stream, output_format, limit)
+
+        if not rev:
+            scanner.save_snapshot(results)
+        if verbose:
+            report_cache(cache)
+        if profile:
+            profiler.display(err_console)
 
         coverage = results.get_coverage()
         if fail_under is not None and coverage < fail_under:
-            console.print(
+            status.print(
                 f"\n[red]❌ Coverage {coverage:.1%} is below threshold {fail_under:.1%}[/red]"
             )
             sys.exit(1)
 
-        console.print("\n[green]✓[/green] Scan complete!")
+        status.print("\n[green]✓[/green] Scan complete!")
 
+    except GitCommandError:
+        console.print(f"[red]Error:[/red] Cannot read revision '{rev}'")
+        sys.exit(1)
     except FileNotFoundError:
         console.print("\n[red]❌ Configuration Error:[/red] No .cognitive-guard.yml found")
         console.print("\n[bold]How to fix:[/bold]")
@@ -176,14 +359,22 @@ def scan(fail_under: Optional[float]) -> None:
 
 
 @main.command()
-def tui() -> None:
+@jobs_option
+@profile_option
+def tui(jobs: Optional[int], profile: bool) -> None:
     """Launch interactive documentation assistant"""
+    if profile:
+        profiler.enable()
+
     try:
         config = Config.load()
-        scanner = CodeScanner(config)
+        scanner = CodeScanner(config, jobs=jobs, cache=ResultCache())
 
         console.print("[bold cyan]🔍 Scanning for violations...[/bold cyan]")
         results = scanner.scan_all()
+        # Before the TUI takes over the screen
+        if profile:
+            profiler.display(err_console)
 
         violations_count = results.get_total_violations()
 
@@ -211,12 +402,19 @@ def tui() -> None:
 
 
 @main.command()
-def stats() -> None:
+@jobs_option
+@profile_option
+def stats(jobs: Optional[int], profile: bool) -> None:
     """View documentation statistics and achievements"""
+    if profile:
+        profiler.enable()
+
     try:
         config = Config.load()
         tracker = StatsTracker(config)
-        tracker.display(console)
+        tracker.display(console, jobs=jobs)
+        if profile:
+            profiler.display(err_console)
 
     except FileNotFoundError:
         console.print("\n[red]❌ Configuration Error:[/red] No .cognitive-guard.yml found")
@@ -230,6 +428,66 @@ def stats() -> None:
         sys.exit(1)
 
 
+@main.command()
+@click.option(
+    "--last",
+    type=click.IntRange(min=1),
+    help="Number of commits to walk back from HEAD [default: 20 without --since]",
+)
+@click.option(
+    "--since", metavar="DATE", help="Only walk commits newer than a date, e.g. 2024-01-01"
+)
+@jobs_option
+@no_cache_option
+@verbose_option
+@profile_option
+def history(
+    last: Optional[int],
+    since: Optional[str],
+    jobs: Optional[int],
+    no_cache: bool,
+    verbose: bool,
+    profile: bool,
+) -> None:
+    """Show coverage and violations for each recent commit"""
+    if profile:
+        profiler.enable()
+
+    try:
+        config = Config.load()
+        cache = None if no_cache else ResultCache()
+        scanner = CodeScanner(config, jobs=jobs, cache=cache)
+
+        if last is None and since is None:
+            last = 20
+
+        console.print("[bold]🔍 Walking git history...[/bold]")
+        results = scanner.scan_history(last=last, since=since)
+        results.save()
+        if verbose:
+            report_cache(cache)
+
+        console.print()
+        with profiler.phase("render"):
+            results.display(console)
+        if profile:
+            profiler.display(err_console)
+
+    except GitCommandError as e:
+        console.print(f"[red]Error:[/red] Cannot read git history: {e.stderr.strip()}")
+        sys.exit(1)
+    except FileNotFoundError:
+        console.print("\n[red]❌ Configuration Error:[/red] No .cognitive-guard.yml found")
+        console.print("\n[bold]How to fix:[/bold]")
+        console.print("  1. Run: [cyan]cognitive-guard init --interactive[/cyan]")
+        console.print("  2. Or run: [cyan]cognitive-guard init[/cyan] for quick setup")
+        console.print("\n[dim]This will create .cognitive-guard.yml with default settings[/dim]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
 @main.command()
 def demo() -> None:
     """Run a quick demonstration of Cognitive Guard"""
@@ -331,7 +589,7 @@ def hook() -> None:
     """Run pre-commit hook (internal use)"""
     try:
         config = Config.load()
-        scanner = CodeScanner(config)
+        scanner = CodeScanner(config, cache=ResultCache())
 
         console.print("[bold cyan]🔍 Analyzing staged files...[/bold cyan]")
         results = scanner.scan_staged()
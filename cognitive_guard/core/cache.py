@@ -0,0 +1,163 @@
+"""Persistent, content-addressed cache of per-file analysis results"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from cognitive_guard import __version__
+from cognitive_guard.core.complexity import ComplexityResult
+
+# Bump when the on-disk layout or the cached fields change
+CACHE_FORMAT = 3
+
+# Files modified this recently may change again within the same mtime tick,
+# so their stat data isn't trusted on the next run and they get re-hashed
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Hash file content the same way git hashes blobs.
+
+    Using git's blob id as the cache key means content read from a git
+    object database can be looked up without hashing it again.
+    """
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def encode_results(results: list[ComplexityResult]) -> list[list[Any]]:
+    """Convert results into compact JSON-serializable rows"""
+    return [
+        [
+            r.name,
+            r.line_number,
+            r.complexity,
+            r.has_docstring,
+            r.end_line_number,
+            r.body_line_number,
+            r.metric,
+        ]
+        for r in results
+    ]
+
+
+def decode_results(rows: list[list[Any]]) -> list[ComplexityResult]:
+    """Convert rows made by encode_results back into results"""
+    return [ComplexityResult(*row) for row in rows]
+
+
+class ResultCache:
+    """
+    Caches each file's ComplexityResult list under .cognitive-guard/.
+
+    Results are keyed by content digest plus the parser that produced them,
+    so a file is only parsed again when its content or the parser changes.
+    A stat index (mtime and size per path) lets unchanged files skip reading
+    and hashing altogether.
+    """
+
+    def __init__(self, path: Path | None = None):
+        if path is None:
+            path = Path.cwd() / ".cognitive-guard" / "cache.json"
+
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._files: dict[str, list[Any]] = {}
+        self._results: dict[str, list[list[Any]]] = {}
+        self._used: set[str] = set()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """Load cache from file, starting empty if it's missing or stale"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("format") != CACHE_FORMAT or data.get("version") != __version__:
+            return
+
+        self._files = data.get("files", {})
+        self._results = data.get("results", {})
+
+    def save(self) -> None:
+        """Save cache to file if anything changed"""
+        if not self._dirty:
+            return
+
+        # Drop results no longer reachable from any known file, unless they
+        # were used in this session (e.g. blobs from a git revision)
+        live = {entry[2] for entry in self._files.values()}
+        self._results = {
+            key: rows
+            for key, rows in self._results.items()
+            if key in self._used or key.rpartition(":")[2] in live
+        }
+
+        data = {
+            "format": CACHE_FORMAT,
+            "version": __version__,
+            "files": self._files,
+            "results": self._results,
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def file_digest(self, file_path: Path) -> str | None:
+        """Get the content digest of a file, reading it only if its stat changed"""
+        key = str(file_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+
+        entry = self._files.get(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return str(entry[2])
+
+        try:
+            with open(file_path, "rb") as f:
+                digest = content_digest(f.read())
+        except OSError:
+            return None
+
+        if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+            self._files[key] = [st.st_mtime_ns, st.st_size, digest]
+        else:
+            self._files.pop(key, None)
+        self._dirty = True
+        return digest
+
+    def get(self, digest: str, parser_key: str) -> list[ComplexityResult] | None:
+        """Look up cached results for content analyzed by a given parser"""
+        key = f"{parser_key}:{digest}"
+        rows = self._results.get(key)
+        if rows is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used.add(key)
+        return decode_results(rows)
+
+    def has(self, digest: str, parser_key: str) -> bool:
+        """Check if results are cached, without decoding or counting them"""
+        return f"{parser_key}:{digest}" in self._results
+
+    def put(self, digest: str, parser_key: str, results: list[ComplexityResult]) -> None:
+        """Store results for content analyzed by a given parser"""
+        key = f"{parser_key}:{digest}"
+        self._results[key] = encode_results(results)
+        self._used.add(key)
+        self._dirty = True
@@ -1,19 +1,37 @@
 """Cognitive complexity analysis engine"""
 
 import ast
+import io
+import tokenize
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
+from cognitive_guard.utils.profiler import profiler
 
-@dataclass
+# Severity levels reported by ComplexityResult.severity, most severe first
+SEVERITIES = ("very_complex", "complex", "moderate", "simple")
+
+
+@dataclass(slots=True)
 class ComplexityResult:
-    """Result of complexity analysis for a single function"""
+    """
+    Result of complexity analysis for a single function.
+
+    Holds no reference to the syntax tree, so a file's AST can be freed as
+    soon as it has been analyzed. Line numbers are 1-based; end_line_number
+    and body_line_number are 0 when the parser doesn't provide them.
+    """
 
     name: str
     line_number: int
     complexity: int
     has_docstring: bool
-    node: Any = None
+    end_line_number: int = 0
+    # First line of the function body, where a docstring would be inserted
+    body_line_number: int = 0
+    # What complexity measures: "cognitive", or "cyclomatic" from Lizard
+    metric: str = "cognitive"
 
     @property
     def brain_score(self) -> int:
@@ -39,116 +57,198 @@ class ComplexityResult:
         return severity_map[self.severity]
 
 
+# Handlers take (node, nesting level, result being scored, all results) and
+# return the nesting level and result that the node's children belong to
+NodeHandler = Callable[
+    [Any, int, ComplexityResult, list[ComplexityResult]], tuple[int, ComplexityResult]
+]
+
+
+def _score_function(
+    node: ast.FunctionDef | ast.AsyncFunctionDef,
+    nesting: int,
+    result: ComplexityResult,
+    results: list[ComplexityResult],
+) -> tuple[int, ComplexityResult]:
+    """Start scoring a nested function on its own, from nesting level 0"""
+    first = node.body[0]
+    # A decorated statement starts at its first decorator
+    decorators = getattr(first, "decorator_list", ())
+    body_line = min([first.lineno, *(decorator.lineno for decorator in decorators)])
+
+    function = ComplexityResult(
+        name=node.name,
+        line_number=node.lineno,
+        complexity=0,
+        has_docstring=ast.get_docstring(node) is not None,
+        end_line_number=node.end_lineno or node.lineno,
+        body_line_number=body_line,
+    )
+    results.append(function)
+    return 0, function
+
+
+def _score_branch(
+    node: ast.AST, nesting: int, result: ComplexityResult, results: list[ComplexityResult]
+) -> tuple[int, ComplexityResult]:
+    """Control flow adds complexity that grows with nesting"""
+    result.complexity += 1 + nesting
+    return nesting + 1, result
+
+
+def _score_with(
+    node: ast.With | ast.AsyncWith,
+    nesting: int,
+    result: ComplexityResult,
+    results: list[ComplexityResult],
+) -> tuple[int, ComplexityResult]:
+    result.complexity += 1
+    return nesting + 1, result
+
+
+def _score_bool_op(
+    node: ast.BoolOp, nesting: int, result: ComplexityResult, results: list[ComplexityResult]
+) -> tuple[int, ComplexityResult]:
+    """Each extra operand of a boolean operator adds complexity"""
+    result.complexity += len(node.values) - 1
+    return nesting, result
+
+
+def _score_if_exp(
+    node: ast.IfExp, nesting: int, result: ComplexityResult, results: list[ComplexityResult]
+) -> tuple[int, ComplexityResult]:
+    result.complexity += 1
+    return nesting, result
+
+
+def _score_call(
+    node: ast.Call, nesting: int, result: ComplexityResult, results: list[ComplexityResult]
+) -> tuple[int, ComplexityResult]:
+    """Recursive calls (by name) add complexity"""
+    if isinstance(node.func, ast.Name) and node.func.id == result.name:
+        result.complexity += 2
+    return nesting, result
+
+
+# Node types that affect scoring; all other nodes are only traversed
+NODE_HANDLERS: dict[type[ast.AST], NodeHandler] = {
+    ast.FunctionDef: _score_function,
+    ast.AsyncFunctionDef: _score_function,
+    ast.If: _score_branch,
+    ast.While: _score_branch,
+    ast.For: _score_branch,
+    ast.AsyncFor: _score_branch,
+    ast.ExceptHandler: _score_branch,
+    ast.With: _score_with,
+    ast.AsyncWith: _score_with,
+    ast.BoolOp: _score_bool_op,
+    ast.IfExp: _score_if_exp,
+    ast.Call: _score_call,
+}
+
+
 class ComplexityAnalyzer:
-    """Analyzes cognitive complexity of code using AST traversal"""
+    """
+    Analyzes cognitive complexity of code using AST traversal.
+
+    Each function is scored on its own definition only: functions nested in
+    it (including methods of nested classes) get their own score and don't
+    add to the enclosing one. Lambdas, comprehensions and other nested
+    expressions count toward the innermost enclosing function.
 
-    def __init__(self) -> None:
-        self.complexity = 0
-        self.nesting_level = 0
-        self.function_name = None
+    The tree is traversed with an explicit stack, so arbitrarily deep code
+    can't exhaust the interpreter's recursion limit.
+    """
 
     def analyze_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> ComplexityResult:
         """Analyze complexity of a single function"""
-        self.complexity = 0
-        self.nesting_level = 0
-        self.function_name = node.name
-
-        self._analyze_node(node)
-
-        has_docstring = ast.get_docstring(node) is not None
-
-        return ComplexityResult(
-            name=node.name,
-            line_number=node.lineno,
-            complexity=self.complexity,
-            has_docstring=has_docstring,
-            node=node,
-        )
-
-    def _analyze_node(self, node: ast.AST) -> None:
-        """Recursively analyze AST node for complexity"""
-
-        # Control flow structures add complexity
-        if isinstance(node, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-            self.complexity += 1 + self.nesting_level
-            self._analyze_nested(node)
-
-        elif isinstance(node, (ast.ExceptHandler,)):
-            self.complexity += 1 + self.nesting_level
-            self._analyze_nested(node)
-
-        elif isinstance(node, (ast.With, ast.AsyncWith)):
-            self.complexity += 1
-            self._analyze_nested(node)
-
-        # Boolean operators in conditions
-        elif isinstance(node, ast.BoolOp):
-            self.complexity += len(node.values) - 1
-            for child in ast.iter_child_nodes(node):
-                self._analyze_node(child)
-
-        # Ternary expressions
-        elif isinstance(node, ast.IfExp):
-            self.complexity += 1
-            for child in ast.iter_child_nodes(node):
-                self._analyze_node(child)
-
-        # Recursion detection (only count self-referential calls)
-        elif isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and self.function_name:
-                # Only add complexity for recursive calls (same function name)
-                if node.func.id == self.function_name:
-                    self.complexity += 2  # Recursion adds more complexity
-            for child in ast.iter_child_nodes(node):
-                self._analyze_node(child)
+        return self._analyze([node])[0]
 
-        else:
-            # Continue traversing
-            for child in ast.iter_child_nodes(node):
-                self._analyze_node(child)
+    def _analyze(self, roots: list[ast.AST]) -> list[ComplexityResult]:
+        """Score every function defined in roots, in source order"""
+        results: list[ComplexityResult] = []
+        # Collects anything outside a function, which isn't reported
+        module = ComplexityResult(name="", line_number=0, complexity=0, has_docstring=False)
 
-    def _analyze_nested(self, node: ast.AST) -> None:
-        """Analyze nested structures with increased nesting level"""
-        self.nesting_level += 1
-        for child in ast.iter_child_nodes(node):
-            self._analyze_node(child)
-        self.nesting_level -= 1
+        handlers = NODE_HANDLERS
+        iter_child_nodes = ast.iter_child_nodes
+        stack: list[tuple[ast.AST, int, ComplexityResult]] = [
+            (node, 0, module) for node in reversed(roots)
+        ]
 
-    def analyze_file(self, file_path: str) -> list[ComplexityResult]:
-        """Analyze all functions in a Python file"""
-        import tokenize
+        while stack:
+            node, nesting, result = stack.pop()
 
-        # Detect encoding to handle non-UTF-8 files
-        try:
-            with open(file_path, "rb") as f:
-                encoding, _ = tokenize.detect_encoding(f.readline)
-        except Exception:
-            encoding = "utf-8"
+            handler = handlers.get(type(node))
+            if handler is not None:
+                nesting, result = handler(node, nesting, result, results)
+
+            # Reversed so children are popped, and functions found, in order
+            children = [(child, nesting, result) for child in iter_child_nodes(node)]
+            children.reverse()
+            stack.extend(children)
 
+        return results
+
+    def analyze_file(self, file_path: str) -> list[ComplexityResult]:
+        """Analyze all functions in a Python file"""
         try:
-            with open(file_path, encoding=encoding, errors="replace") as f:
+            with profiler.phase("read"), open(file_path, "rb") as f:
                 content = f.read()
-        except Exception:
+        except OSError:
             # Can't read file, return empty results
             return []
 
-        try:
-            tree = ast.parse(content, filename=file_path)
-        except SyntaxError:
-            return []
+        return self.analyze_source(content, file_path)
 
-        results: list[ComplexityResult] = []
+    def analyze_source(
+        self, source: str | bytes, filename: str = "<unknown>"
+    ) -> list[ComplexityResult]:
+        """
+        Analyze all functions in Python source code in a single traversal.
 
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                try:
-                    result = self.analyze_function(node)
-                    results.append(result)
-                except (UnicodeDecodeError, UnicodeEncodeError):
-                    # Skip functions with unicode issues in name
-                    continue
+        Bytes are handed to the parser as they are, so encoding cookies and
+        BOMs are honoured without decoding in Python first. Only if that fails
+        is the source decoded with undecodable bytes replaced, matching how
+        such files have always been read.
+        """
+        with profiler.phase("parse"):
+            try:
+                tree = ast.parse(source, filename=filename)
+            except (SyntaxError, ValueError, RecursionError):
+                # RecursionError: nested too deeply for Python's own parser
+                # ValueError: null bytes in the source
+                if not isinstance(source, bytes):
+                    return []
+                tree = self._parse_lossy(source, filename)
+                if tree is None:
+                    return []
 
-        return results
+        # Module-level code isn't scored, but may contain functions anywhere
+        with profiler.phase("analyze"):
+            return self._analyze(tree.body)
+
+    @staticmethod
+    def _parse_lossy(source: bytes, filename: str) -> ast.Module | None:
+        """Parse source that may contain bytes invalid in its encoding"""
+        try:
+            encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+        except SyntaxError:
+            # Unknown encoding in the cookie, which decoded text doesn't need
+            encoding = "utf-8"
+        else:
+            try:
+                source.decode(encoding)
+            except UnicodeDecodeError:
+                pass
+            else:
+                # Decodes cleanly, so the parse failure wasn't about encoding
+                return None
+
+        try:
+            return ast.parse(source.decode(encoding, errors="replace"), filename=filename)
+        except (SyntaxError, ValueError, RecursionError):
+            return None
 
     @staticmethod
     def get_complexity_description(score: int) -> str:
@@ -0,0 +1,126 @@
+"""Complexity and documentation coverage over git history"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+# Characters for drawing a trend in a single line, lowest to highest
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+@dataclass
+class HistoryPoint:
+    """Scan totals at a single commit"""
+
+    commit: str
+    timestamp: int
+    summary: str
+    files: int = 0
+    functions: int = 0
+    documented: int = 0
+    violations: int = 0
+
+    @property
+    def coverage(self) -> float:
+        if self.functions == 0:
+            return 1.0
+        return self.documented / self.functions
+
+
+def sparkline(values: list[float]) -> str:
+    """Draw values as a row of block characters scaled to their range"""
+    if not values:
+        return ""
+
+    low, high = min(values), max(values)
+    if high == low:
+        return SPARK_CHARS[-1] * len(values)
+
+    scale = (len(SPARK_CHARS) - 1) / (high - low)
+    return "".join(SPARK_CHARS[round((value - low) * scale)] for value in values)
+
+
+@dataclass
+class ScanHistory:
+    """
+    Per-commit scan totals, oldest first.
+
+    Written by `cognitive-guard history` and read back by the stats display
+    to show how coverage and violations trend over time.
+    """
+
+    points: list[HistoryPoint] = field(default_factory=list)
+
+    @staticmethod
+    def default_path() -> Path:
+        return Path.cwd() / ".cognitive-guard" / "history.json"
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "ScanHistory":
+        """Load the history, or an empty one if there is none"""
+        path = path or cls.default_path()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(points=[HistoryPoint(**point) for point in data.get("points", [])])
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+    def save(self, path: Path | None = None) -> None:
+        """Save the history"""
+        path = path or self.default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"points": [asdict(point) for point in self.points]}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def display(self, console: Console) -> None:
+        """Display the totals of every commit in a table"""
+        if not self.points:
+            console.print("[yellow]No commits analyzed[/yellow]")
+            return
+
+        table = Table(title="📈 Complexity History", show_header=True)
+        table.add_column("Commit", style="cyan")
+        table.add_column("Date", style="dim")
+        table.add_column("Summary", no_wrap=True, max_width=40)
+        table.add_column("Functions", justify="right")
+        table.add_column("Coverage", justify="right")
+        table.add_column("Violations", justify="right")
+
+        previous: HistoryPoint | None = None
+        for point in self.points:
+            change = ""
+            if previous is not None and point.violations != previous.violations:
+                delta = point.violations - previous.violations
+                change = f" [{'red' if delta > 0 else 'green'}]({delta:+d})[/]"
+
+            coverage = point.coverage
+            table.add_row(
+                point.commit[:8],
+                datetime.fromtimestamp(point.timestamp).strftime("%Y-%m-%d"),
+                escape(point.summary),
+                str(point.functions),
+                f"[{'green' if coverage >= 0.9 else 'yellow'}]{coverage:.1%}[/]",
+                f"{point.violations}{change}",
+            )
+            previous = point
+
+        console.print(table)
+
+        first, last = self.points[0], self.points[-1]
+        console.print(
+            f"\nCoverage:   {sparkline([p.coverage for p in self.points])} "
+            f"{first.coverage:.1%} → {last.coverage:.1%}"
+        )
+        console.print(
+            f"Violations: {sparkline([float(p.violations) for p in self.points])} "
+            f"{first.violations} → {last.violations}"
+        )
@@ -0,0 +1,165 @@
+"""Compiled matcher for ignore patterns"""
+
+import fnmatch
+import os
+import re
+from collections.abc import Iterable
+from pathlib import PurePath
+
+# Joins path components for right-anchored segment matching. File names can
+# never contain NUL, so a wildcard can't leak from one component into the next.
+_SEP = "\x00"
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate a single glob segment into a regex that stays inside one component"""
+    out: list[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        char = segment[i]
+        i += 1
+        if char == "*":
+            # "**" behaves like "*" within a segment, as in Path.match
+            while i < n and segment[i] == "*":
+                i += 1
+            out.append(f"[^{_SEP}]*")
+        elif char == "?":
+            out.append(f"[^{_SEP}]")
+        elif char == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            while j < n and segment[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+                continue
+            chars = segment[i:j].replace("\\", "\\\\")
+            i = j + 1
+            if chars.startswith("!"):
+                chars = f"^{_SEP}" + chars[1:]
+            elif chars.startswith("^"):
+                chars = "\\" + chars
+            out.append(f"[{chars}]")
+        else:
+            out.append(re.escape(char))
+    return "".join(out)
+
+
+def _translate_tail(pattern: str) -> tuple[bool, int, str] | None:
+    """
+    Translate a pattern into a regex with Path.match semantics.
+
+    Returns whether the pattern is anchored, how many trailing path
+    components it covers, and a regex for those components joined by _SEP.
+    Relative patterns match the last components of a path, anchored ones must
+    cover the whole path. Returns None for patterns Path.match would reject.
+    """
+    pattern_path = PurePath(os.path.normcase(pattern))
+    parts = pattern_path.parts
+    if not parts:
+        return None
+
+    anchored = bool(pattern_path.drive or pattern_path.root)
+    segments = [re.escape(parts[0])] if anchored else []
+    segments.extend(_translate_segment(part) for part in parts[anchored:])
+    return anchored, len(parts), _SEP.join(segments) + r"\Z"
+
+
+def _alternation(regexes: list[str]) -> re.Pattern[str]:
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes))
+
+
+def _combine(regexes: list[str]) -> re.Pattern[str] | None:
+    return _alternation(regexes) if regexes else None
+
+
+class IgnoreMatcher:
+    """
+    Matches paths against ignore patterns using a handful of compiled regexes.
+
+    A path is ignored if any pattern matches it the way CodeScanner has always
+    matched: via Path.match, via fnmatch on the whole path string, against any
+    single path component once "**/" and "/**" are stripped, or (for
+    __pycache__ patterns) by substring. All patterns are folded into one regex
+    per rule, so a lookup costs a few regex calls regardless of how many
+    patterns are configured.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(patterns)
+        normcase = os.path.normcase
+
+        whole: list[str] = []
+        tail: dict[tuple[bool, int], list[str]] = {}
+        component: list[str] = []
+        prefix: list[str] = []
+        self._pycache = False
+
+        for pattern in self.patterns:
+            if "__pycache__" in pattern:
+                self._pycache = True
+
+            whole.append(fnmatch.translate(normcase(pattern)))
+            if pattern.endswith("*"):
+                # A trailing "*" swallows anything, so a directory matching
+                # "<dir>/" guarantees every path below it matches as well
+                prefix.append(whole[-1])
+
+            translated = _translate_tail(pattern)
+            if translated is not None:
+                anchored, length, regex = translated
+                tail.setdefault((anchored, length), []).append(regex)
+
+            dir_pattern = pattern.replace("**/", "").replace("/**", "")
+            component.append(fnmatch.translate(normcase(dir_pattern)))
+
+        self._whole = _combine(whole)
+        # One regex per (anchored, component count) so each is a plain match
+        # on a fixed slice of the path instead of a search over every offset
+        self._tail = [
+            (anchored, length, _alternation(regexes))
+            for (anchored, length), regexes in tail.items()
+        ]
+        self._component = _combine(component)
+        self._prefix = _combine(prefix)
+
+    def _matches_component(self, path: PurePath) -> bool:
+        if self._component is None:
+            return False
+        match = self._component.match
+        normcase = os.path.normcase
+        return any(match(normcase(part)) for part in path.parts)
+
+    def matches(self, path: PurePath) -> bool:
+        """Check if path is ignored"""
+        path_str = str(path)
+        if self._pycache and "__pycache__" in path_str:
+            return True
+        if self._whole is not None and self._whole.match(os.path.normcase(path_str)):
+            return True
+        if self._tail:
+            parts = [os.path.normcase(part) for part in path.parts]
+            for anchored, length, regex in self._tail:
+                if len(parts) < length or (anchored and len(parts) != length):
+                    continue
+                if regex.match(_SEP.join(parts[-length:])):
+                    return True
+        return self._matches_component(path)
+
+    def prunes(self, path: PurePath) -> bool:
+        """
+        Check if every path below the directory path is ignored.
+
+        Only rules that carry over to all descendants are consulted, so a
+        walker may skip a pruned directory without changing which files
+        matches() would keep.
+        """
+        path_str = str(path)
+        if self._pycache and "__pycache__" in path_str:
+            return True
+        if self._prefix is not None and self._prefix.match(os.path.normcase(path_str + os.sep)):
+            return True
+        return self._matches_component(path)
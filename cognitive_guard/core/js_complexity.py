@@ -0,0 +1,1001 @@
+"""Cognitive complexity analysis for JavaScript and TypeScript"""
+
+import bisect
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+from cognitive_guard.core.complexity import ComplexityResult
+
+# One token after any whitespace: a comment, string, template literal start,
+# name, number or punctuator. Regular expression literals and the rest of
+# template literals depend on context and are matched separately.
+_TOKEN = re.compile(
+    r"""
+    \s*
+    (?:
+        (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+      | (?P<string>"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?)
+      | (?P<template>`)
+      | (?P<name>[^\W\d][\w$]*|[$\#][\w$]*)
+      | (?P<number>\.?\d[\w.]*)
+      | (?P<punct>=>|\?\?|\?\.(?!\d)|&&|\|\||\.\.\.|\+\+|--|<<=?|<=|\S)
+    )
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+_REGEX_LITERAL = re.compile(r"/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[\w]*")
+# The rest of a template literal up to its end or the next ${ substitution
+_TEMPLATE_CHUNK = re.compile(r"(?:\\.|[^`\\$]|\$(?!\{))*(`|\$\{|\Z)", re.DOTALL)
+# JSX: the start of a tag, with the / of a closing tag; a tag's name and
+# attributes up to an embedded expression or the end of the tag; and text
+# between tags up to an embedded expression or the next tag
+_JSX_TAG = re.compile(r"<\s*(/?)")
+_JSX_ATTRIBUTES = re.compile(r"""(?:[^{}<>/"']+|"[^"]*"|'[^']*'|/(?!>))*""")
+_JSX_TEXT = re.compile(r"[^{<]*")
+# Type parameters of a generic arrow function, written <T,> in .tsx files
+_TYPE_PARAMETERS = re.compile(r"<\s*[^\W\d][\w$]*\s*(?:,|extends\b)")
+
+# Keywords after which a / starts a regular expression rather than a division
+_REGEX_AFTER = frozenset(
+    "return typeof instanceof in of new delete void throw case do else yield await".split()
+)
+# Punctuators that end an operand, after which / and < are operators
+_OPERAND_END = frozenset([")", "]", "++", "--"])
+# Keywords whose parenthesized header may be followed by a regular expression
+_HEADER_KEYWORDS = frozenset(["if", "for", "while", "with"])
+# Reserved words that are never function or method names
+_KEYWORDS = frozenset("""
+    break case catch class const continue debugger default delete do else export extends
+    finally for function if import in instanceof new return super switch this throw try
+    typeof var void while with yield let static await
+    """.split())
+# Tokens that may come right before a method name in a class or object literal
+_METHOD_PREFIX = frozenset(
+    "{ } ; , * async get set static public private protected readonly override abstract".split()
+)
+# Control flow that adds 1 plus the nesting level, and nests what it governs
+_BRANCHES = frozenset(["if", "for", "while", "switch", "catch", "with", "do"])
+# Where a { in a return type annotation is the function body, not an object type
+_TYPE_END_KINDS = frozenset(["name", "string", "number"])
+_TYPE_END_PUNCT = frozenset([")", "]", "}", ">"])
+# Most tokens skipped as type parameters or a return type before giving up
+MAX_TYPE_TOKENS = 256
+
+# Frame kinds
+_BLOCK, _PAREN, _BRACKET, _STMT = "{", "(", "[", ";"
+
+# Frame flags
+_FUNCTION = 1  # function body
+_IF = 2  # body of an if, which else may follow
+_DO = 4  # body of a do-while loop
+_TRY = 8  # body of try or catch, which catch or finally may follow
+_STATEMENT = 16  # block ending a statement, e.g. a loop body
+_HEADER = 32  # condition of a control statement, followed by its body
+_PARAMS = 64  # parameters of a function, followed by its body
+_METHOD = 128  # parameters of what may be a method, if a body follows
+_TYPE = 256  # inside a type, e.g. an interface body, where => starts no function
+_CLASS = 512  # class body, whose fields may have type annotations
+
+
+class JSParseError(ValueError):
+    """Raised when source can't be followed well enough to score it"""
+
+
+Token = tuple[str, str, int, int]
+
+
+@dataclass(slots=True)
+class _Frame:
+    """An open block, parenthesis, bracket or braceless statement"""
+
+    kind: str
+    nesting: int
+    # Function whose score the frame's contents count toward
+    function: ComplexityResult
+    flags: int = 0
+    # Condition of a control statement: nesting level and flags of its body
+    body: tuple[int, int] = (0, 0)
+    # Parameters of a function: its name and line
+    name: str = ""
+    line: int = 0
+    # Other parentheses: the tokens before, most recent first
+    before: tuple[Token | None, ...] = ()
+    # Brackets: whether they may be a computed member name
+    member: bool = False
+
+
+def tokenize(source: str, jsx: bool = False) -> Iterator[Token]:
+    """
+    Split JavaScript or TypeScript into (kind, text, line, end line) tokens.
+
+    Kinds are comment, string (including template literal pieces, regular
+    expressions and, with jsx, JSX markup), name, number and punct. Template
+    substitutions and expressions embedded in JSX are tokenized as code,
+    with the braces around the latter as punct tokens.
+    """
+    line = 1
+    pos = 0
+    prev_kind = prev_text = ""
+    brace_depth = 0
+    # Open ${ substitutions and expressions embedded in JSX, as (brace depth,
+    # JSX element depth, JSX tag) to resume scanning with, depth -1 for ${
+    nested: list[tuple[int, int, int]] = []
+    # JSX markup to scan from pos, as (element depth, tag)
+    markup: tuple[int, int] | None = None
+    # Whether each open parenthesis starts the header of an if or a loop,
+    # and whether the last one closed did
+    headers: list[bool] = []
+    closed_header = False
+
+    # Scans from pos until a token needing context (the rest of a template
+    # literal, a regular expression or JSX) moves pos past what finditer has seen
+    resync = True
+    while resync:
+        resync = False
+
+        if markup is not None:
+            start = pos
+            pos, depth, tag, embedded = _scan_jsx(source, pos, *markup)
+            markup = None
+            if pos > start:
+                text = source[start:pos]
+                end_line = line + text.count("\n")
+                yield "string", text, line, end_line
+                line = end_line
+                prev_kind, prev_text = "string", text
+            if embedded:
+                nested.append((brace_depth, depth, tag))
+                yield "punct", "{", line, line
+                prev_kind, prev_text = "punct", "{"
+                pos += 1
+
+        for match in _TOKEN.finditer(source, pos):
+            kind = match.lastgroup
+            if kind is None:
+                break
+            start = match.start(kind)
+            line += source.count("\n", pos, start)
+            text = match.group(kind)
+            pos = match.end()
+
+            if kind == "template" or (
+                kind == "punct" and text == "}" and nested and nested[-1][0] == brace_depth
+            ):
+                _, depth, tag = nested.pop() if kind == "punct" else (0, -1, 0)
+                if depth >= 0:
+                    # The end of an expression embedded in JSX, whose markup goes on
+                    markup = (depth, tag)
+                    resync = True
+                else:
+                    chunk = _TEMPLATE_CHUNK.match(source, pos)
+                    assert chunk is not None
+                    if chunk.group(1) == "${":
+                        nested.append((brace_depth, -1, 0))
+                    kind, text = "string", source[start : chunk.end()]
+                    pos = chunk.end()
+                    resync = True
+            elif kind == "punct":
+                if text == "{":
+                    brace_depth += 1
+                elif text == "}":
+                    brace_depth -= 1
+                elif text == "(":
+                    headers.append(prev_kind == "name" and prev_text in _HEADER_KEYWORDS)
+                elif text == ")":
+                    closed_header = bool(headers) and headers.pop()
+                elif (text == "/" or text == "<" and jsx) and (
+                    prev_kind == "punct"
+                    and (prev_text not in _OPERAND_END or prev_text == ")" and closed_header)
+                    or prev_kind == "name"
+                    and prev_text in _REGEX_AFTER
+                    or not prev_kind
+                ):
+                    if text == "/":
+                        regex = _REGEX_LITERAL.match(source, start)
+                        if regex is not None:
+                            kind, text = "string", regex.group()
+                            pos = regex.end()
+                            resync = True
+                    elif not _TYPE_PARAMETERS.match(source, start):
+                        # A JSX element where an expression starts
+                        markup = (0, 0)
+                        pos = start
+                        resync = True
+                        break
+
+            end_line = line + text.count("\n") if kind in ("comment", "string") else line
+            yield kind, text, line, end_line
+            line = end_line
+
+            if kind != "comment":
+                prev_kind, prev_text = kind, text
+            if resync:
+                break
+
+    if nested:
+        what = "template literal" if nested[-1][1] < 0 else "JSX expression"
+        raise JSParseError(f"unterminated {what}")
+
+
+def _scan_jsx(source: str, pos: int, depth: int, tag: int) -> tuple[int, int, int, bool]:
+    """
+    Scan JSX markup from pos up to an embedded expression or the element's end.
+
+    depth is the number of elements open, and tag is 1 or -1 inside an
+    opening or closing tag, 0 between tags. Returns the position reached,
+    the depth and tag there, and whether an embedded expression's { is
+    there rather than the end of the outermost element.
+    """
+    while True:
+        if tag:
+            attributes = _JSX_ATTRIBUTES.match(source, pos)
+            assert attributes is not None
+            pos = attributes.end()
+            if source.startswith("{", pos):
+                return pos, depth, tag, True
+            if source.startswith(">", pos):
+                depth += tag
+                pos += 1
+            elif tag > 0 and source.startswith("/>", pos):
+                pos += 2
+            else:
+                break
+            tag = 0
+            if not depth:
+                return pos, depth, tag, False
+        else:
+            text = _JSX_TEXT.match(source, pos)
+            assert text is not None
+            pos = text.end()
+            if source.startswith("{", pos):
+                return pos, depth, tag, True
+            if pos == len(source):
+                break
+            start = _JSX_TAG.match(source, pos)
+            assert start is not None
+            tag = -1 if start.group(1) else 1
+            pos = start.end()
+
+    line = source.count("\n", 0, pos) + 1
+    raise JSParseError(f"unterminated JSX element on line {line}")
+
+
+class JSComplexityAnalyzer:
+    """
+    Analyzes cognitive complexity of JavaScript and TypeScript in one pass.
+
+    Scores follow ComplexityAnalyzer: if, loops, switch, catch and with add
+    1 plus their nesting level and nest what they govern (else if adds one
+    more level, like elif); each &&, || or ?? and each ternary adds 1; a
+    call to the function's own name adds 2. Functions, methods and
+    arrow functions with a block body are scored on their own, from nesting
+    level 0, while arrow functions with an expression body count toward the
+    enclosing function, as lambdas do in Python. In TypeScript, => in a type
+    alias, an interface or a type annotation is a function type, not a function.
+
+    Doc comments (`/** ... */`, plus `///` for TypeScript) are found in the
+    same pass: a function is documented when one ends after the last line of
+    code above it, decorators aside. Raises JSParseError when brackets don't
+    balance, e.g. for syntax the tokenizer doesn't understand.
+
+    With jsx, a < where an expression starts begins JSX markup, which is
+    skipped except for its embedded {...} expressions. It is off for plain
+    TypeScript, where <Type>value is a type assertion.
+    """
+
+    def __init__(self, typescript: bool = False, jsx: bool = False):
+        self.typescript = typescript
+        self.jsx = jsx
+
+    def analyze_source(self, source: str) -> list[ComplexityResult]:
+        """Analyze all functions in JavaScript or TypeScript source code"""
+        return _Pass(source, self.typescript, self.jsx).run()
+
+
+class _Pass:
+    """
+    State of a single analysis of one file.
+
+    run() reads the tokens in order, handing each keyword and punctuator
+    that affects scores or structure to its handler in KEYWORD_HANDLERS or
+    PUNCT_HANDLERS. When a token sets up what the next one should start
+    (e.g. if is followed by its condition, then its body), the next token
+    goes to the handler in EXPECT_HANDLERS first. Open blocks, parentheses,
+    brackets and braceless statements are kept on a stack of frames.
+    """
+
+    def __init__(self, source: str, typescript: bool, jsx: bool):
+        self.tokens = tokenize(source, jsx)
+        self.typescript = typescript
+        # Tokens to process again, last first
+        self.pending: list[Token] = []
+
+        self.results: list[ComplexityResult] = []
+        module = ComplexityResult(name="", line_number=0, complexity=0, has_docstring=False)
+        self.stack: list[_Frame] = [_Frame(_BLOCK, 0, module)]
+
+        self.doc_ends: list[int] = []
+        self.code_lines: list[int] = [0]
+
+        # Previous significant tokens, most recent first, and their count
+        self.p1: Token | None = None
+        self.p2: Token | None = None
+        self.p3: Token | None = None
+        self.p4: Token | None = None
+        self.index = 0
+
+        # What the next token is expected to start, and details for its handler
+        self.expect: str | None = None
+        self.expect_info: tuple = ()
+        # Continuations that keep a braceless statement open after a block
+        self.completing: frozenset[str] | None = None
+        # Whether the last token was a ?, which may start a ternary
+        self.question = False
+        # (nesting level, token index) of the last if body to close
+        self.last_if = (0, -2)
+        # Token index of the last do-while body to close
+        self.do_closed = -2
+        # Name and line of the last declared variable
+        self.declared: tuple[str, int] | None = None
+        self.declaring = False
+        # Nesting level for an if right after else
+        self.else_if: int | None = None
+        # Frame of the last closed parenthesis, and its token index
+        self.last_paren: tuple[_Frame | None, int] = (None, -2)
+        # Token index of the last parenthesis followed by a type annotation
+        self.typed_paren = -1
+        # Name token and token index of the last computed member name
+        self.computed: tuple = (None, -2)
+        # Frame of the type annotation or type alias being read, if any
+        self.annotation: _Frame | None = None
+        # Flags for the next block, after class or interface
+        self.next_block = 0
+
+    def next_token(self) -> Token | None:
+        """Get the next token, from those put back first"""
+        if self.pending:
+            return self.pending.pop()
+        return next(self.tokens, None)
+
+    def documented(self, line: int) -> bool:
+        """Check if a doc comment ends after the last code above line"""
+        doc = bisect.bisect_left(self.doc_ends, line)
+        if doc == 0:
+            return False
+        code = bisect.bisect_left(self.code_lines, line)
+        return self.code_lines[code - 1] < self.doc_ends[doc - 1]
+
+    def open_function(self, name: str, line: int, flags: int = 0) -> None:
+        """Start scoring a function whose body opens here"""
+        function = ComplexityResult(
+            name=name,
+            line_number=line,
+            complexity=0,
+            has_docstring=self.documented(line),
+            end_line_number=line,
+        )
+        self.results.append(function)
+        self.stack.append(_Frame(_BLOCK, 0, function, _FUNCTION | flags))
+
+    def run(self) -> list[ComplexityResult]:
+        """
+        Score every function in the source, in order of appearance.
+
+        Comments only mark where doc comments end, and decorators are
+        skipped. Other tokens go to the handler for what the token before
+        expected, if any, then to the handler for the keyword or punctuator.
+        Raises JSParseError if brackets don't balance.
+        """
+        code_lines = self.code_lines
+        tokens = self.tokens
+        pending = self.pending
+
+        while True:
+            # Inlined next_token()
+            if pending:
+                token = pending.pop()
+            else:
+                token = next(tokens, None)
+                if token is None:
+                    break
+            kind, text, _, end_line = token
+
+            if kind == "comment":
+                if text.startswith("/**") and not text.startswith("/**/"):
+                    self.doc_ends.append(end_line)
+                elif self.typescript and text.startswith("///"):
+                    self.doc_ends.append(end_line)
+                continue
+            if text == "@" and kind == "punct":
+                self.skip_decorator()
+                continue
+
+            self.index += 1
+            if end_line > code_lines[-1]:
+                code_lines.append(end_line)
+
+            if self.completing is not None:
+                self.complete_statement(text)
+            if self.question:
+                self.question = False
+                if text not in (":", ")", ",", "="):
+                    self.stack[-1].function.complexity += 1
+            if self.expect is not None:
+                handler = EXPECT_HANDLERS[self.expect]
+                self.expect = None
+                taken = handler(self, token)
+                if taken is not None:
+                    self.p4, self.p3, self.p2, self.p1 = self.p3, self.p2, self.p1, taken
+                    continue
+
+            if kind == "name":
+                if self.annotation is not None:
+                    self.end_annotation_line(token)
+                if self.declaring:
+                    self.declared = (text, token[2])
+                    self.declaring = False
+                keyword = KEYWORD_HANDLERS.get(text)
+                if keyword is not None and (self.p1 is None or self.p1[1] not in (".", "?.")):
+                    keyword(self, token)
+            elif kind == "punct":
+                punct = PUNCT_HANDLERS.get(text)
+                if punct is not None and punct(self, token):
+                    continue
+
+            self.p4, self.p3, self.p2, self.p1 = self.p3, self.p2, self.p1, token
+
+        if self.stack[-1].kind == _STMT:
+            self.pop_statements(self.index)
+        if len(self.stack) != 1:
+            raise JSParseError(f"unclosed '{self.stack[-1].kind}' at end of file")
+
+        return self.results
+
+    def complete_statement(self, text: str) -> None:
+        """After a block ending a braceless statement, end it unless text continues it"""
+        if self.stack[-1].kind == _STMT and text not in self.completing:
+            self.pop_statements(self.index - 1)
+        self.completing = None
+
+    def pop_statements(self, index: int) -> None:
+        """End the braceless statements on top of the stack"""
+        stack = self.stack
+        closed_if = False
+        while stack[-1].kind == _STMT:
+            frame = stack.pop()
+            if frame.flags & _IF and not closed_if:
+                self.last_if = (frame.nesting, index)
+                closed_if = True
+            if frame.flags & _DO:
+                self.do_closed = index
+
+    def pop_frame(self, kind: str, token: Token) -> _Frame:
+        """Close the innermost frame, which must be of the given kind"""
+        stack = self.stack
+        if stack[-1].kind == _STMT:
+            self.pop_statements(self.index)
+        frame = stack.pop()
+        if frame.kind != kind or not stack:
+            raise JSParseError(f"unexpected '{token[1]}' on line {token[2]}")
+        if frame is self.annotation:
+            self.annotation = None
+        return frame
+
+    def type_flag(self, frame: _Frame) -> int:
+        """Get _TYPE if a frame opening inside the given one is part of a type"""
+        return _TYPE if frame.flags & _TYPE or frame is self.annotation else 0
+
+    def end_annotation_line(self, token: Token) -> None:
+        """End a type annotation when a name starts a new line after a complete type"""
+        p1 = self.p1
+        if (
+            self.annotation is self.stack[-1]
+            and p1 is not None
+            and token[2] > p1[3]
+            and (p1[0] in _TYPE_END_KINDS or p1[1] in _TYPE_END_PUNCT)
+        ):
+            self.annotation = None
+
+    # Handlers for the token after one that set up an expectation
+
+    def expected_header(self, token: Token) -> Token | None:
+        """Open the condition after a control keyword"""
+        text = token[1]
+        if text == "(":
+            frame = self.stack[-1]
+            self.stack.append(
+                _Frame(_PAREN, frame.nesting, frame.function, _HEADER, body=self.expect_info)
+            )
+            return token
+        if text == "await":
+            self.expect = "header"
+            return token
+        if text == "{":
+            # catch without a binding
+            return self.expected_body(token)
+        return None
+
+    def expected_body(self, token: Token) -> Token | None:
+        """Open the body of a control statement, as a block or a braceless statement"""
+        nesting, flags = self.expect_info
+        frame = self.stack[-1]
+        if token[1] == "{":
+            self.stack.append(_Frame(_BLOCK, nesting, frame.function, flags))
+            return token
+        if token[1] == "if" and self.p1 is not None and self.p1[1] == "else":
+            self.else_if = nesting
+        else:
+            self.stack.append(_Frame(_STMT, nesting, frame.function, flags))
+        return None
+
+    def expected_function(self, token: Token) -> Token | None:
+        """Find the name and parameters after the function keyword"""
+        kind, text, line, _ = token
+        name, fn_line, inferred = self.expect_info
+        if kind == "name" and name is None:
+            self.expect, self.expect_info = "function", (text, line, None)
+            return token
+        if text == "*" or text == "<" and self.skip_type_parameters():
+            self.expect = "function"
+            return token
+        if text == "(":
+            if name is None:
+                name, fn_line = inferred or ("(anonymous)", fn_line)
+            frame = self.stack[-1]
+            self.stack.append(
+                _Frame(_PAREN, frame.nesting, frame.function, _PARAMS, name=name, line=fn_line)
+            )
+            return token
+        return None
+
+    def expected_function_body(self, token: Token) -> Token | None:
+        """Open a function at its body, after any return type annotation"""
+        if token[1] == ":" and self.skip_return_type():
+            self.open_function(*self.expect_info)
+            return ("punct", "{", token[2], token[3])
+        return self.expected_arrow_body(token)
+
+    def expected_arrow_body(self, token: Token) -> Token | None:
+        """Open a function at its body, if it has a block body"""
+        if token[1] == "{":
+            self.open_function(*self.expect_info)
+            return token
+        return None
+
+    def expected_type_block(self, token: Token) -> Token | None:
+        """Forget the block after class or interface if the keyword is a property name"""
+        if token[1] in (":", "?", "(", ",", "="):
+            self.next_block = 0
+        return None
+
+    def expected_type_alias(self, token: Token) -> Token | None:
+        """After type, read what follows `Name =` or `Name<...> =` as a type"""
+        if token[0] != "name" or token[1] in _KEYWORDS:
+            return None
+        skipped: list[Token] = []
+        depth = 0
+        while len(skipped) < MAX_TYPE_TOKENS:
+            following = self.next_token()
+            if following is None:
+                break
+            skipped.append(following)
+            text = following[1]
+            if text == "<":
+                depth += 1
+            elif text == ">" and depth:
+                depth -= 1
+            elif not depth:
+                if text == "=":
+                    self.count_code(skipped)
+                    self.annotation = self.stack[-1]
+                    return following
+                if following[0] != "comment":
+                    break
+        self.pending.extend(reversed(skipped))
+        return None
+
+    # Handlers for keywords
+
+    def branch(self, token: Token) -> None:
+        """Score control flow that adds nesting, and expect its header or body"""
+        text = token[1]
+        if text == "while" and self.do_closed == self.index - 1:
+            return  # the condition of a do-while loop
+
+        frame = self.stack[-1]
+        nesting = frame.nesting
+        if self.else_if is not None:
+            nesting, self.else_if = self.else_if, None
+        frame.function.complexity += 1 + nesting
+
+        flags = _STATEMENT
+        if text == "if":
+            flags |= _IF
+        elif text == "do":
+            flags |= _DO
+        elif text == "catch":
+            flags |= _TRY
+        self.expect = "body" if text == "do" else "header"
+        self.expect_info = (nesting + 1, flags)
+
+    def else_branch(self, token: Token) -> None:
+        """Expect the body of an else, at the level of the if body"""
+        nesting, index = self.last_if
+        if index != self.index - 1:
+            nesting = self.stack[-1].nesting + 1
+        self.expect, self.expect_info = "body", (nesting, _STATEMENT)
+
+    def try_block(self, token: Token) -> None:
+        """Expect the body of try or finally, which doesn't add nesting"""
+        self.expect, self.expect_info = "body", (self.stack[-1].nesting, _STATEMENT | _TRY)
+
+    def function_keyword(self, token: Token) -> None:
+        """Expect a function's name or parameters, naming it from what precedes"""
+        inferred = _infer_name(self.p1, self.p2, self.p3, self.p4, self.declared)
+        self.expect, self.expect_info = "function", (None, token[2], inferred)
+
+    def declaration(self, token: Token) -> None:
+        """Note that the next name is a declared variable"""
+        self.declaring = True
+
+    def type_block(self, token: Token) -> None:
+        """Mark the next block as a class body or, in TypeScript, an interface body"""
+        if token[1] == "class":
+            self.next_block = _CLASS
+        elif self.typescript:
+            self.next_block = _TYPE
+        else:
+            return
+        self.expect = "type block"
+
+    def type_alias(self, token: Token) -> None:
+        """Expect the name of a type alias"""
+        if self.typescript:
+            self.expect = "type alias"
+
+    # Handlers for punctuators
+
+    def open_block(self, token: Token) -> None:
+        frame = self.stack[-1]
+        flags = self.type_flag(frame) | self.next_block
+        self.stack.append(_Frame(_BLOCK, frame.nesting, frame.function, flags))
+        self.typed_paren = -1
+        self.next_block = 0
+
+    def close_block(self, token: Token) -> None:
+        """Close a block, noting what may continue the statement it ends"""
+        frame = self.pop_frame(_BLOCK, token)
+        flags = frame.flags
+        if flags & _FUNCTION:
+            frame.function.end_line_number = token[2]
+        if flags & _IF:
+            self.last_if = (frame.nesting, self.index)
+        if flags & _DO:
+            self.do_closed = self.index
+        if flags & (_STATEMENT | _FUNCTION) and self.stack[-1].kind == _STMT:
+            self.completing = frozenset(
+                ["else"] * bool(flags & _IF)
+                + ["catch", "finally"] * bool(flags & _TRY)
+                + ["while"] * bool(flags & _DO)
+            )
+
+    def open_paren(self, token: Token) -> None:
+        """Score recursive calls, and note what may be a method's parameters"""
+        p1, p2 = self.p1, self.p2
+        frame = self.stack[-1]
+        function = frame.function
+        if self.type_flag(frame):
+            # A function type or a method signature
+            self.stack.append(_Frame(_PAREN, frame.nesting, function, _TYPE))
+            return
+        flags = 0
+        if p1 is not None and p1[0] == "name":
+            if p1[1] == function.name and (p2 is None or p2[1] not in (".", "?.")):
+                # Recursive call
+                function.complexity += 2
+            if frame.kind == _BLOCK and p1[1] not in _KEYWORDS and _starts_member(p2, p1):
+                flags = _METHOD
+        elif p1 is not None and p1[1] == "]" and self.computed[1] == self.index - 1:
+            # [Symbol.iterator]() { ... }, with the name standing in for the brackets
+            p1 = self.p1 = self.computed[0]
+            flags = _METHOD
+        before = (p1, p2, self.p3, self.p4)
+        self.stack.append(
+            _Frame(_PAREN, frame.nesting, function, flags, line=token[2], before=before)
+        )
+
+    def close_paren(self, token: Token) -> None:
+        """Close parentheses, expecting the body a header or parameters precede"""
+        frame = self.pop_frame(_PAREN, token)
+        flags = frame.flags
+        self.last_paren = (frame, self.index)
+        if flags & _HEADER:
+            self.expect, self.expect_info = "body", frame.body
+        elif flags & _PARAMS:
+            self.expect, self.expect_info = "function body", (frame.name, frame.line, _STATEMENT)
+        elif flags & _METHOD:
+            name_token = frame.before[0]
+            assert name_token is not None
+            self.expect, self.expect_info = "function body", (name_token[1], name_token[2], 0)
+
+    def open_bracket(self, token: Token) -> None:
+        frame = self.stack[-1]
+        member = frame.kind == _BLOCK and _starts_member(self.p1, token)
+        flags = self.type_flag(frame)
+        self.stack.append(_Frame(_BRACKET, frame.nesting, frame.function, flags, member=member))
+
+    def close_bracket(self, token: Token) -> None:
+        """Close brackets, naming a computed member, e.g. [key] or [Symbol.iterator]"""
+        frame = self.pop_frame(_BRACKET, token)
+        if frame.member:
+            p1, p2, p3, p4 = self.p1, self.p2, self.p3, self.p4
+            if p2 is not None and p2[1] == "[":
+                name = f"[{p1[1]}]"
+            elif p4 is not None and p4[1] == "[" and p2[1] == ".":
+                name = f"[{p3[1]}.{p1[1]}]"
+            else:
+                name = "[computed]"
+            self.computed = (("name", name, token[2], token[2]), self.index)
+
+    def semicolon(self, token: Token) -> None:
+        self.typed_paren = -1
+        self.end_annotation(token)
+        if self.stack[-1].kind == _STMT:
+            self.pop_statements(self.index)
+
+    def end_annotation(self, token: Token) -> None:
+        """End a type annotation or type alias at a , = or ; at its level"""
+        if self.annotation is self.stack[-1]:
+            self.annotation = None
+
+    def arrow(self, token: Token) -> None:
+        """Name an arrow function from what precedes it, and expect its body"""
+        if self.type_flag(self.stack[-1]):
+            return  # a function type, e.g. (e: Event) => void
+        p1 = self.p1
+        name, fn_line = "(anonymous)", token[2]
+        paren, paren_index = self.last_paren
+        if paren is not None and (paren_index == self.index - 1 or self.typed_paren == paren_index):
+            # (params) => or (params): ReturnType =>
+            if paren.flags & (_HEADER | _PARAMS):
+                raise JSParseError(f"unexpected '=>' on line {token[2]}")
+            inferred = _infer_name(*paren.before, self.declared)
+            fn_line = paren.line
+        elif p1 is not None and p1[0] == "name":
+            inferred = _infer_name(self.p2, self.p3, self.p4, None, self.declared)
+            fn_line = p1[2]
+        else:
+            inferred = None
+        if inferred is not None:
+            name, fn_line = inferred
+        self.expect, self.expect_info = "arrow body", (name, fn_line, 0)
+
+    def colon(self, token: Token) -> None:
+        if self.last_paren[1] == self.index - 1:
+            self.typed_paren = self.last_paren[1]
+        elif self.typescript and self.annotation is None and self.annotates():
+            self.annotation = self.stack[-1]
+
+    def annotates(self) -> bool:
+        """Check if a : starts the type of a parameter, variable or class field"""
+        frame = self.stack[-1]
+        p1, p2, p3 = self.p1, self.p2, self.p3
+        if frame.flags & _TYPE or p1 is None:
+            return False
+        if p1[1] in ("?", "!"):
+            # a?: T or a!: T
+            p1, p2 = p2, p3
+            if p1 is None:
+                return False
+        if p1[0] != "name" or p2 is None:
+            return False
+        if p2[1] in ("const", "let", "var"):
+            return True
+        if frame.kind == _PAREN:
+            return p2[1] in ("(", ",", "...")
+        return bool(frame.flags & _CLASS) and _starts_member(p2, p1)
+
+    def question_mark(self, token: Token) -> None:
+        self.question = True
+
+    def logical_operator(self, token: Token) -> None:
+        self.stack[-1].function.complexity += 1
+
+    def angle_bracket(self, token: Token) -> bool:
+        """
+        Skip the type parameters of a generic method or arrow function.
+
+        This lets the parameter list be found after the name. Returns True
+        if they were skipped, leaving the < out of the previous tokens.
+        """
+        p1 = self.p1
+        if not self.typescript or p1 is None:
+            return False
+        if p1[1] not in ("=", ":") and not (
+            p1[0] == "name"
+            and self.stack[-1].kind == _BLOCK
+            and p1[1] not in _KEYWORDS
+            and _starts_member(self.p2, p1)
+        ):
+            return False
+        return self.skip_type_parameters()
+
+    def skip_decorator(self) -> None:
+        """Skip `@name.name(...)` without counting it as code"""
+        token = self.next_token()
+        while token is not None and token[0] == "comment":
+            token = self.next_token()
+        expect_name = True
+        depth = 0
+        while token is not None:
+            text = token[1]
+            if depth:
+                depth += (text == "(") - (text == ")")
+            elif expect_name and token[0] == "name":
+                expect_name = False
+            elif text == "." and not expect_name:
+                expect_name = True
+            elif text == "(" and not expect_name:
+                depth = 1
+            else:
+                self.pending.append(token)
+                return
+            token = self.next_token()
+
+    def skip_type_parameters(self) -> bool:
+        """
+        Skip type parameters after an opening <, up to a parameter list.
+
+        Returns False, with the tokens put back, if the < doesn't start
+        type parameters after all (e.g. a comparison or JSX).
+        """
+        skipped: list[Token] = []
+        depth = 0
+
+        while len(skipped) < MAX_TYPE_TOKENS:
+            token = self.next_token()
+            if token is None:
+                break
+            skipped.append(token)
+            text = token[1]
+            if text in ("(", "[", "{", "<"):
+                depth += 1
+            elif text in (")", "]", "}", ">"):
+                if not depth:
+                    following = self.next_token()
+                    if following is not None:
+                        self.pending.append(following)
+                        if text == ">" and following[1] == "(":
+                            self.count_code(skipped)
+                            return True
+                    break
+                depth -= 1
+            elif text == ";":
+                break
+
+        self.pending.extend(reversed(skipped))
+        return False
+
+    def skip_return_type(self) -> bool:
+        """
+        Skip a return type annotation up to the function body.
+
+        Returns False, with the tokens put back, if no body follows (an
+        overload, an interface member or not a function after all).
+        """
+        skipped: list[Token] = []
+        depth = 0
+        prev: Token | None = None
+
+        while len(skipped) < MAX_TYPE_TOKENS:
+            token = self.next_token()
+            if token is None:
+                break
+            skipped.append(token)
+            kind, text = token[0], token[1]
+            if kind == "comment":
+                continue
+            if text in ("(", "[", "{", "<"):
+                if text == "{" and not depth and prev is not None:
+                    if prev[0] in _TYPE_END_KINDS or prev[1] in _TYPE_END_PUNCT:
+                        # The function body
+                        self.count_code(skipped)
+                        return True
+                depth += 1
+            elif text in (")", "]", "}", ">"):
+                if not depth:
+                    break
+                depth -= 1
+            elif not depth and text in (";", "=", ","):
+                break
+            prev = token
+
+        self.pending.extend(reversed(skipped))
+        return False
+
+    def count_code(self, tokens: list[Token]) -> None:
+        """Record the lines of skipped tokens as code"""
+        code_lines = self.code_lines
+        for token in tokens:
+            if token[0] != "comment" and token[3] > code_lines[-1]:
+                code_lines.append(token[3])
+
+
+# Handlers for a token that an earlier one expects to start something, by
+# what it is expected to start. Each returns the token to remember as the
+# previous one if it took the token, or None to handle the token as usual.
+EXPECT_HANDLERS: dict[str, Callable[[_Pass, Token], Token | None]] = {
+    "header": _Pass.expected_header,
+    "body": _Pass.expected_body,
+    "function": _Pass.expected_function,
+    "function body": _Pass.expected_function_body,
+    "arrow body": _Pass.expected_arrow_body,
+    "type block": _Pass.expected_type_block,
+    "type alias": _Pass.expected_type_alias,
+}
+
+# Handlers for keywords that affect scores or structure, unless after a dot
+KEYWORD_HANDLERS: dict[str, Callable[[_Pass, Token], None]] = {
+    **dict.fromkeys(_BRANCHES, _Pass.branch),
+    "else": _Pass.else_branch,
+    "try": _Pass.try_block,
+    "finally": _Pass.try_block,
+    "function": _Pass.function_keyword,
+    **dict.fromkeys(["const", "let", "var"], _Pass.declaration),
+    "class": _Pass.type_block,
+    "interface": _Pass.type_block,
+    "type": _Pass.type_alias,
+}
+
+# Handlers for punctuators that affect scores or structure. A true return
+# value leaves the punctuator out of the previous tokens.
+PUNCT_HANDLERS: dict[str, Callable[[_Pass, Token], bool | None]] = {
+    "{": _Pass.open_block,
+    "}": _Pass.close_block,
+    "(": _Pass.open_paren,
+    ")": _Pass.close_paren,
+    "[": _Pass.open_bracket,
+    "]": _Pass.close_bracket,
+    ";": _Pass.semicolon,
+    ",": _Pass.end_annotation,
+    "=": _Pass.end_annotation,
+    "=>": _Pass.arrow,
+    ":": _Pass.colon,
+    "?": _Pass.question_mark,
+    "&&": _Pass.logical_operator,
+    "||": _Pass.logical_operator,
+    "??": _Pass.logical_operator,
+    "<": _Pass.angle_bracket,
+}
+
+
+def _starts_member(prev: Token | None, token: Token) -> bool:
+    """Check if a token may start a class member or object literal property"""
+    return prev is None or prev[1] in _METHOD_PREFIX or prev[2] != token[2]
+
+
+def _infer_name(
+    p1: Token | None,
+    p2: Token | None,
+    p3: Token | None,
+    p4: Token | None,
+    declared: tuple[str, int] | None,
+) -> tuple[str, int] | None:
+    """
+    Name a function from the tokens before it, most recent first.
+
+    Handles `name = function`, `name: (...) =>` and the like, skipping
+    `async`; `const name: Type = ...` takes the declared variable's name.
+    """
+    if p1 is not None and p1[1] == "async":
+        p1, p2, p3 = p2, p3, p4
+    if p1 is None or p2 is None or p1[1] not in ("=", ":"):
+        return None
+    if p1[1] == "=" and p3 is not None and p3[1] == ":":
+        return declared
+    if p2[0] == "name" and p2[1] not in _KEYWORDS:
+        return p2[1], p2[2]
+    if p2[0] == "string" and p1[1] == ":":
+        return p2[1][1:-1], p2[2]
+    return None
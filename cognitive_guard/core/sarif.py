@@ -0,0 +1,129 @@
+"""SARIF 2.1.0 output for code-scanning tools"""
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+from cognitive_guard import __version__
+
+if TYPE_CHECKING:
+    from cognitive_guard.core.scanner import FileResult, ScanResults
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+RULE_ID = "CG001"
+RULE = {
+    "id": RULE_ID,
+    "name": "UndocumentedComplexFunction",
+    "shortDescription": {"text": "Complex function without documentation"},
+    "fullDescription": {
+        "text": (
+            "Functions whose cognitive complexity exceeds the configured threshold "
+            "must have a docstring (or doc comment) explaining what they do."
+        )
+    },
+    "helpUri": "https://github.com/salim0986/cognitive-guard",
+    "defaultConfiguration": {"level": "warning"},
+    "properties": {"tags": ["maintainability", "documentation"]},
+}
+
+# Severities reported as errors; everything else is a warning
+ERROR_SEVERITIES = {"very_complex"}
+
+
+def _artifact_location(file_path: str, root: Path) -> dict[str, Any]:
+    """Locate a file relative to the scan root when possible"""
+    path = Path(file_path)
+    if not path.is_absolute():
+        return {"uri": path.as_posix(), "uriBaseId": "%SRCROOT%"}
+    try:
+        return {"uri": path.relative_to(root).as_posix(), "uriBaseId": "%SRCROOT%"}
+    except ValueError:
+        return {"uri": path.as_uri()}
+
+
+def _file_results(file: "FileResult", threshold: int | None, root: Path) -> list[dict[str, Any]]:
+    location = _artifact_location(file.file_path, root)
+    results = []
+
+    for violation in file.violations:
+        region = {"startLine": violation.line_number}
+        if violation.end_line_number >= violation.line_number:
+            region["endLine"] = violation.end_line_number
+
+        limit = f" (threshold {threshold})" if threshold is not None else ""
+        results.append(
+            {
+                "ruleId": RULE_ID,
+                "ruleIndex": 0,
+                "level": "error" if violation.severity in ERROR_SEVERITIES else "warning",
+                "message": {
+                    "text": (
+                        f"Function '{violation.name}' has {violation.metric} complexity "
+                        f"{violation.complexity}{limit} but no documentation"
+                    )
+                },
+                "locations": [
+                    {"physicalLocation": {"artifactLocation": location, "region": region}}
+                ],
+                "properties": {
+                    "complexity": violation.complexity,
+                    "metric": violation.metric,
+                    "severity": violation.severity,
+                },
+            }
+        )
+
+    return results
+
+
+def write_sarif(
+    out: TextIO,
+    results: "ScanResults",
+    stream: Iterable["FileResult"],
+    root: Path | None = None,
+) -> None:
+    """
+    Consume a stream of files into results, writing a SARIF log as it goes.
+
+    The document is written in three parts: the run header with the tool
+    and rule metadata, one result object per violation as each file comes
+    in, and a footer with the run totals. Only one file's results are held
+    in memory at a time. Paths are reported relative to root (default: cwd).
+    """
+    root = root or Path.cwd()
+    threshold = results.config.complexity_threshold if results.config else None
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    run_header = {
+        "tool": {
+            "driver": {
+                "name": "cognitive-guard",
+                "version": __version__,
+                "informationUri": RULE["helpUri"],
+                "rules": [RULE],
+            }
+        },
+        "originalUriBaseIds": {"%SRCROOT%": {"uri": root.as_uri() + "/"}},
+    }
+    header = {"$schema": SARIF_SCHEMA, "version": SARIF_VERSION}
+
+    # Open the document, the run and its results array
+    out.write(encode(header)[:-1] + ',"runs":[' + encode(run_header)[:-1] + ',"results":[\n')
+
+    first = True
+    for file in results.consume(stream):
+        for result in _file_results(file, threshold, root):
+            out.write(("" if first else ",\n") + encode(result))
+            first = False
+
+    totals = {
+        "files": results.total_files,
+        "functions": results.total_functions,
+        "coverage": results.get_coverage(),
+        "violations": results.total_violations,
+    }
+    out.write('\n],"properties":' + encode(totals) + "}]}\n")
+    out.flush()
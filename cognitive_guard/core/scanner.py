@@ -1,16 +1,76 @@
 """Code scanner for analyzing files and detecting violations"""
 
-import fnmatch
+import heapq
+import json
+import os
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
-from git import Repo
+from git import GitCommandError, Repo
+from rich import box
 from rich.console import Console
 from rich.table import Table
 
-from cognitive_guard.core.complexity import ComplexityResult
+from cognitive_guard.core.cache import ResultCache
+from cognitive_guard.core.complexity import SEVERITIES, ComplexityResult
 from cognitive_guard.core.config import Config
+from cognitive_guard.core.history import HistoryPoint, ScanHistory
+from cognitive_guard.core.ignore import IgnoreMatcher
+from cognitive_guard.core.snapshot import ScanSnapshot, settings_digest
+from cognitive_guard.core.vcs import (
+    changed_paths,
+    commit_log,
+    head_commit,
+    open_repo,
+    read_blobs,
+    staged_blobs,
+    tree_blobs,
+)
+from cognitive_guard.core.walker import walk_source_files
+from cognitive_guard.utils.profiler import profiler
+
+# File extensions scanned for each configured language
+LANGUAGE_EXTENSIONS: dict[str, tuple[str, ...]] = {
+    "python": (".py", ".pyi"),
+    "javascript": (".js", ".jsx", ".mjs"),
+    "typescript": (".ts", ".tsx"),
+    "java": (".java",),
+}
+
+# Below this many files, process pool startup costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+# Files are looked up and measured at most this far ahead of the one being
+# yielded, and handed to worker processes in chunks of this many
+MEASURE_WINDOW = 512
+MEASURE_CHUNK = 16
+
+# Blobs read from git are measured in batches of this many to bound memory
+BLOB_BATCH_SIZE = 1024
+
+
+def enabled_extensions(config: Config) -> tuple[str, ...]:
+    """Get the file extensions of all languages enabled in config"""
+    from cognitive_guard.parsers import ParserFactory
+
+    # Languages not built in may come with a parser from another package
+    return tuple(
+        extension
+        for lang in config.languages
+        for extension in LANGUAGE_EXTENSIONS.get(lang) or ParserFactory.plugin_extensions(lang)
+    )
+
+
+def find_violations(functions: list[ComplexityResult], config: Config) -> list[ComplexityResult]:
+    """Select the measured functions that are too complex to leave undocumented"""
+    threshold = config.complexity_threshold
+    return [f for f in functions if f.complexity > threshold and not f.has_docstring]
 
 
 @dataclass
@@ -21,44 +81,171 @@ class FileResult:
     functions: list[ComplexityResult] = field(default_factory=list)
     violations: list[ComplexityResult] = field(default_factory=list)
 
+    # Counted once on creation; results are not modified after that
+    documented_functions: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.documented_functions = sum(1 for f in self.functions if f.has_docstring)
+
     @property
     def total_functions(self) -> int:
         return len(self.functions)
 
-    @property
-    def documented_functions(self) -> int:
-        return sum(1 for f in self.functions if f.has_docstring)
-
     @property
     def coverage(self) -> float:
         if self.total_functions == 0:
             return 1.0
         return self.documented_functions / self.total_functions
 
+    def evaluate(self, config: Config) -> "FileResult":
+        """Apply the violation policy of config to the measured functions"""
+        return FileResult(self.file_path, self.functions, find_violations(self.functions, config))
+
 
 @dataclass
 class ScanResults:
-    """Aggregated scan results"""
+    """
+    Aggregated scan results.
+
+    Without keep_files, only the running totals are kept and files is left
+    empty, so streaming a scan through consume takes the same memory for
+    any number of files.
+    """
 
     files: list[FileResult] = field(default_factory=list)
     config: Config | None = None
+    keep_files: bool = True
+
+    # Running totals, kept up to date by add_file
+    total_files: int = field(default=0, init=False)
+    total_functions: int = field(default=0, init=False)
+    documented_functions: int = field(default=0, init=False)
+    total_violations: int = field(default=0, init=False)
+    violations_by_severity: Counter[str] = field(default_factory=Counter, init=False)
+
+    def __post_init__(self) -> None:
+        files, self.files = self.files, []
+        for file in files:
+            self.add_file(file)
+
+    def add_file(self, file: FileResult) -> None:
+        """Add a file's results and update the running totals"""
+        if self.keep_files:
+            self.files.append(file)
+        self.total_files += 1
+        self.total_functions += file.total_functions
+        self.documented_functions += file.documented_functions
+        self.total_violations += len(file.violations)
+        self.violations_by_severity.update(v.severity for v in file.violations)
+
+    def consume(self, stream: Iterable[FileResult]) -> Iterator[FileResult]:
+        """
+        Add files from a stream, passing each one on once it's been counted.
+
+        Lets a renderer print files while the scan is still running and then
+        summarize from the running totals.
+        """
+        for file in stream:
+            self.add_file(file)
+            yield file
 
     def has_violations(self) -> bool:
         """Check if any violations exist"""
-        return any(file.violations for file in self.files)
+        return self.total_violations > 0
 
     def get_coverage(self) -> float:
         """Calculate overall documentation coverage"""
-        total = sum(file.total_functions for file in self.files)
-        documented = sum(file.documented_functions for file in self.files)
-
-        if total == 0:
+        if self.total_functions == 0:
             return 1.0
-        return documented / total
+        return self.documented_functions / self.total_functions
 
     def get_total_violations(self) -> int:
         """Get total number of violations"""
-        return sum(len(file.violations) for file in self.files)
+        return self.total_violations
+
+    def evaluate(self, config: Config) -> "ScanResults":
+        """
+        Re-apply threshold, ignore and language settings to these results.
+
+        Only the stored measurements are used and no file is parsed again, so
+        trying out a different configuration over an existing scan is cheap.
+        """
+        matcher = IgnoreMatcher(config.ignore)
+        suffixes = enabled_extensions(config)
+
+        files = [
+            file.evaluate(config)
+            for file in self.files
+            if file.file_path.endswith(suffixes) and not matcher.matches(Path(file.file_path))
+        ]
+
+        return ScanResults(files=files, config=config)
+
+    def threshold_report(self, thresholds: Iterable[int]) -> list[dict[str, Any]]:
+        """
+        Summarize what each complexity threshold would mean for these results.
+
+        Measurements are evaluated once per threshold, so comparing several
+        candidate thresholds costs a single scan.
+        """
+        base = self.config or Config.create_default()
+        report = []
+
+        for threshold in thresholds:
+            config = base.model_copy(update={"complexity_threshold": threshold})
+            evaluated = ScanResults(files=[file.evaluate(config) for file in self.files])
+
+            complex_functions = [
+                function
+                for file in self.files
+                for function in file.functions
+                if function.complexity > threshold
+            ]
+            documented = sum(1 for function in complex_functions if function.has_docstring)
+
+            report.append(
+                {
+                    "threshold": threshold,
+                    "complex_functions": len(complex_functions),
+                    "documented": documented,
+                    "violations": evaluated.get_total_violations(),
+                    "files_with_violations": sum(1 for file in evaluated.files if file.violations),
+                    "coverage": (documented / len(complex_functions) if complex_functions else 1.0),
+                }
+            )
+
+        return report
+
+    def display_thresholds(self, console: Console, thresholds: Iterable[int]) -> None:
+        """Display violations and coverage for several thresholds side by side"""
+        current = self.config.complexity_threshold if self.config else None
+
+        table = Table(
+            title="🎚️  Threshold Comparison",
+            caption="* configured threshold" if current is not None else None,
+            show_header=True,
+        )
+        table.add_column("Threshold", justify="right")
+        table.add_column("Complex functions", justify="right")
+        table.add_column("Documented", justify="right")
+        table.add_column("Coverage", justify="right")
+        table.add_column("Violations", justify="right")
+        table.add_column("Files affected", justify="right")
+
+        for row in self.threshold_report(thresholds):
+            is_current = row["threshold"] == current
+            coverage = row["coverage"]
+            table.add_row(
+                f"{row['threshold']}{'*' if is_current else ''}",
+                str(row["complex_functions"]),
+                str(row["documented"]),
+                f"[{'green' if coverage >= 0.9 else 'yellow'}]{coverage:.1%}[/]",
+                f"[{'red' if row['violations'] > 0 else 'green'}]{row['violations']}[/]",
+                str(row["files_with_violations"]),
+                style="bold" if is_current else None,
+            )
+
+        console.print(table)
 
     def display(self, console: Console) -> None:
         """Display results in a pretty table"""
@@ -67,22 +254,10 @@ class ScanResults:
             console.print("[yellow]No files analyzed[/yellow]")
             return
 
-        # Summary statistics
-        total_functions = sum(file.total_functions for file in self.files)
-        total_violations = self.get_total_violations()
-        coverage = self.get_coverage()
-
         console.print("\n[bold]📊 Scan Results[/bold]\n")
-        console.print(f"Files analyzed: {len(self.files)}")
-        console.print(f"Total functions: {total_functions}")
-        console.print(
-            f"Documentation coverage: [{'green' if coverage >= 0.9 else 'yellow'}]{coverage:.1%}[/]"
-        )
-        console.print(
-            f"Violations: [{'red' if total_violations > 0 else 'green'}]{total_violations}[/]\n"
-        )
+        self._display_summary(console)
 
-        if total_violations > 0:
+        if self.total_violations > 0:
             table = Table(title="🚫 Documentation Violations", show_header=True)
             table.add_column("File", style="cyan")
             table.add_column("Function", style="yellow")
@@ -92,76 +267,244 @@ class ScanResults:
 
             for file_result in self.files:
                 for violation in file_result.violations:
-                    table.add_row(
-                        file_result.file_path,
-                        violation.name,
-                        str(violation.line_number),
-                        str(violation.complexity),
-                        f"{violation.emoji} {violation.severity}",
-                    )
+                    table.add_row(*_violation_row(file_result, violation))
 
             console.print(table)
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert results to dictionary"""
+    def display_stream(
+        self, console: Console, stream: Iterable[FileResult], limit: int | None = None
+    ) -> None:
+        """
+        Consume a stream of files, printing violations as they arrive.
+
+        The violations table is printed in pieces with fixed column widths,
+        so rows line up across files; the summary follows at the end. With a
+        limit, only the most complex violations are shown, once the scan is
+        done.
+        """
+        if limit is not None:
+            worst = self._worst_violations(stream, limit)
+            if worst:
+                console.print(
+                    f"\n[bold]🚫 Top {len(worst)} of {self.total_violations} "
+                    "Documentation Violations[/bold]\n"
+                )
+                table = _streaming_violation_table(show_header=True)
+                for file_result, violation in worst:
+                    table.add_row(*_violation_row(file_result, violation))
+                console.print(table)
+        else:
+            header_shown = False
+
+            for file_result in self.consume(stream):
+                if not file_result.violations:
+                    continue
+
+                if not header_shown:
+                    console.print("\n[bold]🚫 Documentation Violations[/bold]\n")
+                table = _streaming_violation_table(show_header=not header_shown)
+                header_shown = True
+
+                for violation in file_result.violations:
+                    table.add_row(*_violation_row(file_result, violation))
+                console.print(table)
+
+        if not self.total_files:
+            console.print("[yellow]No files analyzed[/yellow]")
+            return
+
+        console.print("\n[bold]📊 Scan Results[/bold]\n")
+        self._display_summary(console)
+
+    def write_plain(
+        self, out: TextIO, stream: Iterable[FileResult], limit: int | None = None
+    ) -> None:
+        """
+        Consume a stream of files, writing one plain line per violation.
+
+        Lines look like `path:line: function score severity`, which editors
+        and CI log viewers can link to, followed by a one-line summary.
+        Nothing goes through Rich, so output stays cheap for any number of
+        violations. With a limit, only the most complex violations are
+        written, once the scan is done.
+        """
+        if limit is not None:
+            worst = self._worst_violations(stream, limit)
+            out.write("".join(_plain_line(file, violation) for file, violation in worst))
+        else:
+            for file_result in self.consume(stream):
+                if file_result.violations:
+                    out.write("".join(_plain_line(file_result, v) for v in file_result.violations))
+
+        shown = f" (showing {min(limit, self.total_violations)})" if limit is not None else ""
+        out.write(
+            f"{self.total_files} files, {self.total_functions} functions, "
+            f"{self.get_coverage():.1%} documented, {self.total_violations} violations{shown}\n"
+        )
+        out.flush()
+
+    def _worst_violations(
+        self, stream: Iterable[FileResult], limit: int
+    ) -> list[tuple[FileResult, ComplexityResult]]:
+        """Consume a stream, keeping only the limit most complex violations"""
+        violations = (
+            (file_result, violation)
+            for file_result in self.consume(stream)
+            for violation in file_result.violations
+        )
+        # A bounded heap, so memory and time don't depend on the violation count
+        return heapq.nlargest(limit, violations, key=lambda item: item[1].complexity)
+
+    def _display_summary(self, console: Console) -> None:
+        coverage = self.get_coverage()
+        console.print(f"Files analyzed: {self.total_files}")
+        console.print(f"Total functions: {self.total_functions}")
+        console.print(
+            f"Documentation coverage: [{'green' if coverage >= 0.9 else 'yellow'}]{coverage:.1%}[/]"
+        )
+        breakdown = ", ".join(
+            f"{self.violations_by_severity[severity]} {severity}"
+            for severity in SEVERITIES
+            if self.violations_by_severity[severity]
+        )
+        console.print(
+            f"Violations: [{'red' if self.total_violations > 0 else 'green'}]"
+            f"{self.total_violations}[/]" + (f" ({breakdown})" if breakdown else "") + "\n"
+        )
+
+    def write_json(self, out: TextIO, stream: Iterable[FileResult]) -> None:
+        """
+        Consume a stream of files, writing the to_dict() document as it goes.
+
+        Each file entry is written as soon as the file is scanned; the totals
+        follow the file list since they are only known at the end.
+        """
+        out.write('{"files": [')
+        for index, file_result in enumerate(self.consume(stream)):
+            out.write(",\n  " if index else "\n  ")
+            out.write(json.dumps(_file_dict(file_result)))
+            out.flush()
+
+        out.write("\n],\n" + json.dumps(self._totals())[1:] + "\n")
+        out.flush()
+
+    def write_ndjson(self, out: TextIO, stream: Iterable[FileResult]) -> None:
+        """
+        Consume a stream of files, writing one JSON record per line.
+
+        Each file gets a {"type": "file", ...} record, flushed as soon as it's
+        scanned, and a final {"type": "summary", ...} record carries the totals.
+        Nothing goes through Rich, so the output can be piped straight into
+        other tools.
+        """
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+
+        for file_result in self.consume(stream):
+            out.write(encode({"type": "file", **_file_dict(file_result)}) + "\n")
+            out.flush()
+
+        out.write(encode({"type": "summary", **self._totals()}) + "\n")
+        out.flush()
+
+    def _totals(self) -> dict[str, Any]:
         return {
-            "total_files": len(self.files),
-            "total_functions": sum(file.total_functions for file in self.files),
+            "total_files": self.total_files,
+            "total_functions": self.total_functions,
             "coverage": self.get_coverage(),
-            "violations": self.get_total_violations(),
-            "files": [
-                {
-                    "path": file.file_path,
-                    "functions": file.total_functions,
-                    "documented": file.documented_functions,
-                    "violations": [
-                        {
-                            "function": v.name,
-                            "line": v.line_number,
-                            "complexity": v.complexity,
-                            "severity": v.severity,
-                        }
-                        for v in file.violations
-                    ],
-                }
-                for file in self.files
-            ],
+            "violations": self.total_violations,
+            "violations_by_severity": {
+                severity: self.violations_by_severity[severity] for severity in SEVERITIES
+            },
         }
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert results to dictionary"""
+        return {**self._totals(), "files": [_file_dict(file) for file in self.files]}
+
+
+def _file_dict(file: FileResult) -> dict[str, Any]:
+    """Describe a file's results for JSON output"""
+    return {
+        "path": file.file_path,
+        "functions": file.total_functions,
+        "documented": file.documented_functions,
+        "violations": [
+            {
+                "function": v.name,
+                "line": v.line_number,
+                "complexity": v.complexity,
+                "metric": v.metric,
+                "severity": v.severity,
+            }
+            for v in file.violations
+        ],
+    }
+
+
+def _plain_line(file: FileResult, violation: ComplexityResult) -> str:
+    return (
+        f"{file.file_path}:{violation.line_number}: "
+        f"{violation.name} {violation.complexity} {violation.severity}\n"
+    )
+
+
+def _violation_row(file: FileResult, violation: ComplexityResult) -> tuple[str, ...]:
+    return (
+        file.file_path,
+        violation.name,
+        str(violation.line_number),
+        str(violation.complexity),
+        f"{violation.emoji} {violation.severity}",
+    )
+
+
+def _streaming_violation_table(show_header: bool) -> Table:
+    """A violations table whose column widths only depend on the console width"""
+    table = Table(box=box.SIMPLE_HEAD, show_header=show_header, show_edge=False, expand=True)
+    table.add_column("File", style="cyan", ratio=3, no_wrap=True, overflow="ellipsis")
+    table.add_column("Function", style="yellow", ratio=2, no_wrap=True, overflow="ellipsis")
+    table.add_column("Line", style="dim", width=6)
+    table.add_column("Score", justify="right", width=5)
+    table.add_column("Severity", justify="center", width=16)
+    return table
+
 
 class CodeScanner:
     """Scans code files and detects documentation violations"""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, jobs: int | None = None, cache: ResultCache | None = None):
         self.config = config
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache = cache
+        self._ignore_matcher: IgnoreMatcher | None = None
+
+    @property
+    def ignore_matcher(self) -> IgnoreMatcher:
+        """Compiled matcher for the configured ignore patterns"""
+        patterns = tuple(self.config.ignore)
+        if self._ignore_matcher is None or self._ignore_matcher.patterns != patterns:
+            self._ignore_matcher = IgnoreMatcher(patterns)
+        return self._ignore_matcher
 
     def should_ignore(self, path: Path) -> bool:
         """Check if path should be ignored"""
-        path_str = str(path)
-        for pattern in self.config.ignore:
-            # Use Path.match for proper ** glob support
-            if path.match(pattern):
-                return True
-            # Also try fnmatch for patterns without **
-            if fnmatch.fnmatch(path_str, pattern):
-                return True
-            # Handle ** at start of pattern for root-level files
-            if pattern.startswith("**/"):
-                simple_pattern = pattern[3:]  # Remove **/
-                if fnmatch.fnmatch(path.name, simple_pattern):
-                    return True
-            # Check if any parent directory matches pattern
-            # e.g., **/__pycache__/** should match __pycache__/file.pyc
-            if "__pycache__" in pattern and "__pycache__" in path_str:
-                return True
-            # Check if path contains any part of the pattern
-            for part in path.parts:
-                if fnmatch.fnmatch(part, pattern.replace("**/", "").replace("/**", "")):
-                    return True
-        return False
+        return self.ignore_matcher.matches(path)
 
-    def scan_file(self, file_path: Path) -> FileResult:
-        """Scan a single file for violations using appropriate parser"""
+    def should_prune(self, path: Path) -> bool:
+        """Check if a directory can be skipped without descending into it"""
+        return self.ignore_matcher.prunes(path)
+
+    def discover_files(self) -> list[Path]:
+        """Find all files of the enabled languages in a single directory walk"""
+        suffixes = enabled_extensions(self.config)
+        if not suffixes:
+            return []
+
+        with profiler.phase("discover"):
+            return walk_source_files(Path.cwd(), suffixes, self.should_ignore, self.should_prune)
+
+    def measure_file(self, file_path: Path) -> list[ComplexityResult]:
+        """Measure every function in a file using the appropriate parser"""
         from cognitive_guard.parsers import ParserFactory
 
         # Get the appropriate parser for this file
@@ -169,77 +512,569 @@ class CodeScanner:
 
         if parser is None:
             # No parser available for this file type
-            return FileResult(file_path=str(file_path), functions=[], violations=[])
+            return []
 
-        # Parse the file
-        results = parser.parse_file(str(file_path))
+        with profiler.file(str(file_path), type(parser).__name__):
+            return parser.parse_file(str(file_path))
 
-        violations = [
-            result
-            for result in results
-            if result.complexity > self.config.complexity_threshold and not result.has_docstring
-        ]
+    def measure_source(self, file_path: Path, source: bytes) -> list[ComplexityResult]:
+        """Measure every function in in-memory file content"""
+        from cognitive_guard.parsers import ParserFactory
 
-        return FileResult(file_path=str(file_path), functions=results, violations=violations)
+        parser = ParserFactory.get_parser(str(file_path))
+        if parser is None:
+            return []
 
-    def scan_staged(self) -> ScanResults:
-        """Scan only staged files in git"""
+        with profiler.file(str(file_path), type(parser).__name__, len(source)):
+            return parser.parse_source(source, str(file_path))
+
+    def scan_file(self, file_path: Path) -> FileResult:
+        """Scan a single file for violations using appropriate parser"""
+        functions = self.measure_file(file_path)
+        with profiler.phase("evaluate"):
+            return FileResult(str(file_path), functions).evaluate(self.config)
+
+    def scan_files(self, file_paths: Iterable[Path]) -> list[FileResult]:
+        """
+        Scan several files, reusing cached results for unchanged content.
+
+        Results are ordered by path. Files missing from the cache are
+        analyzed (in parallel if there are enough of them) and stored.
+        """
+        return list(self.iter_files(file_paths))
+
+    def iter_files(self, file_paths: Iterable[Path]) -> Iterator[FileResult]:
+        """
+        Scan several files, yielding each result as soon as it's ready.
+
+        Works like scan_files, in the same order, but cached files are
+        yielded right away while the rest are still being analyzed. Files
+        are looked up in the cache and measured at most MEASURE_WINDOW ahead
+        of the one being yielded, so memory doesn't grow with their number.
+        The cache is saved once the stream ends or is closed.
+        """
+        paths = sorted(file_paths)
+        # Paths looked up but not yet yielded, with their cache keys. Cached
+        # results are only decoded once it's their path's turn.
+        looked_up: deque[tuple[Path, tuple[str, str] | None]] = deque()
+
+        def lookups() -> Iterator[tuple[Path] | None]:
+            for path in paths:
+                key, cached = self._lookup(path)
+                looked_up.append((path, key))
+                yield None if cached else (path,)
+
+        measured = self._iter_measure("measure_file", lookups())
         try:
-            repo = Repo(Path.cwd(), search_parent_directories=True)
-        except Exception:
-            return ScanResults(config=self.config)
+            for functions in measured:
+                path, key = looked_up.popleft()
+                if key is not None and self.cache is not None:
+                    cached = self.cache.get(*key)
+                    if cached is not None:
+                        functions = cached
+                    else:
+                        self.cache.put(*key, functions)
+                with profiler.phase("evaluate"):
+                    result = FileResult(str(path), functions or []).evaluate(self.config)
+                yield result
+        finally:
+            measured.close()
+            if self.cache is not None:
+                self.cache.save()
+
+    def _lookup(self, path: Path) -> tuple[tuple[str, str] | None, bool]:
+        """
+        Find a file's cache key, and whether results are cached under it.
+
+        Files no parser handles count as cached, with no key and no results.
+        """
+        from cognitive_guard.parsers import ParserFactory
+
+        parser = ParserFactory.get_parser(str(path))
+        if parser is None:
+            return None, True
+        if self.cache is None:
+            return None, False
+
+        with profiler.phase("read"):
+            digest = self.cache.file_digest(path)
+        if digest is None:
+            return None, False
+        key = (digest, parser.cache_key)
+        return key, self.cache.has(*key)
+
+    def scan_blobs(self, repo: Repo, blobs: Iterable[tuple[Path, str]]) -> list[FileResult]:
+        """Scan file contents stored in git, given (path, blob id) pairs"""
+        items = sorted(blobs)
+        measured = self.measure_blobs(repo, items)
+
+        with profiler.phase("evaluate"):
+            return [
+                FileResult(str(path), functions).evaluate(self.config)
+                for (path, _), functions in zip(items, measured)
+                if functions is not None
+            ]
+
+    def measure_blobs(
+        self, repo: Repo, blobs: list[tuple[Path, str]]
+    ) -> list[list[ComplexityResult] | None]:
+        """
+        Measure file contents stored in git, given (path, blob id) pairs.
+
+        Blob ids double as cache keys, so content that was analyzed before is
+        never read from git again, and each distinct blob is measured once no
+        matter how many paths share it. The rest is streamed through a single
+        `git cat-file --batch` process and analyzed in memory, in batches so
+        large walks don't hold every blob at once. Results are in the order of
+        blobs, with None where the blob couldn't be read.
+        """
+        from cognitive_guard.parsers import ParserFactory
+
+        measured: dict[tuple[str, str], list[ComplexityResult]] = {}
+        keys: list[tuple[str, str] | None] = []
+        wanted: dict[str, dict[str, Path]] = {}
+
+        for path, blob_id in blobs:
+            parser = ParserFactory.get_parser(str(path))
+            if parser is None:
+                keys.append(None)
+                continue
+
+            key = (blob_id, parser.cache_key)
+            keys.append(key)
+            if key in measured or parser.cache_key in wanted.get(blob_id, {}):
+                continue
+
+            cached = self.cache.get(*key) if self.cache is not None else None
+            if cached is not None:
+                measured[key] = cached
+            else:
+                wanted.setdefault(blob_id, {})[parser.cache_key] = path
+
+        batch: list[tuple[str, str, Path, bytes]] = []
+        for blob_id, data in profiler.timed_iter("read", read_blobs(repo, wanted)):
+            batch.extend(
+                (blob_id, parser_key, path, data) for parser_key, path in wanted[blob_id].items()
+            )
+            if len(batch) >= BLOB_BATCH_SIZE:
+                self._measure_batch(batch, measured)
+                batch = []
+        self._measure_batch(batch, measured)
+
+        if self.cache is not None:
+            self.cache.save()
+        return [measured.get(key) if key is not None else [] for key in keys]
+
+    def _measure_batch(
+        self,
+        batch: list[tuple[str, str, Path, bytes]],
+        measured: dict[tuple[str, str], list[ComplexityResult]],
+    ) -> None:
+        """Measure in-memory blob contents and record them by blob and parser"""
+        results = self._measure_many("measure_source", [(path, data) for _, _, path, data in batch])
+
+        for (blob_id, parser_key, _, _), functions in zip(batch, results):
+            if self.cache is not None:
+                self.cache.put(blob_id, parser_key, functions)
+            measured[(blob_id, parser_key)] = functions
+
+    def _measure_many(self, method: str, calls: list[tuple[Any, ...]]) -> list[Any]:
+        """Call a measuring method for each argument tuple, returning results in order"""
+        return list(self._iter_measure(method, calls))
+
+    def _iter_measure(self, method: str, calls: Iterable[tuple[Any, ...] | None]) -> Iterator[Any]:
+        """
+        Call a measuring method for each argument tuple, spreading the work
+        over a process pool.
+
+        Results are yielded in the order of calls, as soon as each one is
+        ready, regardless of which worker finishes first; a None call gives a
+        None result. Calls are read at most MEASURE_WINDOW ahead of the result
+        being waited for, so a stream of calls is never held all at once. The
+        pool only starts once PARALLEL_MIN_FILES calls are waiting, so small
+        batches (e.g. a typical commit) don't pay its startup cost.
+        """
+        measure = getattr(self, method)
+        calls = iter(calls)
+        jobs = self.jobs
+        profiling = profiler.enabled
+        pool: ProcessPoolExecutor | None = None
+
+        # Calls read but not yet answered, as [args, chunk future, index in chunk]
+        window: deque[list[Any]] = deque()
+        # Calls in the window not yet sent to the pool
+        unsent: deque[list[Any]] = deque()
+        exhausted = False
 
-        # Get staged files - handle case where HEAD doesn't exist (initial commit)
         try:
-            # Try to diff against HEAD
-            staged_files = [item.a_path for item in repo.index.diff("HEAD")]
-        except Exception:
-            # HEAD doesn't exist (initial commit), get all staged files
-            try:
-                staged_files = [item[0] for item in repo.index.entries.keys()]
-            except Exception:
-                # Fallback: return empty results if git operations fail
-                return ScanResults(config=self.config)
+            while True:
+                if not exhausted:
+                    wanted = MEASURE_WINDOW - len(window)
+                    read = 0
+                    for args in islice(calls, wanted):
+                        read += 1
+                        slot = [args, None, 0]
+                        window.append(slot)
+                        if args is not None:
+                            unsent.append(slot)
+                    exhausted = read < wanted
 
-        file_results: list[FileResult] = []
+                if pool is None and jobs > 1 and len(unsent) >= PARALLEL_MIN_FILES:
+                    pool = ProcessPoolExecutor(
+                        max_workers=jobs,
+                        initializer=_init_worker,
+                        initargs=(self.config, profiling),
+                    )
+                if pool is not None:
+                    try:
+                        while len(unsent) >= MEASURE_CHUNK or exhausted and unsent:
+                            count = min(MEASURE_CHUNK, len(unsent))
+                            chunk = [unsent.popleft() for _ in range(count)]
+                            future = pool.submit(
+                                _call_in_worker, method, [slot[0] for slot in chunk]
+                            )
+                            for index, slot in enumerate(chunk):
+                                slot[1], slot[2] = future, index
+                    except (OSError, BrokenProcessPool):
+                        # No usable process pool on this platform, measure serially
+                        pool, jobs, unsent = None, 1, _take_back(pool, window)
 
-        for file_path in staged_files:
-            path = Path(file_path)
+                if not window:
+                    return
+                args, future, index = window.popleft()
+                if args is None:
+                    yield None
+                    continue
+                if future is None:
+                    unsent.popleft()
+                    yield measure(*args)
+                    continue
 
-            if not path.exists() or self.should_ignore(path):
+                try:
+                    with profiler.phase("wait"):
+                        results = future.result()
+                except (OSError, BrokenProcessPool):
+                    # The pool broke down, measure the rest serially
+                    assert pool is not None
+                    pool, jobs, unsent = None, 1, _take_back(pool, window)
+                    yield measure(*args)
+                    continue
+                if profiling:
+                    # Workers send their timings back along with each chunk
+                    results, timings = results
+                    if index == 0:
+                        profiler.merge(timings)
+                        profiler.workers = max(profiler.workers, jobs)
+                yield results[index]
+        finally:
+            # Also reached when the consumer stops early; don't finish its work
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def scan_staged(self) -> ScanResults:
+        """
+        Scan the staged content of files in git.
+
+        Content is read from the index rather than the working tree, so
+        partially staged files (`git add -p`) are checked as they will be
+        committed.
+        """
+        from cognitive_guard.parsers import ParserFactory
+
+        repo = open_repo()
+        if repo is None:
+            return ScanResults(config=self.config)
+
+        try:
+            with profiler.phase("discover"):
+                staged = staged_blobs(repo)
+        except GitCommandError:
+            return ScanResults(config=self.config)
+
+        root = Path(repo.working_tree_dir or Path.cwd())
+        suffixes = enabled_extensions(self.config)
+        blobs: list[tuple[Path, str]] = []
+
+        for name, blob_id in staged:
+            # Only files of enabled languages that a parser can analyze
+            if not name.endswith(suffixes) or ParserFactory.get_parser(name) is None:
                 continue
 
-            if path.suffix == ".py":  # Currently only Python
-                result = self.scan_file(path)
-                if result.functions:  # Only include files with functions
-                    file_results.append(result)
+            # Report paths relative to cwd, which is the repo root in hooks
+            path = Path(os.path.relpath(root / name))
+
+            if not self.should_ignore(path):
+                blobs.append((path, blob_id))
+
+        # Only include files with functions
+        file_results = [result for result in self.scan_blobs(repo, blobs) if result.functions]
 
         return ScanResults(files=file_results, config=self.config)
 
     def scan_all(self) -> ScanResults:
         """Scan all files in the project"""
-        file_results: list[FileResult] = []
-
-        # Define file extensions to scan based on config
-        extensions = []
-        for lang in self.config.languages:
-            if lang == "python":
-                extensions.extend(["*.py", "*.pyi"])
-            elif lang == "javascript":
-                extensions.extend(["*.js", "*.jsx", "*.mjs"])
-            elif lang == "typescript":
-                extensions.extend(["*.ts", "*.tsx"])
-            elif lang == "java":
-                extensions.append("*.java")
-
-        # Scan files with matching extensions
-        for pattern in extensions:
-            for file_path in Path.cwd().rglob(pattern):
-                if self.should_ignore(file_path):
-                    continue
+        return ScanResults(files=list(self.iter_scan()), config=self.config)
+
+    def iter_scan(self) -> Iterator[FileResult]:
+        """
+        Scan all files in the project, yielding results as they complete.
 
-                result = self.scan_file(file_path)
-                if result.functions:
-                    file_results.append(result)
+        Only files with functions are yielded, in path order. Feed the stream
+        to ScanResults.consume (or a streaming renderer) to print results
+        before the scan has finished.
+        """
+        for result in self.iter_files(self.discover_files()):
+            if result.functions:
+                yield result
+
+    def scan_revision(self, rev: str) -> ScanResults:
+        """
+        Scan the files of a git revision without checking it out.
+
+        Only files that a scan of the current directory would pick up are
+        included, and results carry the same paths as scan_all. Raises
+        GitCommandError if rev can't be resolved.
+        """
+        repo = self._require_repo()
+        select = self._tree_selector(repo)
+        with profiler.phase("discover"):
+            blobs = [
+                (path, blob_id)
+                for name, blob_id in tree_blobs(repo, rev)
+                if (path := select(name)) is not None
+            ]
+
+        # Only include files with functions
+        file_results = [result for result in self.scan_blobs(repo, blobs) if result.functions]
 
         return ScanResults(files=file_results, config=self.config)
+
+    def scan_history(self, last: int | None = None, since: str | None = None) -> ScanHistory:
+        """
+        Compute scan totals for each first-parent commit back from HEAD.
+
+        The oldest commit's tree is listed once and later trees are rebuilt by
+        replaying each commit's changes, with totals adjusted only for the
+        files that changed. Every distinct blob is analyzed once across the
+        whole walk (and not at all if it's already cached), so a long history
+        costs about one full scan plus the changed blobs. Raises
+        GitCommandError if git can't produce the log.
+        """
+        repo = self._require_repo()
+        with profiler.phase("discover"):
+            commits = commit_log(repo, last=last, since=since)
+        if not commits:
+            return ScanHistory()
+
+        select = self._tree_selector(repo)
+        with profiler.phase("discover"):
+            tree = {
+                name: blob_id
+                for name, blob_id in tree_blobs(repo, commits[0].commit)
+                if select(name) is not None
+            }
+        for commit in commits[1:]:
+            commit.changes = [
+                (name, blob_id) for name, blob_id in commit.changes if select(name) is not None
+            ]
+
+        # Measure every version of every file up front, deduplicated by blob
+        versions = set(tree.items())
+        versions.update(
+            (name, blob_id)
+            for commit in commits[1:]
+            for name, blob_id in commit.changes
+            if blob_id is not None
+        )
+        items = sorted(versions)
+        root = Path(repo.working_tree_dir or Path.cwd())
+        measured = self.measure_blobs(repo, [(root / name, blob_id) for name, blob_id in items])
+
+        totals: dict[tuple[str, str], tuple[int, int, int, int]] = {}
+        for (name, blob_id), functions in zip(items, measured):
+            if functions:
+                violations = find_violations(functions, self.config)
+                documented = sum(1 for f in functions if f.has_docstring)
+                totals[(name, blob_id)] = (1, len(functions), documented, len(violations))
+
+        running = [0, 0, 0, 0]
+
+        def apply(name: str, blob_id: str, sign: int) -> None:
+            for i, value in enumerate(totals.get((name, blob_id), (0, 0, 0, 0))):
+                running[i] += sign * value
+
+        history = ScanHistory()
+        for index, commit in enumerate(commits):
+            if index == 0:
+                for name, blob_id in tree.items():
+                    apply(name, blob_id, 1)
+            else:
+                for name, new_blob_id in commit.changes:
+                    old_blob_id = tree.pop(name, None)
+                    if old_blob_id is not None:
+                        apply(name, old_blob_id, -1)
+                    if new_blob_id is not None:
+                        tree[name] = new_blob_id
+                        apply(name, new_blob_id, 1)
+
+            files, functions, documented, violations = running
+            history.points.append(
+                HistoryPoint(
+                    commit.commit,
+                    commit.timestamp,
+                    commit.summary,
+                    files=files,
+                    functions=functions,
+                    documented=documented,
+                    violations=violations,
+                )
+            )
+
+        return history
+
+    def _require_repo(self) -> Repo:
+        repo = open_repo()
+        if repo is None:
+            raise ValueError("Not inside a git repository")
+        return repo
+
+    def _tree_selector(self, repo: Repo) -> Callable[[str], Path | None]:
+        """
+        Build a function mapping repository paths to the paths a scan of the
+        current directory would report, or None for files it would skip.
+        """
+        root = Path(repo.working_tree_dir or Path.cwd())
+        cwd = Path.cwd()
+        suffixes = enabled_extensions(self.config)
+        selected: dict[str, Path | None] = {}
+
+        def select(name: str) -> Path | None:
+            if name not in selected:
+                path = root / name
+                keep = (
+                    path.name.endswith(suffixes)
+                    and path.is_relative_to(cwd)
+                    and not self.should_ignore(path)
+                )
+                selected[name] = path if keep else None
+            return selected[name]
+
+        return select
+
+    def scan_incremental(self, ref: str | None = None) -> ScanResults:
+        """
+        Re-analyze only files changed since a git ref, reusing the last snapshot.
+
+        Without a ref, changes since the commit of the last snapshot are used;
+        with one, files changed since either are re-analyzed. Files measured
+        by an older parser version are re-analyzed too. Falls back to a full
+        scan if there is no snapshot, it was taken with different languages
+        or ignore patterns, or git can't tell what changed.
+        """
+        from cognitive_guard.parsers import ParserFactory
+
+        snapshot = ScanSnapshot.load()
+        repo = open_repo()
+        if (
+            snapshot is None
+            or repo is None
+            or snapshot.commit is None
+            or snapshot.settings != settings_digest(self.config)
+        ):
+            return self.scan_all()
+
+        try:
+            with profiler.phase("discover"):
+                changed = set(changed_paths(repo, snapshot.commit))
+                if ref is not None and ref != snapshot.commit:
+                    changed.update(changed_paths(repo, ref))
+        except GitCommandError:
+            return self.scan_all()
+
+        for name in snapshot.files:
+            parser = ParserFactory.get_parser(name)
+            if parser is None or snapshot.parsers.get(name) != parser.cache_key:
+                changed.add(Path(name))
+
+        root = Path.cwd()
+        suffixes = enabled_extensions(self.config)
+        files = dict(snapshot.files)
+        rescan: list[Path] = []
+
+        for path in {*changed, *map(Path, snapshot.dirty)}:
+            files.pop(str(path), None)
+            if (
+                path.name.endswith(suffixes)
+                and path.is_relative_to(root)
+                and path.is_file()
+                and not self.should_ignore(path)
+            ):
+                rescan.append(path)
+
+        for result in self.scan_files(rescan):
+            if result.functions:
+                files[result.file_path] = result.functions
+
+        merged = ScanResults(files=[FileResult(name, files[name]) for name in sorted(files)])
+        return merged.evaluate(self.config)
+
+    def save_snapshot(self, results: ScanResults) -> None:
+        """
+        Remember the measurements of a complete scan for incremental scans.
+
+        results must have kept their files (see ScanResults.keep_files).
+        """
+        from cognitive_guard.parsers import ParserFactory
+
+        repo = open_repo()
+        commit = head_commit(repo) if repo is not None else None
+        dirty: list[str] = []
+
+        if repo is not None and commit is not None:
+            try:
+                dirty = [str(path) for path in changed_paths(repo, commit)]
+            except GitCommandError:
+                commit = None
+
+        parsers = {}
+        for file in results.files:
+            parser = ParserFactory.get_parser(file.file_path)
+            if parser is not None:
+                parsers[file.file_path] = parser.cache_key
+
+        ScanSnapshot(
+            commit=commit,
+            files={file.file_path: file.functions for file in results.files},
+            dirty=dirty,
+            parsers=parsers,
+            settings=settings_digest(self.config),
+        ).save()
+
+
+# Scanner used by each worker process of the parallel scan pool
+_worker_scanner: CodeScanner | None = None
+
+
+def _init_worker(config: Config, profiling: bool = False) -> None:
+    global _worker_scanner
+    _worker_scanner = CodeScanner(config, jobs=1)
+    if profiling:
+        profiler.enable()
+
+
+def _take_back(pool: ProcessPoolExecutor, window: deque[list[Any]]) -> deque[list[Any]]:
+    """Shut down a broken pool, returning the calls in the window as unsent"""
+    pool.shutdown(cancel_futures=True)
+    unsent = deque(slot for slot in window if slot[0] is not None)
+    for slot in unsent:
+        slot[1] = None
+    return unsent
+
+
+def _call_in_worker(method: str, calls: list[tuple[Any, ...]]) -> Any:
+    assert _worker_scanner is not None
+    measure = getattr(_worker_scanner, method)
+    results = [measure(*args) for args in calls]
+    if profiler.enabled:
+        return results, profiler.drain()
+    return results
@@ -0,0 +1,95 @@
+"""Snapshot of the last completed scan, used for incremental checks"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cognitive_guard import __version__
+from cognitive_guard.core.cache import CACHE_FORMAT, decode_results, encode_results
+from cognitive_guard.core.complexity import ComplexityResult
+from cognitive_guard.core.config import Config
+
+
+def settings_digest(config: Config) -> str:
+    """Fingerprint the settings that decide which files a scan covers"""
+    settings = {"languages": sorted(config.languages), "ignore": sorted(config.ignore)}
+    return hashlib.sha1(json.dumps(settings).encode()).hexdigest()
+
+
+@dataclass
+class ScanSnapshot:
+    """
+    Per-file measurements of a full scan and the commit it was taken at.
+
+    Paths are stored relative to the scan root so a snapshot stays valid if
+    the checkout moves (e.g. between CI agents). Files that had uncommitted
+    changes at the time are remembered, since a later diff against the
+    commit wouldn't report them if the changes were reverted. Each file's
+    parser cache key and the settings digest tell whether stored results
+    are still what a scan with the current parsers and config would give.
+    """
+
+    commit: str | None = None
+    files: dict[str, list[ComplexityResult]] = field(default_factory=dict)
+    dirty: list[str] = field(default_factory=list)
+    # File -> cache key of the parser that measured it
+    parsers: dict[str, str] = field(default_factory=dict)
+    settings: str | None = None
+
+    @staticmethod
+    def default_path() -> Path:
+        return Path.cwd() / ".cognitive-guard" / "snapshot.json"
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "ScanSnapshot | None":
+        """Load the snapshot, or None if there is no usable one"""
+        path = path or cls.default_path()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("format") != CACHE_FORMAT or data.get("version") != __version__:
+            return None
+
+        root = path.parent.parent
+        return cls(
+            commit=data.get("commit"),
+            files={
+                str(root / name): decode_results(rows)
+                for name, rows in data.get("files", {}).items()
+            },
+            dirty=[str(root / name) for name in data.get("dirty", [])],
+            parsers={str(root / name): key for name, key in data.get("parsers", {}).items()},
+            settings=data.get("settings"),
+        )
+
+    def save(self, path: Path | None = None) -> None:
+        """Save the snapshot"""
+        path = path or self.default_path()
+        root = path.parent.parent
+
+        data = {
+            "format": CACHE_FORMAT,
+            "version": __version__,
+            "commit": self.commit,
+            "files": {
+                Path(os.path.relpath(name, root)).as_posix(): encode_results(functions)
+                for name, functions in self.files.items()
+            },
+            "dirty": [Path(os.path.relpath(name, root)).as_posix() for name in self.dirty],
+            "parsers": {
+                Path(os.path.relpath(name, root)).as_posix(): key
+                for name, key in self.parsers.items()
+            },
+            "settings": self.settings,
+        }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
@@ -0,0 +1,187 @@
+"""Git helpers for scanning changes and revisions"""
+
+import subprocess
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from git import Repo
+
+
+def open_repo(path: Path | None = None) -> Repo | None:
+    """Open the git repository containing path (default: cwd), if any"""
+    try:
+        return Repo(path or Path.cwd(), search_parent_directories=True)
+    except Exception:
+        return None
+
+
+def head_commit(repo: Repo) -> str | None:
+    """Get the commit id of HEAD, or None before the first commit"""
+    try:
+        return repo.head.commit.hexsha
+    except ValueError:
+        return None
+
+
+def changed_paths(repo: Repo, ref: str) -> list[Path]:
+    """
+    List working tree files that differ from ref, as absolute paths.
+
+    Tracked changes (staged or not, including deletions) come from a single
+    `git diff --name-only` call; untracked files are added since they can't
+    show up in a diff.
+    """
+    root = Path(repo.working_tree_dir or Path.cwd())
+    output = repo.git.diff("--name-only", "--no-renames", "-z", ref, "--")
+
+    names = [name for name in output.split("\0") if name]
+    names.extend(repo.untracked_files)
+
+    return [root / name for name in names]
+
+
+@dataclass
+class CommitChanges:
+    """A commit and the files it changed relative to its first parent"""
+
+    commit: str
+    timestamp: int
+    summary: str
+    # (path, new blob id), with None for files that are gone or not regular
+    changes: list[tuple[str, str | None]] = field(default_factory=list)
+
+
+def commit_log(
+    repo: Repo, last: int | None = None, since: str | None = None
+) -> list[CommitChanges]:
+    """
+    List first-parent commits from HEAD back, oldest first, with their changes.
+
+    Everything comes from a single `git log --raw` call. Merges are diffed
+    against their first parent, so replaying the changes in order reproduces
+    each commit's tree from the oldest one.
+    """
+    args = ["--first-parent", "-m", "--raw", "-z", "--no-renames", "--no-abbrev"]
+    args.append("--format=commit %H %ct %s")
+    if last is not None:
+        args.append(f"-n{last}")
+    if since is not None:
+        args.append(f"--since={since}")
+
+    # Each commit is "commit <id> <time> <subject>\0" followed by raw
+    # records ":<old mode> <new mode> <old id> <new id> <status>\0<path>\0"
+    commits: list[CommitChanges] = []
+    fields = iter(repo.git.log(*args, "--").split("\0"))
+    for token in fields:
+        token = token.lstrip("\n")
+        if token.startswith("commit "):
+            _, commit, timestamp, *summary = token.split(" ", 3)
+            commits.append(CommitChanges(commit, int(timestamp), " ".join(summary)))
+        elif token.startswith(":") and commits:
+            parts = token.split()
+            name = next(fields, "")
+            regular = parts[1] not in ("120000", "160000") and parts[4] != "D"
+            commits[-1].changes.append((name, parts[3] if regular else None))
+
+    commits.reverse()
+    return commits
+
+
+def staged_blobs(repo: Repo) -> list[tuple[str, str]]:
+    """
+    List files added or modified in the index, with their staged blob ids.
+
+    Uses a single `git diff --cached --raw` call, which also works before the
+    first commit. Paths are relative to the repository root.
+    """
+    output = repo.git.diff(
+        "--cached", "--raw", "-z", "--no-abbrev", "--no-renames", "--diff-filter=ACM"
+    )
+
+    # Records are ":<old mode> <new mode> <old id> <new id> <status>\0<path>\0"
+    fields = output.split("\0")
+    staged = []
+    for header, name in zip(fields[0::2], fields[1::2]):
+        parts = header.split()
+        if len(parts) >= 4 and name:
+            staged.append((name, parts[3]))
+    return staged
+
+
+def tree_blobs(repo: Repo, rev: str) -> list[tuple[str, str]]:
+    """
+    List the files in a revision's tree, with their blob ids.
+
+    Paths are relative to the repository root. Symlinks and submodules are
+    left out, as a directory walk wouldn't scan them either.
+    """
+    output = repo.git.ls_tree("-r", "-z", "--full-tree", rev)
+
+    # Records are "<mode> <type> <id>\t<path>\0"
+    blobs = []
+    for record in output.split("\0"):
+        header, _, name = record.partition("\t")
+        parts = header.split()
+        if len(parts) == 3 and parts[1] == "blob" and parts[0] != "120000":
+            blobs.append((name, parts[2]))
+    return blobs
+
+
+def read_blobs(repo: Repo, blob_ids: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+    """
+    Stream blob contents through one `git cat-file --batch` process.
+
+    Ids are fed from a background thread while contents are read back, so the
+    whole batch is pipelined instead of costing a round trip per blob. Yields
+    (blob id, content) in request order; ids that don't name a blob (missing
+    objects, submodule commits) are skipped.
+    """
+    ids = list(blob_ids)
+    if not ids:
+        return
+
+    proc = subprocess.Popen(
+        [repo.git.GIT_PYTHON_GIT_EXECUTABLE, "cat-file", "--batch"],
+        cwd=repo.working_dir,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+    stdin, stdout = proc.stdin, proc.stdout
+
+    def feed() -> None:
+        try:
+            for blob_id in ids:
+                stdin.write(f"{blob_id}\n".encode())
+            stdin.close()
+        except OSError:
+            # git exited early; the reader notices the closed stream
+            pass
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+
+    try:
+        for blob_id in ids:
+            header = stdout.readline()
+            if not header:
+                break
+
+            # "<id> <type> <size>\n<content>\n" or "<id> missing\n"
+            parts = header.split()
+            if len(parts) != 3:
+                continue
+
+            data = stdout.read(int(parts[2]))
+            stdout.read(1)
+            if parts[1] == b"blob":
+                yield blob_id, data
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        stdout.close()
+        writer.join()
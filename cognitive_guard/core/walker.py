@@ -0,0 +1,66 @@
+"""Single-pass directory walker for source file discovery"""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+
+def walk_source_files(
+    root: Path,
+    suffixes: tuple[str, ...],
+    should_ignore: Callable[[Path], bool],
+    should_prune: Callable[[Path], bool],
+) -> list[Path]:
+    """
+    Walk the tree below root once and collect files ending in any of suffixes.
+
+    Directories for which should_prune returns True are skipped without being
+    descended into. Symlinked directories are not followed (matching
+    Path.rglob), and files reachable through more than one path (symlinks,
+    hard links) are only returned once, keyed by device and inode.
+    """
+    found: list[Path] = []
+    seen: set[tuple[int, int]] = set()
+    stack = [root]
+
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs: list[Path] = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    path = Path(entry.path)
+                    if not should_prune(path):
+                        subdirs.append(path)
+                    continue
+
+                if not entry.name.endswith(suffixes) or not entry.is_file():
+                    continue
+
+                path = Path(entry.path)
+                if should_ignore(path):
+                    continue
+
+                st = entry.stat()
+            except OSError:
+                continue
+
+            # Some platforms report no inode from scandir; skip dedupe there
+            if st.st_ino:
+                key = (st.st_dev, st.st_ino)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            found.append(path)
+
+        # Reverse so the stack pops subdirectories in sorted order
+        stack.extend(reversed(subdirs))
+
+    return found
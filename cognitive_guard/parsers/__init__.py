@@ -1,220 +1,166 @@
 """Language-specific parsers for different programming languages"""
 
+import importlib
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from importlib.metadata import entry_points
 from pathlib import Path
-
-import lizard
+from typing import Any
 
 from cognitive_guard.core.complexity import ComplexityResult
 
+# Entry-point group for parsers from other packages. Each entry point is
+# named after the language, as listed under `languages` in the config, and
+# refers to a BaseParser subclass, e.g. in pyproject.toml:
+#   [project.entry-points."cognitive_guard.parsers"]
+#   go = "cognitive_guard_go:GoParser"
+ENTRY_POINT_GROUP = "cognitive_guard.parsers"
+
+# Built-in parsers by file extension, as "module:class"; each module is only
+# imported once a file with one of its extensions is parsed
+BUILTIN_PARSERS: dict[str, str] = {
+    ".py": "cognitive_guard.parsers.python:PythonParser",
+    ".pyi": "cognitive_guard.parsers.python:PythonParser",
+    ".js": "cognitive_guard.parsers.javascript:JavaScriptParser",
+    ".jsx": "cognitive_guard.parsers.javascript:JavaScriptParser",
+    ".mjs": "cognitive_guard.parsers.javascript:JavaScriptParser",
+    ".ts": "cognitive_guard.parsers.typescript:TypeScriptParser",
+    ".tsx": "cognitive_guard.parsers.typescript:TypeScriptParser",
+    ".java": "cognitive_guard.parsers.java:JavaParser",
+}
+
+# Names that used to be defined here, now in their own (lazily imported) modules
+_MOVED = {
+    "PythonParser": "cognitive_guard.parsers.python",
+    "LizardParser": "cognitive_guard.parsers.lizard_base",
+    "DocCommentIndex": "cognitive_guard.parsers.lizard_base",
+    "JavaScriptParser": "cognitive_guard.parsers.javascript",
+    "TypeScriptParser": "cognitive_guard.parsers.typescript",
+    "JavaParser": "cognitive_guard.parsers.java",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _MOVED.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
 
 class BaseParser(ABC):
     """Base class for language-specific parsers"""
 
-    @abstractmethod
-    def parse_file(self, file_path: str) -> list[ComplexityResult]:
-        """Parse a file and return complexity results"""
-        pass
+    # Bump when a change to the parser alters its results, to invalidate caches
+    version = "1"
 
-    @abstractmethod
-    def supports_extension(self, extension: str) -> bool:
-        """Check if this parser supports the given file extension"""
-        pass
-
-
-class PythonParser(BaseParser):
-    """Parser for Python files using AST-based analysis"""
-
-    def parse_file(self, file_path: str) -> list[ComplexityResult]:
-        from cognitive_guard.core.complexity import ComplexityAnalyzer
-
-        analyzer = ComplexityAnalyzer()
-        return analyzer.analyze_file(file_path)
-
-    def supports_extension(self, extension: str) -> bool:
-        return extension in [".py", ".pyi"]
+    # File extensions handled by this parser
+    extensions: tuple[str, ...] = ()
 
+    @property
+    def cache_key(self) -> str:
+        """Identify this parser and its version in result cache keys"""
+        return f"{type(self).__name__}/{self.version}"
 
-class JavaScriptParser(BaseParser):
-    """Parser for JavaScript files using Lizard"""
-
+    @abstractmethod
     def parse_file(self, file_path: str) -> list[ComplexityResult]:
-        """
-        Parse JavaScript file and extract function complexity.
-
-        Uses Lizard for complexity analysis and checks for JSDoc comments.
-        """
-        try:
-            # Analyze with Lizard
-            analysis = lizard.analyze_file(file_path)
-
-            # Read file to check for JSDoc comments
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
-
-            results = []
-            for func in analysis.function_list:
-                # Check if function has JSDoc comment
-                has_jsdoc = self._has_jsdoc(content, func.start_line)
-
-                result = ComplexityResult(
-                    name=func.name,
-                    line_number=func.start_line,
-                    complexity=func.cyclomatic_complexity,
-                    has_docstring=has_jsdoc,
-                    node=None,
-                )
-                results.append(result)
-
-            return results
-
-        except Exception as e:
-            # Log parsing failure instead of silent return
-            import sys
-
-            print(f"Warning: Failed to parse JavaScript file {file_path}: {e}", file=sys.stderr)
-            return []
+        """Parse a file and return complexity results"""
+        pass
 
-    def _has_jsdoc(self, content: str, line_number: int) -> bool:
+    def parse_source(self, source: bytes, file_path: str) -> list[ComplexityResult]:
         """
-        Check if a function has a JSDoc comment before it.
+        Parse in-memory file content and return complexity results.
 
-        JSDoc format: /** ... */
+        file_path is only used to pick the language and label results. The
+        default implementation goes through a temporary file with the same
+        extension; parsers that can analyze source directly override it.
         """
-        lines = content.split("\n")
-
-        # Look backwards from the function line for JSDoc
-        for i in range(line_number - 2, max(0, line_number - 10), -1):
-            if i >= len(lines):
-                continue
-
-            line = lines[i].strip()
-
-            # Found JSDoc end marker
-            if line.endswith("*/"):
-                # Now check if there's a JSDoc start marker above
-                for j in range(i, max(0, i - 20), -1):
-                    if j >= len(lines):
-                        continue
-                    if "/**" in lines[j]:
-                        return True
-                return False
-
-            # Skip empty lines
-            if not line:
-                continue
-
-            # If we hit code that's not a comment, no JSDoc
-            if line and not line.startswith("//") and not line.startswith("*"):
-                break
-
-        return False
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir) / Path(file_path).name
+            tmp_path.write_bytes(source)
+            return self.parse_file(str(tmp_path))
 
     def supports_extension(self, extension: str) -> bool:
-        return extension in [".js", ".jsx", ".mjs"]
+        """Check if this parser supports the given file extension"""
+        return extension in self.extensions
 
 
-class TypeScriptParser(BaseParser):
-    """Parser for TypeScript files using Lizard"""
+class ParserFactory:
+    """
+    Factory for creating appropriate parser based on file extension.
+
+    Parsers are registered by extension and looked up in a dict. A parser's
+    module is imported, and the parser created, when the first file needing
+    it is parsed; only Java files, and JavaScript the built-in engine can't
+    follow, import Lizard. Parsers from other packages are found through
+    the ENTRY_POINT_GROUP entry points, which are only loaded for languages
+    or extensions without a built-in parser.
+    """
+
+    # Extension -> parser class, or "module:class" not imported yet
+    _registry: dict[str, type[BaseParser] | str] = dict(BUILTIN_PARSERS)
+    # Extension -> parser, or None if no parser handles it
+    _parsers: dict[str, BaseParser | None] = {}
+    # Language -> extensions, for parsers loaded from entry points
+    _plugins: dict[str, tuple[str, ...]] | None = None
 
-    def parse_file(self, file_path: str) -> list[ComplexityResult]:
-        """
-        Parse TypeScript file and extract function complexity.
+    @classmethod
+    def get_parser(cls, file_path: str) -> BaseParser | None:
+        """Get appropriate parser for the given file"""
+        extension = os.path.splitext(file_path)[1]
 
-        Uses Lizard for complexity analysis and checks for JSDoc comments.
-        TypeScript also supports TSDoc format.
-        """
         try:
-            # Lizard supports TypeScript out of the box
-            analysis = lizard.analyze_file(file_path)
-
-            # Read file to check for JSDoc/TSDoc comments
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
-
-            results = []
-            for func in analysis.function_list:
-                # Check if function has JSDoc/TSDoc comment
-                has_doc = self._has_documentation(content, func.start_line)
-
-                result = ComplexityResult(
-                    name=func.name,
-                    line_number=func.start_line,
-                    complexity=func.cyclomatic_complexity,
-                    has_docstring=has_doc,
-                    node=None,
-                )
-                results.append(result)
-
-            return results
+            return cls._parsers[extension]
+        except KeyError:
+            pass
 
-        except Exception as e:
-            # Log parsing failure instead of silent return
-            import sys
+        if extension not in cls._registry:
+            cls._load_plugins()
 
-            print(f"Warning: Failed to parse TypeScript file {file_path}: {e}", file=sys.stderr)
-            return []
+        parser = cls._create(cls._registry[extension]) if extension in cls._registry else None
+        cls._parsers[extension] = parser
+        return parser
 
-    def _has_documentation(self, content: str, line_number: int) -> bool:
+    @classmethod
+    def register(cls, parser: type[BaseParser] | str, extensions: tuple[str, ...] = ()) -> None:
         """
-        Check if a function has JSDoc or TSDoc comment before it.
+        Use a parser for files with the given extensions.
 
-        Formats: /** ... */ or /// (triple-slash comments)
+        parser is a BaseParser subclass or a "module:class" reference to one,
+        imported when first needed. A class defaults to its own extensions.
         """
-        lines = content.split("\n")
-
-        # Look backwards from the function line
-        for i in range(line_number - 2, max(0, line_number - 10), -1):
-            if i >= len(lines):
-                continue
-
-            line = lines[i].strip()
-
-            # Found JSDoc end marker
-            if line.endswith("*/"):
-                # Check for JSDoc start marker above
-                for j in range(i, max(0, i - 20), -1):
-                    if j >= len(lines):
-                        continue
-                    if "/**" in lines[j]:
-                        return True
-                return False
-
-            # Found triple-slash comment (TSDoc)
-            if line.startswith("///"):
-                return True
-
-            # Skip empty lines
-            if not line:
-                continue
-
-            # If we hit code that's not a comment, no documentation
-            if line and not line.startswith("//") and not line.startswith("*"):
-                break
-
-        return False
-
-    def supports_extension(self, extension: str) -> bool:
-        return extension in [".ts", ".tsx"]
-
-
-class ParserFactory:
-    """Factory for creating appropriate parser based on file extension"""
-
-    _parsers = [
-        PythonParser(),
-        JavaScriptParser(),
-        TypeScriptParser(),
-    ]
+        if not extensions and not isinstance(parser, str):
+            extensions = parser.extensions
+        for extension in extensions:
+            cls._registry[extension] = parser
+            cls._parsers.pop(extension, None)
 
     @classmethod
-    def get_parser(cls, file_path: str) -> BaseParser | None:
-        """Get appropriate parser for the given file"""
+    def plugin_extensions(cls, language: str) -> tuple[str, ...]:
+        """Get the extensions handled by an entry-point parser for a language"""
+        return cls._load_plugins().get(language, ())
 
-        extension = Path(file_path).suffix
-
-        for parser in cls._parsers:
-            if parser.supports_extension(extension):
-                return parser
+    @classmethod
+    def _load_plugins(cls) -> dict[str, tuple[str, ...]]:
+        """Register the parsers from entry points, once"""
+        if cls._plugins is None:
+            cls._plugins = {}
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                parser = entry_point.load()
+                cls._plugins[entry_point.name] = tuple(parser.extensions)
+                # Built-in parsers take precedence
+                cls.register(
+                    parser, tuple(e for e in parser.extensions if e not in BUILTIN_PARSERS)
+                )
+        return cls._plugins
 
-        return None
+    @classmethod
+    def _create(cls, parser: type[BaseParser] | str) -> BaseParser:
+        """Import a parser if needed and create it, once per class"""
+        if isinstance(parser, str):
+            module, _, name = parser.partition(":")
+            parser = getattr(importlib.import_module(module), name)
+        for existing in cls._parsers.values():
+            if type(existing) is parser:
+                return existing
+        return parser()
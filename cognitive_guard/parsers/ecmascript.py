@@ -0,0 +1,76 @@
+"""Shared base for the JavaScript and TypeScript parsers"""
+
+import os
+import sys
+
+from cognitive_guard.core.complexity import ComplexityResult
+from cognitive_guard.core.js_complexity import JSComplexityAnalyzer, JSParseError
+from cognitive_guard.parsers import BaseParser
+from cognitive_guard.utils.profiler import profiler
+
+
+class ECMAScriptParser(BaseParser):
+    """
+    Base class for parsers that score JavaScript-like code natively.
+
+    JSComplexityAnalyzer gives cognitive complexity comparable with Python
+    scores, and finds doc comments in the same pass. Files it can't follow
+    (e.g. invalid syntax) go to Lizard instead, which is only imported then.
+    Its results measure cyclomatic complexity, so they are marked with that
+    metric, and a warning names the file.
+    """
+
+    # 4: cognitive complexity from JSComplexityAnalyzer, not Lizard's cyclomatic complexity
+    # 5: JSX is tokenized instead of falling back to Lizard
+    version = "5"
+
+    # Language name for warnings
+    language = "source"
+    # Whether to accept TypeScript syntax, and /// comments as documentation
+    typescript = False
+    # Extensions of files that may contain JSX
+    jsx_extensions: tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self._lizard: BaseParser | None = None
+
+    def parse_file(self, file_path: str) -> list[ComplexityResult]:
+        try:
+            with profiler.phase("read"), open(file_path, "rb") as f:
+                source = f.read()
+        except OSError as e:
+            print(f"Warning: Failed to read {self.language} file {file_path}: {e}", file=sys.stderr)
+            return []
+
+        return self.parse_source(source, file_path)
+
+    def parse_source(self, source: bytes, file_path: str) -> list[ComplexityResult]:
+        # Like Lizard's own reader: honour a BOM, don't give up on bad bytes
+        content = source.decode("utf-8-sig", errors="replace")
+
+        jsx = os.path.splitext(file_path)[1] in self.jsx_extensions
+        analyzer = JSComplexityAnalyzer(typescript=self.typescript, jsx=jsx)
+
+        try:
+            with profiler.phase("analyze"):
+                return analyzer.analyze_source(content)
+        except Exception as e:
+            # JSParseError for code the engine can't follow, anything else
+            # from a bug in it: neither should stop the scan
+            reason = e if isinstance(e, JSParseError) else f"{type(e).__name__}: {e}"
+            print(
+                f"Warning: Falling back to cyclomatic complexity for {self.language} file "
+                f"{file_path}: {reason}",
+                file=sys.stderr,
+            )
+            return self.fallback().parse_source(source, file_path)
+
+    def fallback(self) -> BaseParser:
+        """Get the Lizard-based parser for files the native engine can't follow"""
+        if self._lizard is None:
+            from cognitive_guard.parsers.lizard_base import LizardParser
+
+            self._lizard = LizardParser()
+            self._lizard.language = self.language
+            self._lizard.triple_slash_docs = self.typescript
+        return self._lizard
@@ -0,0 +1,11 @@
+"""Java parser built on Lizard"""
+
+from cognitive_guard.parsers.lizard_base import LizardParser
+
+
+class JavaParser(LizardParser):
+    """Parser for Java files using Lizard, with Javadoc (/** ... */) detection"""
+
+    language = "Java"
+    extensions = (".java",)
+    annotation_docs = True
@@ -0,0 +1,12 @@
+"""JavaScript parser built on the native cognitive complexity engine"""
+
+from cognitive_guard.parsers.ecmascript import ECMAScriptParser
+
+
+class JavaScriptParser(ECMAScriptParser):
+    """Parser for JavaScript files, with JSDoc (/** ... */) detection"""
+
+    language = "JavaScript"
+    extensions = (".js", ".jsx", ".mjs")
+    # React code often has JSX in plain .js files too
+    jsx_extensions = extensions
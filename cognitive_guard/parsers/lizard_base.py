@@ -0,0 +1,143 @@
+"""Shared base for parsers that measure functions with Lizard"""
+
+import bisect
+import re
+import sys
+
+import lizard
+
+from cognitive_guard.core.complexity import ComplexityResult
+from cognitive_guard.parsers import BaseParser
+from cognitive_guard.utils.profiler import profiler
+
+# Comments, string literals and runs of other code, in one scan of a JS/TS/Java file.
+# Unterminated comments and strings run to the end of the file or line.
+_JS_TOKEN = re.compile(
+    r"""
+      (?P<block>/\*.*?(?:\*/|\Z))
+    | (?P<line>//[^\n]*)
+    | (?P<string>"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?|`(?:\\.|[^`\\])*`?)
+    | (?P<code>[^\s/"'`]+|/)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+
+class DocCommentIndex:
+    """
+    Doc comments of a JS/TS/Java file, indexed for lookup by function line.
+
+    The file is tokenized once into the sorted end lines of its doc comments
+    (`/** ... */` blocks, and `///` lines where enabled) and of its code. A
+    function is documented when a doc comment ends after the last line of
+    code above it, so blank lines and plain comments may sit in between.
+    With annotations enabled, `@Name` and `@Name(...)` don't count as code
+    either, since Java annotations go between a Javadoc and its method.
+    """
+
+    def __init__(self, content: str, triple_slash: bool = False, annotations: bool = False):
+        """
+        Index the doc comments and code lines of decoded file content.
+
+        triple_slash makes `///` line comments doc comments; annotations
+        makes `@Name` and `@Name(...)` not count as code.
+        """
+        self.doc_ends: list[int] = []
+        self.code_lines: list[int] = []
+
+        line = 1
+        pos = 0
+        # Open parentheses of the annotation being skipped, if any
+        annotation_depth = 0
+        for match in _JS_TOKEN.finditer(content):
+            start, end = match.span()
+            line += content.count("\n", pos, start)
+            end_line = line + content.count("\n", start, end)
+            kind = match.lastgroup
+            text = match.group()
+
+            if kind == "block":
+                if text.startswith("/**") and not text.startswith("/**/"):
+                    self.doc_ends.append(end_line)
+            elif kind == "line":
+                if triple_slash and text.startswith("///"):
+                    self.doc_ends.append(end_line)
+            elif annotations and (annotation_depth > 0 or text.startswith("@")):
+                # Arguments of an annotation, possibly spanning several tokens and lines
+                if kind == "code":
+                    annotation_depth = max(0, annotation_depth + text.count("(") - text.count(")"))
+            elif not self.code_lines or self.code_lines[-1] != end_line:
+                self.code_lines.append(end_line)
+
+            line = end_line
+            pos = end
+
+    def documents(self, line_number: int) -> bool:
+        """Check if a doc comment directly precedes the given line"""
+        doc = bisect.bisect_left(self.doc_ends, line_number)
+        if doc == 0:
+            return False
+        code = bisect.bisect_left(self.code_lines, line_number)
+        return code == 0 or self.code_lines[code - 1] < self.doc_ends[doc - 1]
+
+
+class LizardParser(BaseParser):
+    """
+    Base class for parsers that measure functions with Lizard.
+
+    Each file is read once; the same decoded source goes to Lizard's
+    in-memory analysis and to the doc-comment index, so content from the
+    cache or from git is analyzed without touching disk.
+    """
+
+    # 2: doc comments are found by tokenizing, without a line limit
+    # 3: files that aren't valid UTF-8 are analyzed instead of skipped
+    version = f"3+lizard{lizard.version}"
+
+    # Language name for warnings
+    language = "source"
+    # Whether /// line comments count as documentation
+    triple_slash_docs = False
+    # Whether annotations may sit between a doc comment and its function
+    annotation_docs = False
+
+    def parse_file(self, file_path: str) -> list[ComplexityResult]:
+        try:
+            with profiler.phase("read"), open(file_path, "rb") as f:
+                source = f.read()
+        except OSError as e:
+            print(f"Warning: Failed to read {self.language} file {file_path}: {e}", file=sys.stderr)
+            return []
+
+        return self.parse_source(source, file_path)
+
+    def parse_source(self, source: bytes, file_path: str) -> list[ComplexityResult]:
+        try:
+            # Like Lizard's own reader: honour a BOM, don't give up on bad bytes
+            content = source.decode("utf-8-sig", errors="replace")
+
+            with profiler.phase("parse"):
+                analysis = lizard.analyze_file.analyze_source_code(file_path, content)
+
+            with profiler.phase("analyze"):
+                docs = DocCommentIndex(
+                    content, triple_slash=self.triple_slash_docs, annotations=self.annotation_docs
+                )
+                return [
+                    ComplexityResult(
+                        name=func.name,
+                        line_number=func.start_line,
+                        complexity=func.cyclomatic_complexity,
+                        has_docstring=docs.documents(func.start_line),
+                        end_line_number=func.end_line,
+                        metric="cyclomatic",
+                    )
+                    for func in analysis.function_list
+                ]
+
+        except Exception as e:
+            # Log parsing failure instead of silent return
+            print(
+                f"Warning: Failed to parse {self.language} file {file_path}: {e}", file=sys.stderr
+            )
+            return []
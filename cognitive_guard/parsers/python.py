@@ -0,0 +1,20 @@
+"""Python parser built on the AST-based ComplexityAnalyzer"""
+
+from cognitive_guard.core.complexity import ComplexityAnalyzer, ComplexityResult
+from cognitive_guard.parsers import BaseParser
+
+
+class PythonParser(BaseParser):
+    """Parser for Python files using AST-based analysis"""
+
+    # 2: nested functions no longer count toward the enclosing function
+    version = "2"
+    extensions = (".py", ".pyi")
+
+    def parse_file(self, file_path: str) -> list[ComplexityResult]:
+        analyzer = ComplexityAnalyzer()
+        return analyzer.analyze_file(file_path)
+
+    def parse_source(self, source: bytes, file_path: str) -> list[ComplexityResult]:
+        analyzer = ComplexityAnalyzer()
+        return analyzer.analyze_source(source, file_path)
@@ -0,0 +1,13 @@
+"""TypeScript parser built on the native cognitive complexity engine"""
+
+from cognitive_guard.parsers.ecmascript import ECMAScriptParser
+
+
+class TypeScriptParser(ECMAScriptParser):
+    """Parser for TypeScript files, with JSDoc/TSDoc (/** ... */ or ///) detection"""
+
+    language = "TypeScript"
+    extensions = (".ts", ".tsx")
+    typescript = True
+    # In .ts files, <T>x is a type assertion rather than JSX
+    jsx_extensions = (".tsx",)
@@ -182,6 +182,8 @@ Press 'q' to quit.
             # Show function definition and a few lines
             start = max(0, violation.line_number - 1)
             end = min(len(lines), start + 10)
+            if violation.end_line_number:
+                end = min(end, violation.end_line_number)
 
             preview = "".join(lines[start:end])
             return f"📝 Code Preview:\n\n{preview}"
@@ -252,6 +254,39 @@ Note:
             self.status_message = "✅ All violations reviewed! Press 'q' to quit."
             self._refresh_ui()
 
+    @staticmethod
+    def _find_body_start(lines: list[str], func_line_idx: int) -> int:
+        """Guess the line after a function signature, for parsers without body lines"""
+        # Find the line after the function signature (could span multiple lines)
+        # Only stop when we find the actual colon ending the signature
+        insert_idx = func_line_idx + 1
+        # Find the line with : that ends the function signature
+        while insert_idx < len(lines):
+            line = lines[insert_idx].strip()
+
+            # Found the end of signature (line ends with :)
+            if line.endswith(":"):
+                insert_idx += 1
+                break
+
+            # Keep going if we're still in parameters or closing
+            # (ends with comma, backslash, or is a closing paren, or decorator)
+            if (
+                line.endswith((",", "\\"))
+                or line.startswith((")", "@"))
+                or line == ""  # blank line
+                or
+                # Last param before closing paren (no comma)
+                (insert_idx + 1 < len(lines) and lines[insert_idx + 1].strip().startswith(")"))
+            ):
+                insert_idx += 1
+                continue
+
+            # Otherwise we've gone past the signature, insert here
+            break
+
+        return insert_idx
+
     def action_save(self) -> bool:
         """Save current documentation to file"""
         if not self.violations or self.current_violation_index >= len(self.violations):
@@ -287,41 +322,21 @@ Note:
             indent = len(func_line) - len(func_line.lstrip())
             doc_indent = " " * (indent + 4)  # Docstring is indented 4 more spaces
 
+            if violation.body_line_number > violation.line_number:
+                # The parser knows where the body starts, so insert right
+                # before it, matching its indentation
+                insert_idx = violation.body_line_number - 1
+                body_line = lines[insert_idx]
+                doc_indent = body_line[: len(body_line) - len(body_line.lstrip())]
+            else:
+                insert_idx = self._find_body_start(lines, func_line_idx)
+
             # Format the docstring with proper indentation
             docstring_lines = docstring.split("\n")
             formatted_docstring = "\n".join(
                 doc_indent + line if line.strip() else line for line in docstring_lines
             )
 
-            # Insert docstring after function definition
-            # Find the line after the function signature (could span multiple lines)
-            # Only stop when we find the actual colon ending the signature
-            insert_idx = func_line_idx + 1
-            # Find the line with : that ends the function signature
-            while insert_idx < len(lines):
-                line = lines[insert_idx].strip()
-
-                # Found the end of signature (line ends with :)
-                if line.endswith(":"):
-                    insert_idx += 1
-                    break
-
-                # Keep going if we're still in parameters or closing
-                # (ends with comma, backslash, or is a closing paren, or decorator)
-                if (
-                    line.endswith((",", "\\"))
-                    or line.startswith((")", "@"))
-                    or line == ""  # blank line
-                    or
-                    # Last param before closing paren (no comma)
-                    (insert_idx + 1 < len(lines) and lines[insert_idx + 1].strip().startswith(")"))
-                ):
-                    insert_idx += 1
-                    continue
-
-                # Otherwise we've gone past the signature, insert here
-                break
-
             # Insert the docstring
             lines.insert(insert_idx, formatted_docstring + "\n")
 
@@ -10,6 +10,7 @@ from rich.panel import Panel
 from rich.table import Table
 
 from cognitive_guard.core.config import Config
+from cognitive_guard.core.history import ScanHistory, sparkline
 
 
 @dataclass
@@ -139,12 +140,13 @@ class StatsTracker:
             if achievement.id == achievement_id and not achievement.is_unlocked():
                 achievement.unlocked_at = datetime.now().isoformat()
 
-    def display(self, console: Console) -> None:
+    def display(self, console: Console, jobs: int | None = None) -> None:
         """Display statistics and achievements with visual progress"""
+        from cognitive_guard.core.cache import ResultCache
         from cognitive_guard.core.scanner import CodeScanner
 
         # Get current coverage
-        scanner = CodeScanner(self.config)
+        scanner = CodeScanner(self.config, jobs=jobs, cache=ResultCache())
         try:
             results = scanner.scan_all()
             current_coverage = results.get_coverage()
@@ -171,6 +173,16 @@ class StatsTracker:
         console.print(f"   Current:  {bar} {coverage_percent}% documented ← You are here")
         console.print(f"   Goal:     {'█' * bar_length} {target_percent}% documented\n")
 
+        # Trend over the commits analyzed by `cognitive-guard history`
+        history = ScanHistory.load()
+        if len(history.points) > 1:
+            first, last = history.points[0], history.points[-1]
+            trend = sparkline([point.coverage for point in history.points])
+            console.print(
+                f"   Trend:    {trend} {first.coverage:.0%} → {last.coverage:.0%} "
+                f"over {len(history.points)} commits\n"
+            )
+
         # Calculate functions to go
         if current_coverage < target_coverage and hasattr(results, "total_functions"):
             total_funcs = getattr(results, "total_functions", 0)
@@ -0,0 +1,196 @@
+"""Per-phase timing for --profile"""
+
+import heapq
+import os
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from rich.console import Console
+from rich.table import Table
+
+T = TypeVar("T")
+
+# Phases in pipeline order; "wait" is the time the main process spends
+# waiting on worker processes, whose own phases are merged in as they report
+PHASES = ("discover", "read", "parse", "analyze", "evaluate", "render", "wait")
+
+# Shared by every hook while profiling is off, so disabled hooks allocate nothing
+_DISABLED = nullcontext()
+
+
+@dataclass
+class PhaseTiming:
+    """Accumulated time spent in one phase"""
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+@dataclass(order=True)
+class FileTiming:
+    """Time spent measuring a single file"""
+
+    seconds: float
+    path: str = field(compare=False)
+    size: int = field(compare=False)
+    parser: str = field(compare=False)
+
+
+class Profiler:
+    """
+    Collects wall and CPU time per phase, and the slowest files.
+
+    Phases are timed exclusively: when a phase starts inside another (e.g.
+    parsing while rendering pulls results from the scan), its time is taken
+    out of the enclosing phase. While disabled every hook is a no-op.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._reset()
+
+    def _reset(self, slowest: int = 10) -> None:
+        self.slowest = slowest
+        self.phases: dict[str, PhaseTiming] = {}
+        self.files: list[FileTiming] = []
+        self.workers = 0
+        # Per open phase: [wall at start, cpu at start, child wall, child cpu]
+        self._stack: list[list[float]] = []
+        self._started = (0.0, 0.0)
+
+    def enable(self, slowest: int = 10) -> None:
+        """Start profiling from a clean slate"""
+        self._reset(slowest)
+        self.enabled = True
+        self._started = (time.perf_counter(), time.process_time())
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        """Time a block of work as part of a phase"""
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        frame = [time.perf_counter(), time.process_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            wall = time.perf_counter() - frame[0]
+            cpu = time.process_time() - frame[1]
+            self._add(name, wall - frame[2], cpu - frame[3])
+            if self._stack:
+                self._stack[-1][2] += wall
+                self._stack[-1][3] += cpu
+
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Iterate, counting the time spent producing each item as a phase"""
+        if not self.enabled:
+            yield from iterable
+            return
+
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def file(self, path: str, parser: str, size: int | None = None) -> AbstractContextManager[None]:
+        """Time the measurement of a file, stat-ing it for its size if not given"""
+        if not self.enabled:
+            return _DISABLED
+        return self._timed_file(path, parser, size)
+
+    @contextmanager
+    def _timed_file(self, path: str, parser: str, size: int | None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if size is None:
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+            self.record_file(path, size, parser, seconds)
+
+    def record_file(self, path: str, size: int, parser: str, seconds: float) -> None:
+        """Remember a file if it's among the slowest seen so far"""
+        timing = FileTiming(seconds, path, size, parser)
+        if len(self.files) < self.slowest:
+            heapq.heappush(self.files, timing)
+        elif timing > self.files[0]:
+            heapq.heapreplace(self.files, timing)
+
+    def _add(self, name: str, wall: float, cpu: float) -> None:
+        timing = self.phases.setdefault(name, PhaseTiming())
+        timing.wall += wall
+        timing.cpu += cpu
+        timing.calls += 1
+
+    def drain(self) -> dict[str, Any]:
+        """Hand over what was collected so far (e.g. from a worker) and reset"""
+        report = {
+            "phases": {name: (t.wall, t.cpu, t.calls) for name, t in self.phases.items()},
+            "files": [(f.seconds, f.path, f.size, f.parser) for f in self.files],
+        }
+        self.phases = {}
+        self.files = []
+        return report
+
+    def merge(self, report: dict[str, Any]) -> None:
+        """Add timings drained from another process"""
+        for name, (wall, cpu, calls) in report["phases"].items():
+            timing = self.phases.setdefault(name, PhaseTiming())
+            timing.wall += wall
+            timing.cpu += cpu
+            timing.calls += calls
+        for seconds, path, size, parser in report["files"]:
+            self.record_file(path, size, parser, seconds)
+
+    def display(self, console: Console) -> None:
+        """Print the phase breakdown and the slowest files"""
+        wall = time.perf_counter() - self._started[0]
+        cpu = time.process_time() - self._started[1]
+
+        caption = f"Total: {wall:.3f}s wall, {cpu:.3f}s CPU in the main process"
+        if self.workers:
+            caption += f"; read/parse/analyze summed over {self.workers} worker processes"
+        table = Table(title="⏱️  Profile", caption=caption, show_header=True)
+        table.add_column("Phase")
+        table.add_column("Wall (s)", justify="right")
+        table.add_column("CPU (s)", justify="right")
+        table.add_column("Calls", justify="right")
+
+        names = [name for name in PHASES if name in self.phases]
+        names += sorted(name for name in self.phases if name not in PHASES)
+        for name in names:
+            timing = self.phases[name]
+            table.add_row(name, f"{timing.wall:.3f}", f"{timing.cpu:.3f}", str(timing.calls))
+        console.print(table)
+
+        if self.files:
+            files = Table(title=f"🐢 Slowest {len(self.files)} Files", show_header=True)
+            files.add_column("File", style="cyan")
+            files.add_column("Size", justify="right")
+            files.add_column("Parser")
+            files.add_column("Seconds", justify="right")
+            for timing in sorted(self.files, reverse=True):
+                files.add_row(
+                    timing.path, f"{timing.size:,}", timing.parser, f"{timing.seconds:.4f}"
+                )
+            console.print(files)
+
+
+# Process-wide profiler; the CLI enables it for --profile
+profiler = Profiler()
@@ -39,3 +39,50 @@ class TestCLI:
             result = runner.invoke(main, ["check"])
             assert result.exit_code == 1
             assert "No .cognitive-guard.yml found" in result.output
+
+    def test_scan_thresholds(self, sample_python_file):
+        """Test comparing thresholds in a single scan"""
+        runner = CliRunner()
+
+        os.chdir(sample_python_file.parent)
+        runner.invoke(main, ["init"])
+        result = runner.invoke(main, ["scan", "--thresholds", "5,20", "--no-cache"])
+
+        assert result.exit_code == 0
+        assert "Threshold Comparison" in result.output
+
+    def test_scan_thresholds_rejects_garbage(self):
+        """Test invalid threshold lists are rejected"""
+        runner = CliRunner()
+        result = runner.invoke(main, ["scan", "--thresholds", "five"])
+
+        assert result.exit_code == 2
+
+    def test_check_defaults_to_plain_when_piped(self, sample_python_file):
+        """Test output falls back to plain lines when stdout is not a terminal"""
+        runner = CliRunner()
+
+        os.chdir(sample_python_file.parent)
+        runner.invoke(main, ["init"])
+        result = runner.invoke(main, ["check", "--no-cache"])
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            "1 files, 2 functions, 50.0% documented, 0 violations"
+        ]
+
+    def test_check_ndjson(self, sample_python_file):
+        """Test NDJSON output has a record per file and a final summary"""
+        import json
+
+        runner = CliRunner()
+
+        os.chdir(sample_python_file.parent)
+        runner.invoke(main, ["init"])
+        result = runner.invoke(main, ["check", "--format", "ndjson", "--no-cache"])
+
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert result.exit_code == 0
+        assert [record["type"] for record in records] == ["file", "summary"]
+        assert records[0]["path"].endswith("sample.py")
+        assert records[0]["functions"] == records[1]["total_functions"] == 2
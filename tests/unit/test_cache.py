@@ -0,0 +1,63 @@
+"""Tests for the persistent result cache"""
+
+from cognitive_guard.core.cache import ResultCache, content_digest
+from cognitive_guard.core.complexity import ComplexityResult
+from cognitive_guard.core.config import Config
+from cognitive_guard.core.scanner import CodeScanner
+
+
+class TestResultCache:
+    """Test cases for ResultCache"""
+
+    def test_content_digest_matches_git_blob_id(self):
+        """Test digests are git blob ids"""
+        # `printf 'hello\n' | git hash-object --stdin`
+        assert content_digest(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+    def test_round_trip(self, temp_dir):
+        """Test results survive a save and reload"""
+        cache_path = temp_dir / "cache.json"
+        results = [
+            ComplexityResult("func", 3, 12, False),
+            ComplexityResult("other", 9, 1, True, metric="cyclomatic"),
+        ]
+
+        cache = ResultCache(cache_path)
+        assert cache.get("abc", "PythonParser/1") is None
+        cache.put("abc", "PythonParser/1", results)
+        cache.save()
+
+        reloaded = ResultCache(cache_path)
+        cached = reloaded.get("abc", "PythonParser/1")
+
+        assert cached == results
+        assert reloaded.get("abc", "PythonParser/2") is None
+        assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+    def test_file_digest_tracks_content(self, temp_dir):
+        """Test file digests change with content"""
+        file_path = temp_dir / "module.py"
+        file_path.write_bytes(b"x = 1\n")
+        cache = ResultCache(temp_dir / "cache.json")
+
+        first = cache.file_digest(file_path)
+        file_path.write_bytes(b"x = 2\n")
+
+        assert first == content_digest(b"x = 1\n")
+        assert cache.file_digest(file_path) == content_digest(b"x = 2\n")
+        assert cache.file_digest(temp_dir / "missing.py") is None
+
+    def test_scanner_reuses_cached_results(self, temp_dir, sample_python_file):
+        """Test a second scan is served from the cache"""
+        cache_path = temp_dir / "cache.json"
+        config = Config(complexity_threshold=5)
+
+        first_cache = ResultCache(cache_path)
+        first = CodeScanner(config, cache=first_cache).scan_files([sample_python_file])
+        second_cache = ResultCache(cache_path)
+        second = CodeScanner(config, cache=second_cache).scan_files([sample_python_file])
+
+        assert (first_cache.hits, first_cache.misses) == (0, 1)
+        assert (second_cache.hits, second_cache.misses) == (1, 0)
+        assert [f.name for f in second[0].functions] == [f.name for f in first[0].functions]
+        assert [v.name for v in second[0].violations] == [v.name for v in first[0].violations]
@@ -95,3 +95,98 @@ def no_docs():
         assert moderate.severity == "moderate"
         assert complex.severity == "complex"
         assert very_complex.severity == "very_complex"
+
+    def test_nested_functions_scored_separately(self):
+        """Test nested functions don't add to the enclosing function's score"""
+        code = """
+def outer(x):
+    if x:
+        pass
+
+    def inner(y):
+        if y:
+            if y > 1:
+                return inner(y - 1)
+        return 0
+
+    class Helper:
+        def method(self):
+            for _ in range(3):
+                pass
+
+    return sorted(x, key=lambda v: v if v else 0)
+"""
+        results = ComplexityAnalyzer().analyze_source(code)
+
+        scores = {result.name: result.complexity for result in results}
+        # outer: if (1) + lambda ternary (1)
+        # inner: if (1) + nested if (2) + recursion (2)
+        assert scores == {"outer": 2, "inner": 5, "method": 1}
+
+    def test_results_in_source_order(self):
+        """Test functions are reported in the order they appear"""
+        code = """
+def first():
+    def second():
+        pass
+
+class Third:
+    def third(self):
+        pass
+
+def fourth():
+    pass
+"""
+        results = ComplexityAnalyzer().analyze_source(code)
+
+        assert [result.name for result in results] == ["first", "second", "third", "fourth"]
+
+    def test_deep_expression_does_not_recurse(self):
+        """Test trees deeper than the recursion limit are still analyzed"""
+        code = "def generated(x):\n    return " + " + ".join(["x"] * 2000) + " if x else 0\n"
+
+        results = ComplexityAnalyzer().analyze_source(code)
+
+        assert [(result.name, result.complexity) for result in results] == [("generated", 1)]
+
+    def test_analyze_file_encodings(self, temp_dir):
+        """Test files are parsed from bytes, with a lossy fallback"""
+        cookie = temp_dir / "cookie.py"
+        cookie.write_bytes(
+            b'# -*- coding: latin-1 -*-\ndef f(x):\n    "caf\xe9"\n    if x:\n        pass\n'
+        )
+        broken = temp_dir / "broken.py"
+        broken.write_bytes(b"def g(x):\n    # \xff\xfe\n    if x:\n        pass\n")
+
+        analyzer = ComplexityAnalyzer()
+        cookie_results = analyzer.analyze_file(str(cookie))
+        broken_results = analyzer.analyze_file(str(broken))
+
+        assert [(r.name, r.complexity, r.has_docstring) for r in cookie_results] == [("f", 1, True)]
+        assert [(r.name, r.complexity) for r in broken_results] == [("g", 1)]
+
+    def test_analyze_source_rejects_invalid_bytes(self):
+        """Test syntax errors and null bytes yield no results"""
+        analyzer = ComplexityAnalyzer()
+
+        assert analyzer.analyze_source(b"def f(:\n") == []
+        assert analyzer.analyze_source(b"def f():\n    pass\n\x00") == []
+
+    def test_result_line_spans(self):
+        """Test results record where a function ends and its body starts"""
+        code = """
+def outer(
+    x,
+):
+    # comment
+    @staticmethod
+    def inner():
+        return 1
+
+    return x
+"""
+        outer, inner = ComplexityAnalyzer().analyze_source(code)
+
+        assert (outer.line_number, outer.body_line_number, outer.end_line_number) == (2, 6, 10)
+        assert (inner.line_number, inner.body_line_number, inner.end_line_number) == (7, 8, 8)
+        assert not hasattr(outer, "__dict__")  # slotted, no AST kept alive
@@ -0,0 +1,116 @@
+"""Tests for complexity history over git commits"""
+
+import os
+
+from git import Repo
+
+from cognitive_guard.core.cache import ResultCache
+from cognitive_guard.core.config import Config
+from cognitive_guard.core.history import HistoryPoint, ScanHistory, sparkline
+from cognitive_guard.core.scanner import CodeScanner
+
+COMPLEX = """
+def tangled(a, b, c):
+    if a:
+        if b:
+            if c:
+                return 1
+    return 0
+"""
+
+DOCUMENTED = '''
+def tangled(a, b, c):
+    """Untangle a, b and c"""
+    if a:
+        if b:
+            if c:
+                return 1
+    return 0
+'''
+
+SIMPLE = """
+def plain():
+    return 1
+"""
+
+
+def commit_files(repo, message, **files):
+    """Write files into the repository and commit them"""
+    root = repo.working_tree_dir
+    for name, content in files.items():
+        with open(os.path.join(root, f"{name}.py"), "w") as f:
+            f.write(content)
+    repo.index.add([f"{name}.py" for name in files])
+    repo.index.commit(message)
+
+
+class TestScanHistory:
+    """Test cases for CodeScanner.scan_history"""
+
+    def make_history(self, path):
+        repo = Repo.init(path)
+        with repo.config_writer() as writer:
+            writer.set_value("user", "name", "Test")
+            writer.set_value("user", "email", "test@example.com")
+
+        commit_files(repo, "first", a=COMPLEX, b=SIMPLE)
+        commit_files(repo, "second", c=COMPLEX)
+        commit_files(repo, "third", a=DOCUMENTED)
+        repo.index.remove(["c.py"], working_tree=True)
+        repo.index.commit("fourth")
+        return repo
+
+    def test_totals_match_revision_scans(self, temp_dir):
+        """Test each commit's totals equal a scan of that revision"""
+        os.chdir(temp_dir)
+        self.make_history(temp_dir)
+        scanner = CodeScanner(Config(complexity_threshold=3), jobs=1)
+
+        history = scanner.scan_history()
+
+        assert [point.summary for point in history.points] == [
+            "first",
+            "second",
+            "third",
+            "fourth",
+        ]
+        assert [point.violations for point in history.points] == [1, 2, 1, 0]
+        for back, point in enumerate(reversed(history.points)):
+            results = scanner.scan_revision(f"HEAD~{back}")
+            assert point.files == len(results.files)
+            assert point.functions == sum(f.total_functions for f in results.files)
+            assert point.coverage == results.get_coverage()
+
+    def test_each_blob_is_analyzed_once(self, temp_dir):
+        """Test identical content across commits and paths is measured once"""
+        os.chdir(temp_dir)
+        self.make_history(temp_dir)
+        cache = ResultCache(temp_dir / "cache.json")
+
+        CodeScanner(Config(), jobs=1, cache=cache).scan_history()
+
+        # COMPLEX (a.py and c.py), SIMPLE and DOCUMENTED
+        assert cache.misses == 3
+
+    def test_last_limits_walk(self, temp_dir):
+        """Test --last only walks the newest commits"""
+        os.chdir(temp_dir)
+        self.make_history(temp_dir)
+
+        history = CodeScanner(Config(), jobs=1).scan_history(last=2)
+
+        assert [point.summary for point in history.points] == ["third", "fourth"]
+
+    def test_round_trip(self, temp_dir):
+        """Test history survives a save and reload"""
+        path = temp_dir / "history.json"
+        points = [HistoryPoint("abc123", 1700000000, "msg", 2, 10, 7, 1)]
+        ScanHistory(points).save(path)
+
+        assert ScanHistory.load(path).points == points
+
+    def test_sparkline(self):
+        """Test trends are scaled to their range"""
+        assert sparkline([0.0, 0.5, 1.0]) == "▁▅█"
+        assert sparkline([3.0, 3.0]) == "██"
+        assert sparkline([]) == ""
@@ -0,0 +1,102 @@
+"""Tests for compiled ignore patterns"""
+
+import fnmatch
+from pathlib import Path
+
+from cognitive_guard.core.ignore import IgnoreMatcher
+
+PATTERNS = [
+    "**/test_*.py",
+    "**/*.test.js",
+    "**/migrations/**",
+    "**/__pycache__/**",
+    "build/*",
+    "docs/conf.py",
+    "*.min.js",
+    "vendor",
+    "src/gen_[a-c]?.py",
+]
+
+PATHS = [
+    "test_example.py",
+    "src/test_module.py",
+    "src/module.py",
+    "app/migrations/0001_initial.py",
+    "migrations.py",
+    "__pycache__/module.py",
+    "pkg/__pycache__/mod.py",
+    "web/button.test.js",
+    "web/button.js",
+    "build/lib/module.py",
+    "docs/conf.py",
+    "site/docs/conf.py",
+    "static/app.min.js",
+    "vendor/lib.py",
+    "src/vendor.py",
+    "src/gen_ab.py",
+    "src/gen_dd.py",
+    "/home/user/project/src/module.py",
+    "/home/user/project/build/module.py",
+]
+
+
+def legacy_should_ignore(path: Path, patterns: list[str]) -> bool:
+    """Reference implementation of the original CodeScanner.should_ignore"""
+    path_str = str(path)
+    for pattern in patterns:
+        if path.match(pattern):
+            return True
+        if fnmatch.fnmatch(path_str, pattern):
+            return True
+        if pattern.startswith("**/"):
+            if fnmatch.fnmatch(path.name, pattern[3:]):
+                return True
+        if "__pycache__" in pattern and "__pycache__" in path_str:
+            return True
+        for part in path.parts:
+            if fnmatch.fnmatch(part, pattern.replace("**/", "").replace("/**", "")):
+                return True
+    return False
+
+
+class TestIgnoreMatcher:
+    """Test cases for IgnoreMatcher"""
+
+    def test_matches_legacy_behaviour(self):
+        """Test compiled matcher agrees with the original per-pattern loop"""
+        matcher = IgnoreMatcher(PATTERNS)
+
+        for raw in PATHS:
+            path = Path(raw)
+            assert matcher.matches(path) == legacy_should_ignore(path, PATTERNS), raw
+
+    def test_single_patterns_match_legacy_behaviour(self):
+        """Test each pattern on its own agrees with the original loop"""
+        for pattern in PATTERNS:
+            matcher = IgnoreMatcher([pattern])
+            for raw in PATHS:
+                path = Path(raw)
+                expected = legacy_should_ignore(path, [pattern])
+                assert matcher.matches(path) == expected, (pattern, raw)
+
+    def test_prunes_only_fully_ignored_directories(self):
+        """Test prune answers imply every descendant is ignored"""
+        matcher = IgnoreMatcher(PATTERNS)
+
+        assert matcher.prunes(Path("app/migrations"))
+        assert matcher.prunes(Path("pkg/__pycache__"))
+        assert matcher.prunes(Path("build/lib"))
+        assert matcher.prunes(Path("vendor"))
+        assert not matcher.prunes(Path("src"))
+        assert not matcher.prunes(Path("docs"))
+
+        for directory in ["app/migrations", "build/lib", "vendor"]:
+            for name in ["a.py", "deep/nested/b.ts"]:
+                assert matcher.matches(Path(directory) / name)
+
+    def test_empty_patterns(self):
+        """Test matcher with no patterns ignores nothing"""
+        matcher = IgnoreMatcher([])
+
+        assert not matcher.matches(Path("src/module.py"))
+        assert not matcher.prunes(Path("src"))
@@ -0,0 +1,146 @@
+"""Tests for incremental scanning against git history"""
+
+import os
+
+from git import Repo
+
+from cognitive_guard.core.cache import ResultCache
+from cognitive_guard.core.config import Config
+from cognitive_guard.core.scanner import CodeScanner
+from cognitive_guard.core.snapshot import ScanSnapshot
+
+COMPLEX = """
+def tangled(a, b, c):
+    if a:
+        if b:
+            if c:
+                return 1
+    return 0
+"""
+
+SIMPLE = """
+def plain():
+    return 1
+"""
+
+
+def make_repo(path):
+    """Create a git repository with two committed Python files"""
+    repo = Repo.init(path)
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "Test")
+        writer.set_value("user", "email", "test@example.com")
+
+    (path / "a.py").write_text(COMPLEX)
+    (path / "b.py").write_text(SIMPLE)
+    repo.index.add(["a.py", "b.py"])
+    repo.index.commit("initial")
+    return repo
+
+
+class TestIncrementalScan:
+    """Test cases for CodeScanner.scan_incremental"""
+
+    def test_snapshot_round_trip(self, temp_dir):
+        """Test snapshots survive a save and reload"""
+        from cognitive_guard.core.complexity import ComplexityResult
+
+        path = temp_dir / ".cognitive-guard" / "snapshot.json"
+        functions = [ComplexityResult("func", 2, 7, False)]
+        ScanSnapshot("abc123", {str(temp_dir / "src" / "a.py"): functions}).save(path)
+
+        snapshot = ScanSnapshot.load(path)
+
+        assert snapshot is not None
+        assert snapshot.commit == "abc123"
+        assert snapshot.files == {str(temp_dir / "src" / "a.py"): functions}
+
+    def test_only_changed_files_are_rescanned(self, temp_dir):
+        """Test changes since the snapshot are merged with stored results"""
+        os.chdir(temp_dir)
+        make_repo(temp_dir)
+        config = Config(complexity_threshold=3)
+
+        scanner = CodeScanner(config, jobs=1)
+        full = scanner.scan_all()
+        scanner.save_snapshot(full)
+        assert full.get_total_violations() == 1
+
+        # Fix the violation and add a new complex file, without committing
+        (temp_dir / "a.py").write_text(SIMPLE)
+        (temp_dir / "c.py").write_text(COMPLEX)
+
+        cache = ResultCache(temp_dir / "cache.json")
+        results = CodeScanner(config, jobs=1, cache=cache).scan_incremental()
+
+        assert cache.misses == 2  # only a.py and c.py were looked at
+        assert sorted(os.path.basename(f.file_path) for f in results.files) == [
+            "a.py",
+            "b.py",
+            "c.py",
+        ]
+        assert [os.path.basename(f.file_path) for f in results.files if f.violations] == ["c.py"]
+
+    def test_deleted_files_are_dropped(self, temp_dir):
+        """Test files deleted since the snapshot disappear from results"""
+        os.chdir(temp_dir)
+        make_repo(temp_dir)
+        scanner = CodeScanner(Config(complexity_threshold=3), jobs=1)
+        scanner.save_snapshot(scanner.scan_all())
+
+        (temp_dir / "a.py").unlink()
+        results = scanner.scan_incremental()
+
+        assert [os.path.basename(f.file_path) for f in results.files] == ["b.py"]
+
+    def test_falls_back_to_full_scan_without_snapshot(self, temp_dir):
+        """Test a missing snapshot triggers a full scan"""
+        os.chdir(temp_dir)
+        make_repo(temp_dir)
+
+        results = CodeScanner(Config(complexity_threshold=3), jobs=1).scan_incremental()
+
+        assert len(results.files) == 2
+
+    def test_since_other_ref_includes_changes_since_snapshot(self, temp_dir):
+        """Test files committed after the snapshot are rescanned for any ref"""
+        os.chdir(temp_dir)
+        repo = make_repo(temp_dir)
+        scanner = CodeScanner(Config(complexity_threshold=3), jobs=1)
+        scanner.save_snapshot(scanner.scan_all())
+
+        (temp_dir / "a.py").write_text(SIMPLE)
+        repo.index.add(["a.py"])
+        repo.index.commit("simplify")
+        results = scanner.scan_incremental("HEAD")
+
+        assert not results.has_violations()
+
+    def test_parser_version_change_rescans(self, temp_dir, monkeypatch):
+        """Test results from an older parser version aren't reused"""
+        from cognitive_guard.parsers.python import PythonParser
+
+        os.chdir(temp_dir)
+        make_repo(temp_dir)
+        config = Config(complexity_threshold=3)
+        scanner = CodeScanner(config, jobs=1)
+        scanner.save_snapshot(scanner.scan_all())
+
+        monkeypatch.setattr(PythonParser, "version", "99")
+        cache = ResultCache(temp_dir / "cache.json")
+        results = CodeScanner(config, jobs=1, cache=cache).scan_incremental()
+
+        assert cache.misses == 2
+        assert len(results.files) == 2
+
+    def test_config_change_rescans(self, temp_dir):
+        """Test a snapshot taken with other ignore patterns isn't reused"""
+        os.chdir(temp_dir)
+        make_repo(temp_dir)
+        scanner = CodeScanner(Config(complexity_threshold=3), jobs=1)
+        scanner.save_snapshot(scanner.scan_all())
+
+        config = Config(complexity_threshold=3, ignore=["**/a.py"])
+        results = CodeScanner(config, jobs=1).scan_incremental()
+
+        assert [os.path.basename(f.file_path) for f in results.files] == ["b.py"]
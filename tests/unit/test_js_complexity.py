@@ -0,0 +1,215 @@
+"""Tests for the JavaScript and TypeScript complexity engine"""
+
+import pytest
+
+from cognitive_guard.core.complexity import ComplexityAnalyzer
+from cognitive_guard.core.js_complexity import JSComplexityAnalyzer, JSParseError
+
+
+def scores(source: str, typescript: bool = False, jsx: bool = False) -> list[tuple[str, int]]:
+    results = JSComplexityAnalyzer(typescript=typescript, jsx=jsx).analyze_source(source)
+    return [(r.name, r.complexity) for r in results]
+
+
+class TestJSComplexityAnalyzer:
+    """Test cases for JSComplexityAnalyzer"""
+
+    def test_matches_python_scores(self):
+        """Test the same logic scores the same as with ComplexityAnalyzer"""
+        js = """
+function f(a, b) {
+  if (a) {
+    for (const x of b) {
+      if (x && a || b) { g(); } else if (x) { h(); } else { k(); }
+    }
+  } else if (b) {
+    return a ? 1 : 2;
+  }
+  try { g(); } catch (e) { while (a) { f(a - 1); } }
+  const inner = (y) => { if (y) { return 1; } };
+  return b.map(x => x ? 1 : 0);
+}
+"""
+        python = """
+def f(a, b):
+    if a:
+        for x in b:
+            if x and a or b:
+                g()
+            elif x:
+                h()
+            else:
+                k()
+    elif b:
+        return 1 if a else 2
+    try:
+        g()
+    except Exception as e:
+        while a:
+            f(a - 1)
+    def inner(y):
+        if y:
+            return 1
+    return map(lambda x: 1 if x else 0, b)
+"""
+        expected = [(r.name, r.complexity) for r in ComplexityAnalyzer().analyze_source(python)]
+
+        assert scores(js) == expected == [("f", 21), ("inner", 1)]
+
+    def test_braceless_statements(self):
+        """Test nesting under if/else without braces, and do-while scored once"""
+        code = """
+function g(a) {
+  if (a) h(); else { while (a) a--; }
+  if (a) for (;;) if (a) break;
+  else a++;
+  do { a--; } while (a > 0);
+}
+"""
+        # if 1, while 2; if 1, for 2, if 3 (the else belongs to it); do 1
+        assert scores(code) == [("g", 10)]
+
+    def test_function_forms(self):
+        """Test names and spans of declarations, methods and arrow functions"""
+        code = """
+const add = (a, b) => {
+  return a + b;
+};
+class Cart {
+  total(items) {
+    return items.reduce((sum, item) => sum + (item.price || 0), 0);
+  }
+  [Symbol.iterator]() {}
+}
+const handlers = {
+  onClick: function () {},
+  onKey(event) {},
+};
+"""
+        results = JSComplexityAnalyzer().analyze_source(code)
+
+        assert [(r.name, r.line_number, r.end_line_number, r.complexity) for r in results] == [
+            ("add", 2, 4, 0),
+            ("total", 6, 8, 1),
+            ("[Symbol.iterator]", 9, 9, 0),
+            ("onClick", 12, 12, 0),
+            ("onKey", 13, 13, 0),
+        ]
+
+    def test_typescript(self):
+        """Test return types, overloads, generics and decorators"""
+        code = """
+interface Shape { area(): number; name: string }
+@Component({ selector: 'x' })
+class Widget {
+  /** Documented */
+  @Input()
+  render(a: number, b?: string): { ok: boolean } {
+    return { ok: a > 0 ? true : false };
+  }
+  parse(a: string): void;
+  parse(a: any): void { if (a) { parse(a); } }
+  static create<T extends string>(
+    value: T,
+  ): Map<string, T> {}
+  handler = async (e: Event): Promise<void> => { if (e) {} };
+}
+/// Documented
+function identity<T>(x: T): T { return x; }
+"""
+        results = JSComplexityAnalyzer(typescript=True).analyze_source(code)
+
+        assert [(r.name, r.complexity, r.has_docstring) for r in results] == [
+            ("render", 1, True),
+            ("parse", 3, False),
+            ("create", 0, False),
+            ("handler", 1, False),
+            ("identity", 0, True),
+        ]
+
+    def test_function_types(self):
+        """Test => in a type doesn't start a function, even with an object return type"""
+        code = """
+type H = (e: Event) => { ok: boolean };
+type G<T = string> = (a: T) => { b: T }
+interface P { onClick: (e: E) => { handled: boolean }; }
+function f(cb: () => { a: number }) { if (cb) {} }
+class C {
+  onClick: (e: E) => { a: number };
+  handler: H = (e) => { if (e) {} };
+}
+const g = (x: () => { a: number }): void => { if (x) {} };
+"""
+        assert scores(code, typescript=True) == [("f", 1), ("(anonymous)", 1), ("g", 1)]
+
+    def test_ignores_strings_comments_and_regexes(self):
+        """Test keywords and brackets in literals are not code"""
+        code = """
+function quiet(a) {
+  const s = "if (a) {" + 'while (b) }';
+  // if (a) { for (;;) {
+  const re = /[}{(]if/g;
+  return `${a ? `}` : "{"} && ${re.test(s)}`;
+}
+"""
+        assert scores(code) == [("quiet", 1)]
+
+    def test_regex_after_header(self):
+        """Test a / after the condition of an if or a loop starts a regex"""
+        code = """
+function check(x, n) {
+  if (x) /[)]/.test(x);
+  while (n--) /[(]/.exec(x);
+  return (x) / (n) / 2;
+}
+"""
+        # if 1, while 1; the last line divides
+        assert scores(code) == [("check", 2)]
+
+    def test_jsx(self):
+        """Test JSX markup is skipped and its embedded expressions scored"""
+        code = """
+function App({ items, a, b, c }) {
+  if (a) {
+    if (b) {
+      if (c) {
+        return <ul>{items.map(i => <li key={i}>{i}</li>)}</ul>;
+      }
+    }
+  }
+}
+const List = ({ items, pick }) => (
+  <>
+    <h1 className="if (x) {">Found a typo? {'{'}</h1>
+    {items.length > 0 && items.map((item) => (
+      <Item {...item} onClick={() => { if (item.ok) { pick(item); } }} label={`#${item.id}`} />
+    ))}
+    {/* if (x) { */}
+  </>
+);
+function loop(n) { for (let i = 0; i < n; i++) { if (i++ < n / 2) {} } return n < 2 && <br/>; }
+"""
+        # App: if 1, if 2, if 3; the click handler: if 1; loop: for 1, if 2, && 1
+        assert scores(code, jsx=True) == [("App", 6), ("(anonymous)", 1), ("loop", 4)]
+
+    def test_tsx_generics(self):
+        """Test type parameters written for .tsx aren't taken for JSX"""
+        code = """
+const first = <T,>(items: T[]): T | undefined => items[0];
+const show = <T extends object>(value: T) => { return value ? <Box value={value} /> : null; };
+"""
+        assert scores(code, typescript=True, jsx=True) == [("show", 1)]
+
+    def test_unbalanced_source_raises(self):
+        """Test source that can't be followed raises JSParseError"""
+        for code in [
+            "function f() {",
+            "}",
+            "f(()",
+            "const s = `${a",
+            "x = <a>{b}</a",
+            "if (a) => 1",
+            "function g(a) => 1;",
+        ]:
+            with pytest.raises(JSParseError):
+                JSComplexityAnalyzer(jsx=True).analyze_source(code)
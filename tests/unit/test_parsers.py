@@ -0,0 +1,242 @@
+"""Tests for the language parsers"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from cognitive_guard import parsers
+from cognitive_guard.core.complexity import ComplexityResult
+from cognitive_guard.core.config import Config
+from cognitive_guard.core.scanner import enabled_extensions
+from cognitive_guard.parsers import (
+    BaseParser,
+    DocCommentIndex,
+    JavaParser,
+    JavaScriptParser,
+    ParserFactory,
+    TypeScriptParser,
+)
+
+EXAMPLES = Path(__file__).resolve().parents[2] / "examples"
+
+
+class GoParser(BaseParser):
+    """Stand-in for a parser shipped by another package"""
+
+    extensions = (".go",)
+
+    def parse_file(self, file_path: str) -> list[ComplexityResult]:
+        return []
+
+
+class FakeEntryPoint:
+    """Just enough of importlib.metadata.EntryPoint"""
+
+    name = "go"
+
+    def load(self):
+        return GoParser
+
+
+class TestParserFactory:
+    """Test cases for ParserFactory"""
+
+    def test_lookup_by_extension(self):
+        """Test each extension maps to one shared parser, and unknown ones to None"""
+        assert type(ParserFactory.get_parser("src/app.tsx")).__name__ == "TypeScriptParser"
+        assert ParserFactory.get_parser("a.ts") is ParserFactory.get_parser("b.tsx")
+        assert ParserFactory.get_parser("notes.txt") is None
+        assert ParserFactory.get_parser("Makefile") is None
+
+    def test_python_only_does_not_import_lizard(self):
+        """Test Lizard is only imported once a file needing it is parsed"""
+        code = (
+            "import sys\n"
+            "from cognitive_guard.parsers import ParserFactory\n"
+            "ParserFactory.get_parser('a.py')\n"
+            "print('lizard' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+        assert result.stdout.strip() == "False"
+
+    def test_entry_point_parsers(self, monkeypatch):
+        """Test parsers from other packages are found by language and extension"""
+        monkeypatch.setattr(parsers, "entry_points", lambda group: [FakeEntryPoint()])
+        monkeypatch.setattr(ParserFactory, "_registry", dict(parsers.BUILTIN_PARSERS))
+        monkeypatch.setattr(ParserFactory, "_parsers", {})
+        monkeypatch.setattr(ParserFactory, "_plugins", None)
+
+        assert enabled_extensions(Config(languages=["python", "go"])) == (".py", ".pyi", ".go")
+        assert isinstance(ParserFactory.get_parser("main.go"), GoParser)
+
+
+class TestDocCommentIndex:
+    """Test cases for DocCommentIndex"""
+
+    def test_doc_comment_directly_above(self):
+        """Test JSDoc counts across blank lines and plain comments, not code"""
+        content = (
+            "/**\n"
+            " * Documented.\n"
+            " */\n"
+            "\n"
+            "// eslint-disable-next-line\n"
+            "function documented() {}\n"
+            "/** Belongs to the statement below */\n"
+            "const x = 1;\n"
+            "function undocumented() {}\n"
+        )
+        docs = DocCommentIndex(content)
+
+        assert docs.documents(6)
+        assert not docs.documents(9)
+
+    def test_ignores_markers_in_strings_and_plain_comments(self):
+        """Test /** inside strings or /* */ comments isn't a doc comment"""
+        content = (
+            'const marker = "/**";\n'
+            "/* not a doc comment */\n"
+            "function first() {}\n"
+            "const tpl = `\n"
+            "/** still a string */\n"
+            "`;\n"
+            "function second() {}\n"
+        )
+        docs = DocCommentIndex(content)
+
+        assert not docs.documents(3)
+        assert not docs.documents(7)
+
+    def test_triple_slash(self):
+        """Test /// comments count only where enabled"""
+        content = "/// Adds numbers\nfunction add(a, b) {}\n"
+
+        assert DocCommentIndex(content, triple_slash=True).documents(2)
+        assert not DocCommentIndex(content).documents(2)
+
+    def test_long_doc_comment(self):
+        """Test doc comments are found however long they are"""
+        content = "/**\n" + " * line\n" * 40 + " */\nfunction described() {}\n"
+
+        assert DocCommentIndex(content).documents(43)
+
+
+class TestLanguageParsers:
+    """Test cases for the JavaScript, TypeScript and Java parsers"""
+
+    def test_sample_code_documentation(self):
+        """Test doc comment detection on the example files"""
+        js = JavaScriptParser().parse_file(str(EXAMPLES / "sample_code.js"))
+        ts = TypeScriptParser().parse_file(str(EXAMPLES / "sample_code.ts"))
+
+        assert {r.name: r.has_docstring for r in js if r.name != "(anonymous)"} == {
+            "add": True,
+            "calculateDiscount": True,
+            "veryComplexUndocumented": False,
+            "processOrder": True,
+            "complexArrow": False,
+        }
+        assert {r.name: r.has_docstring for r in ts if r.name != "(anonymous)"} == {
+            "add": True,
+            "getUserDiscount": True,
+            "processUserOrders": False,
+            "calculateOrderTotal": True,
+            "processWithTSDoc": True,
+            "transform": False,
+        }
+
+    def test_parse_source_matches_parse_file(self):
+        """Test in-memory content gives the same results as the file on disk"""
+        path = EXAMPLES / "sample_code.ts"
+        parser = TypeScriptParser()
+
+        assert parser.parse_source(path.read_bytes(), str(path)) == parser.parse_file(str(path))
+
+    def test_non_utf8_file(self, temp_dir):
+        """Test files that aren't valid UTF-8 are still analyzed"""
+        path = temp_dir / "legacy.js"
+        path.write_bytes(
+            "// caf\xe9\n/** Doc */\nfunction f(a) { if (a) { return 1; } }\n".encode("latin-1")
+        )
+
+        results = JavaScriptParser().parse_file(str(path))
+
+        assert [(r.name, r.has_docstring) for r in results] == [("f", True)]
+
+    def test_jsx_by_extension(self, temp_dir):
+        """Test JSX is analyzed natively in .jsx and .tsx files, but not .ts"""
+        jsx = "function App(a) {\n  if (a) { return <p>{a ? 1 : 2}</p>; }\n}\n"
+        (temp_dir / "app.jsx").write_text(jsx)
+        (temp_dir / "app.tsx").write_text(jsx)
+        (temp_dir / "cast.ts").write_text("function f(a) {\n  return <any>a ? 1 : 0;\n}\n")
+
+        results = [
+            JavaScriptParser().parse_file(str(temp_dir / "app.jsx")),
+            TypeScriptParser().parse_file(str(temp_dir / "app.tsx")),
+            TypeScriptParser().parse_file(str(temp_dir / "cast.ts")),
+        ]
+
+        assert [[(r.name, r.complexity) for r in rs] for rs in results] == [
+            [("App", 2)],
+            [("App", 2)],
+            [("f", 1)],
+        ]
+
+    def test_falls_back_to_lizard(self, temp_dir, capsys):
+        """Test files the native engine can't follow are still measured, with a warning"""
+        path = temp_dir / "broken.js"
+        path.write_text("/** Doc */\nfunction f(a) {\n  if (a && a.b) { return 1; }\n")
+
+        results = JavaScriptParser().parse_file(str(path))
+
+        # Cyclomatic: 1, plus 1 for the if and 1 for the &&
+        assert [(r.name, r.complexity, r.metric, r.has_docstring) for r in results] == [
+            ("f", 3, "cyclomatic", True)
+        ]
+        assert "Falling back to cyclomatic complexity" in capsys.readouterr().err
+
+    def test_falls_back_on_engine_errors(self, temp_dir, capsys, monkeypatch):
+        """Test an unexpected error in the native engine doesn't stop the scan"""
+        from cognitive_guard.core.js_complexity import JSComplexityAnalyzer
+
+        def fail(self, source):
+            raise TypeError("boom")
+
+        monkeypatch.setattr(JSComplexityAnalyzer, "analyze_source", fail)
+        path = temp_dir / "app.js"
+        path.write_text("function f(a) {\n  if (a) { return 1; }\n}\n")
+
+        results = JavaScriptParser().parse_file(str(path))
+
+        assert [(r.name, r.complexity, r.metric) for r in results] == [("f", 2, "cyclomatic")]
+        assert "TypeError: boom" in capsys.readouterr().err
+
+    def test_javadoc_above_annotations(self, temp_dir):
+        """Test Javadoc counts for a method with annotations in between"""
+        path = temp_dir / "Sample.java"
+        path.write_text(
+            "public class Sample {\n"
+            "    /**\n"
+            "     * Documented.\n"
+            "     */\n"
+            "    @SuppressWarnings(\n"
+            '        value = "unchecked")\n'
+            "    public int documented(int a) {\n"
+            "        if (a > 0) { return 1; }\n"
+            "        return 0;\n"
+            "    }\n"
+            "\n"
+            "    @Override\n"
+            "    public int undocumented(int a) {\n"
+            "        return a;\n"
+            "    }\n"
+            "}\n"
+        )
+
+        results = JavaParser().parse_file(str(path))
+
+        assert [(r.name, r.line_number, r.has_docstring) for r in results] == [
+            ("Sample::documented", 7, True),
+            ("Sample::undocumented", 13, False),
+        ]
@@ -0,0 +1,51 @@
+"""Tests for per-phase profiling"""
+
+import time
+
+from cognitive_guard.utils.profiler import Profiler
+
+
+class TestProfiler:
+    """Test cases for Profiler"""
+
+    def test_disabled_records_nothing(self):
+        """Test hooks are no-ops until profiling is enabled"""
+        profiler = Profiler()
+
+        with profiler.phase("parse"), profiler.file("a.py", "PythonParser", 10):
+            pass
+        assert list(profiler.timed_iter("read", [1, 2])) == [1, 2]
+
+        assert profiler.phases == {}
+        assert profiler.files == []
+
+    def test_nested_phases_are_exclusive(self):
+        """Test time in an inner phase is not counted for the outer one"""
+        profiler = Profiler()
+        profiler.enable()
+
+        with profiler.phase("render"):
+            with profiler.phase("parse"):
+                time.sleep(0.05)
+
+        assert profiler.phases["parse"].wall >= 0.05
+        assert profiler.phases["render"].wall < 0.05
+        assert profiler.phases["render"].calls == 1
+
+    def test_merge_keeps_slowest_files(self):
+        """Test worker timings add up and only the slowest files are kept"""
+        worker = Profiler()
+        worker.enable()
+        for index in range(5):
+            worker.record_file(f"{index}.py", 100, "PythonParser", index / 10)
+        with worker.phase("parse"):
+            pass
+
+        profiler = Profiler()
+        profiler.enable(slowest=2)
+        profiler.merge(worker.drain())
+        profiler.merge(worker.drain())
+
+        assert [timing.path for timing in sorted(profiler.files, reverse=True)] == ["4.py", "3.py"]
+        assert profiler.phases["parse"].calls == 1
+        assert worker.phases == {}
@@ -0,0 +1,45 @@
+"""Tests for SARIF output"""
+
+import io
+import json
+
+from cognitive_guard.core.complexity import ComplexityResult
+from cognitive_guard.core.config import Config
+from cognitive_guard.core.sarif import RULE_ID, write_sarif
+from cognitive_guard.core.scanner import FileResult, ScanResults
+
+
+class TestSarif:
+    """Test cases for write_sarif"""
+
+    def test_writes_result_per_violation(self, temp_dir):
+        """Test violations become results with rule metadata and regions"""
+        tangled = ComplexityResult("tangled", 3, 16, False, end_line_number=20)
+        moderate = ComplexityResult("moderate", 30, 12, False)
+        stream = [
+            FileResult(str(temp_dir / "src" / "a.py"), [tangled, moderate], [tangled, moderate]),
+            FileResult(str(temp_dir / "b.py"), [ComplexityResult("plain", 1, 0, True)]),
+        ]
+        out = io.StringIO()
+
+        results = ScanResults(config=Config(complexity_threshold=10))
+        write_sarif(out, results, stream, root=temp_dir)
+
+        log = json.loads(out.getvalue())
+        run = log["runs"][0]
+        assert log["version"] == "2.1.0"
+        assert [rule["id"] for rule in run["tool"]["driver"]["rules"]] == [RULE_ID]
+        assert [result["level"] for result in run["results"]] == ["error", "warning"]
+
+        location = run["results"][0]["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"] == {"uri": "src/a.py", "uriBaseId": "%SRCROOT%"}
+        assert location["region"] == {"startLine": 3, "endLine": 20}
+        assert run["properties"]["violations"] == results.total_violations == 2
+
+    def test_empty_stream(self, temp_dir):
+        """Test a scan without violations is still a valid log"""
+        out = io.StringIO()
+
+        write_sarif(out, ScanResults(), [], root=temp_dir)
+
+        assert json.loads(out.getvalue())["runs"][0]["results"] == []
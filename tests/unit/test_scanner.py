@@ -1,10 +1,16 @@
 """Tests for code scanner"""
 
+import os
 import tempfile
 from pathlib import Path
 
 from cognitive_guard.core.config import Config
-from cognitive_guard.core.scanner import CodeScanner, FileResult, ScanResults
+from cognitive_guard.core.scanner import (
+    PARALLEL_MIN_FILES,
+    CodeScanner,
+    FileResult,
+    ScanResults,
+)
 
 
 class TestCodeScanner:
@@ -20,6 +26,38 @@ class TestCodeScanner:
         assert scanner.should_ignore(Path("__pycache__/module.pyc"))
         assert not scanner.should_ignore(Path("src/module.py"))
 
+    def test_should_prune(self):
+        """Test directory pruning only skips fully ignored directories"""
+        config = Config(ignore=["**/node_modules/**", "**/test_*.py"])
+        scanner = CodeScanner(config)
+
+        assert scanner.should_prune(Path("web/node_modules"))
+        assert scanner.should_prune(Path("web/node_modules/pkg"))
+        assert not scanner.should_prune(Path("web/src"))
+        assert not scanner.should_prune(Path("tests"))
+
+    def test_discover_files(self, temp_dir):
+        """Test single-pass discovery matches extensions and skips ignored dirs"""
+        (temp_dir / "src").mkdir()
+        (temp_dir / "src" / "app.py").write_text("x = 1\n")
+        (temp_dir / "src" / "test_app.py").write_text("x = 1\n")
+        (temp_dir / "src" / "view.ts").write_text("let x = 1;\n")
+        (temp_dir / "src" / "notes.txt").write_text("hello\n")
+        (temp_dir / "node_modules" / "pkg").mkdir(parents=True)
+        (temp_dir / "node_modules" / "pkg" / "index.js").write_text("var x;\n")
+        (temp_dir / "link.py").symlink_to(temp_dir / "src" / "app.py")
+
+        os.chdir(temp_dir)
+        config = Config(
+            languages=["python", "typescript"],
+            ignore=["**/test_*.py", "**/node_modules/**"],
+        )
+        files = CodeScanner(config).discover_files()
+        names = sorted(path.name for path in files)
+
+        # link.py and src/app.py are the same inode and only count once
+        assert names == ["link.py", "view.ts"]
+
     def test_scan_file(self):
         """Test scanning a single file"""
         with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
@@ -48,6 +86,66 @@ def complex_func(x, y, z):
         finally:
             temp_path.unlink()
 
+    def test_scan_files_parallel_matches_serial(self, temp_dir):
+        """Test parallel scanning returns the same results in path order"""
+        for i in range(PARALLEL_MIN_FILES + 4):
+            (temp_dir / f"mod_{i:03}.py").write_text(
+                f"def func_{i}(x):\n    if x:\n        return {i}\n    return 0\n"
+            )
+        paths = list(temp_dir.glob("*.py"))
+
+        config = Config(complexity_threshold=1)
+        serial = CodeScanner(config, jobs=1).scan_files(reversed(paths))
+        parallel = CodeScanner(config, jobs=2).scan_files(paths)
+
+        assert [r.file_path for r in parallel] == sorted(str(p) for p in paths)
+        assert [r.file_path for r in parallel] == [r.file_path for r in serial]
+        assert [(f.name, f.complexity) for r in parallel for f in r.functions] == [
+            (f.name, f.complexity) for r in serial for f in r.functions
+        ]
+
+    def test_iter_files_streams_in_path_order(self, temp_dir):
+        """Test streamed results match a batch scan and save the cache when closed"""
+        from cognitive_guard.core.cache import ResultCache
+
+        for i in range(4):
+            (temp_dir / f"mod_{i}.py").write_text(f"def func_{i}():\n    return {i}\n")
+        paths = list(temp_dir.glob("*.py"))
+
+        cache = ResultCache(temp_dir / "cache.json")
+        stream = CodeScanner(Config(), jobs=1, cache=cache).iter_files(paths)
+        first = next(stream)
+        stream.close()
+
+        assert first.file_path == str(temp_dir / "mod_0.py")
+        assert (temp_dir / "cache.json").exists()
+        assert [r.file_path for r in CodeScanner(Config(), jobs=1).iter_files(paths)] == [
+            r.file_path for r in CodeScanner(Config(), jobs=1).scan_files(paths)
+        ]
+
+    def test_iter_files_looks_ahead_a_bounded_window(self, temp_dir, monkeypatch):
+        """Test files are looked up in the cache as the stream reaches them"""
+        from cognitive_guard.core import scanner as scanner_module
+        from cognitive_guard.core.cache import ResultCache
+
+        monkeypatch.setattr(scanner_module, "MEASURE_WINDOW", 4)
+        for i in range(20):
+            (temp_dir / f"mod_{i:02}.py").write_text(f"def func_{i}():\n    return {i}\n")
+        paths = list(temp_dir.glob("*.py"))
+        cache = ResultCache(temp_dir / "cache.json")
+        CodeScanner(Config(), jobs=1, cache=cache).scan_files(paths)
+
+        scanner = CodeScanner(Config(), jobs=1, cache=ResultCache(temp_dir / "cache.json"))
+        looked_up = []
+        lookup = scanner._lookup
+        monkeypatch.setattr(scanner, "_lookup", lambda path: looked_up.append(path) or lookup(path))
+        stream = scanner.iter_files(paths)
+
+        assert next(stream).functions[0].name == "func_0"
+        assert len(looked_up) <= 5
+        assert [r.functions[0].name for r in stream] == [f"func_{i}" for i in range(1, 20)]
+        assert scanner.cache.hits == 20
+
 
 class TestScanResults:
     """Test cases for ScanResults"""
@@ -81,3 +179,150 @@ class TestScanResults:
         assert results.has_violations() is False
         assert results.get_coverage() == 1.0
         assert results.get_total_violations() == 0
+
+    def test_evaluate_applies_new_config(self):
+        """Test re-evaluating measurements under a different config"""
+        from cognitive_guard.core.complexity import ComplexityResult
+
+        functions = [
+            ComplexityResult("documented", 1, 18, True),
+            ComplexityResult("moderate", 10, 8, False),
+            ComplexityResult("tangled", 20, 16, False),
+        ]
+        results = ScanResults(
+            files=[
+                FileResult("src/app.py", functions=functions),
+                FileResult("src/test_app.py", functions=functions),
+                FileResult("web/app.js", functions=functions),
+            ]
+        )
+
+        strict = results.evaluate(Config(complexity_threshold=5, ignore=[]))
+        relaxed = results.evaluate(
+            Config(complexity_threshold=15, ignore=["**/test_*.py"], languages=["python"])
+        )
+
+        assert strict.get_total_violations() == 6
+        assert [file.file_path for file in relaxed.files] == ["src/app.py"]
+        assert [v.name for v in relaxed.files[0].violations] == ["tangled"]
+
+    def test_threshold_report(self):
+        """Test comparing several thresholds over one set of results"""
+        from cognitive_guard.core.complexity import ComplexityResult
+
+        functions = [
+            ComplexityResult("documented", 1, 18, True),
+            ComplexityResult("moderate", 10, 8, False),
+            ComplexityResult("tangled", 20, 16, False),
+        ]
+        results = ScanResults(files=[FileResult("app.py", functions=functions)])
+
+        report = {row["threshold"]: row for row in results.threshold_report([5, 10, 20])}
+
+        assert report[5]["violations"] == 2
+        assert report[10]["violations"] == 1
+        assert report[20]["violations"] == 0
+        assert report[10]["complex_functions"] == 2
+        assert report[10]["coverage"] == 0.5
+        assert report[20]["coverage"] == 1.0
+
+    def test_consume_keeps_running_totals(self):
+        """Test files streamed through consume are counted as they pass"""
+        from cognitive_guard.core.complexity import ComplexityResult
+
+        violation = ComplexityResult("tangled", 3, 16, False)
+        stream = [
+            FileResult("a.py", [ComplexityResult("plain", 1, 0, True), violation], [violation]),
+            FileResult("b.py", [ComplexityResult("other", 1, 2, True)]),
+        ]
+        results = ScanResults()
+
+        seen = []
+        for file in results.consume(stream):
+            seen.append((file.file_path, results.total_functions, results.total_violations))
+
+        assert seen == [("a.py", 2, 1), ("b.py", 3, 1)]
+        assert results.get_coverage() == 2 / 3
+        assert results.violations_by_severity == {"very_complex": 1}
+        assert results.to_dict()["violations_by_severity"]["complex"] == 0
+        assert results == ScanResults(files=stream)
+
+    def test_consume_without_keeping_files(self):
+        """Test a counters-only ScanResults totals a stream without storing it"""
+        from cognitive_guard.core.complexity import ComplexityResult
+
+        violation = ComplexityResult("tangled", 3, 16, False)
+        stream = [FileResult("a.py", [violation], [violation]), FileResult("b.py")]
+        results = ScanResults(keep_files=False)
+
+        assert len(list(results.consume(stream))) == 2
+        assert results.files == []
+        assert results.to_dict()["total_files"] == 2
+        assert results.total_violations == 1
+
+    def test_write_json_matches_to_dict(self):
+        """Test streamed JSON output is the to_dict() document"""
+        import io
+        import json
+
+        from cognitive_guard.core.complexity import ComplexityResult
+
+        violation = ComplexityResult("tangled", 3, 16, False)
+        stream = [FileResult("a.py", [violation], [violation]), FileResult("b.py")]
+        out = io.StringIO()
+
+        results = ScanResults()
+        results.write_json(out, stream)
+
+        assert json.loads(out.getvalue()) == results.to_dict()
+        assert json.loads(out.getvalue())["violations"] == 1
+
+    def test_write_ndjson_flushes_each_record(self):
+        """Test each NDJSON record is flushed before the next file is scanned"""
+        import io
+
+        class Output(io.StringIO):
+            flushed = ""
+
+            def flush(self):
+                self.flushed = self.getvalue()
+
+        out = Output()
+
+        def stream():
+            for name in ("a.py", "b.py"):
+                # Everything written so far has been flushed
+                assert out.flushed == out.getvalue()
+                yield FileResult(name)
+
+        ScanResults().write_ndjson(out, stream())
+
+        assert [line.split(",")[0] for line in out.flushed.splitlines()] == [
+            '{"type":"file"',
+            '{"type":"file"',
+            '{"type":"summary"',
+        ]
+
+    def test_write_plain_limit_keeps_worst(self):
+        """Test plain output with a limit shows only the most complex violations"""
+        import io
+
+        from cognitive_guard.core.complexity import ComplexityResult
+
+        mild = ComplexityResult("mild", 3, 12, False)
+        worst = ComplexityResult("worst", 9, 30, False)
+        middle = ComplexityResult("middle", 1, 18, False)
+        stream = [
+            FileResult("a.py", [mild, worst], [mild, worst]),
+            FileResult("b.py", [middle], [middle]),
+        ]
+        out = io.StringIO()
+
+        results = ScanResults()
+        results.write_plain(out, stream, limit=2)
+
+        assert out.getvalue().splitlines() == [
+            "a.py:9: worst 30 very_complex",
+            "b.py:1: middle 18 very_complex",
+            "2 files, 3 functions, 0.0% documented, 3 violations (showing 2)",
+        ]
@@ -0,0 +1,131 @@
+"""Tests for scanning content read from git instead of the working tree"""
+
+import os
+
+import pytest
+from git import GitCommandError, Repo
+
+from cognitive_guard.core.cache import ResultCache
+from cognitive_guard.core.config import Config
+from cognitive_guard.core.scanner import CodeScanner
+
+COMPLEX = """
+def tangled(a, b, c):
+    if a:
+        if b:
+            if c:
+                return 1
+    return 0
+"""
+
+SIMPLE = """
+def plain():
+    return 1
+"""
+
+
+def init_repo(path):
+    """Create an empty git repository"""
+    repo = Repo.init(path)
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "Test")
+        writer.set_value("user", "email", "test@example.com")
+    return repo
+
+
+class TestStagedScan:
+    """Test cases for CodeScanner.scan_staged"""
+
+    def test_scans_index_not_working_tree(self, temp_dir):
+        """Test partially staged files are checked as they will be committed"""
+        os.chdir(temp_dir)
+        repo = init_repo(temp_dir)
+        (temp_dir / "a.py").write_text(SIMPLE)
+        repo.index.add(["a.py"])
+        repo.index.commit("initial")
+
+        # Stage a violation, then clean it up without staging the fix
+        (temp_dir / "a.py").write_text(COMPLEX)
+        repo.index.add(["a.py"])
+        (temp_dir / "a.py").write_text(SIMPLE)
+
+        results = CodeScanner(Config(complexity_threshold=3), jobs=1).scan_staged()
+
+        assert [f.file_path for f in results.files] == ["a.py"]
+        assert results.get_total_violations() == 1
+
+    def test_initial_commit(self, temp_dir):
+        """Test staged files are found before the first commit"""
+        os.chdir(temp_dir)
+        repo = init_repo(temp_dir)
+        (temp_dir / "a.py").write_text(COMPLEX)
+        (temp_dir / "notes.txt").write_text("not code")
+        repo.index.add(["a.py", "notes.txt"])
+
+        results = CodeScanner(Config(complexity_threshold=3), jobs=1).scan_staged()
+
+        assert [f.file_path for f in results.files] == ["a.py"]
+        assert results.get_total_violations() == 1
+
+    def test_every_enabled_language(self, temp_dir):
+        """Test staged files of every enabled language are checked"""
+        os.chdir(temp_dir)
+        repo = init_repo(temp_dir)
+        (temp_dir / "a.py").write_text(SIMPLE)
+        (temp_dir / "b.js").write_text("function b(x) {\n  if (x) { return 1; }\n}\n")
+        (temp_dir / "C.java").write_text("class C {\n  int c() { return 1; }\n}\n")
+        repo.index.add(["a.py", "b.js", "C.java"])
+
+        config = Config(languages=["python", "javascript"])
+        results = CodeScanner(config, jobs=1).scan_staged()
+
+        assert [f.file_path for f in results.files] == ["a.py", "b.js"]
+
+    def test_reuses_cached_blobs(self, temp_dir):
+        """Test staged content analyzed before is served from the cache"""
+        os.chdir(temp_dir)
+        repo = init_repo(temp_dir)
+        (temp_dir / "a.py").write_text(COMPLEX)
+        repo.index.add(["a.py"])
+
+        cache = ResultCache(temp_dir / "cache.json")
+        CodeScanner(Config(), jobs=1, cache=cache).scan_all()
+
+        results = CodeScanner(Config(), jobs=1, cache=cache).scan_staged()
+
+        assert cache.hits == 1
+        assert results.files[0].functions[0].name == "tangled"
+
+
+class TestRevisionScan:
+    """Test cases for CodeScanner.scan_revision"""
+
+    def test_scans_old_revision(self, temp_dir):
+        """Test a past revision is scanned without touching the working tree"""
+        os.chdir(temp_dir)
+        repo = init_repo(temp_dir)
+        (temp_dir / "a.py").write_text(COMPLEX)
+        repo.index.add(["a.py"])
+        repo.index.commit("complex")
+        (temp_dir / "a.py").write_text(SIMPLE)
+        (temp_dir / "b.py").write_text(SIMPLE)
+        repo.index.add(["a.py", "b.py"])
+        repo.index.commit("simplify")
+
+        scanner = CodeScanner(Config(complexity_threshold=3), jobs=1)
+        old = scanner.scan_revision("HEAD~1")
+        new = scanner.scan_revision("HEAD")
+
+        assert [f.file_path for f in old.files] == [str(temp_dir / "a.py")]
+        assert old.get_total_violations() == 1
+        assert [f.file_path for f in new.files] == [str(p) for p in scanner.discover_files()]
+        assert new.get_total_violations() == 0
+        assert (temp_dir / "a.py").read_text() == SIMPLE
+
+    def test_unknown_revision(self, temp_dir):
+        """Test an unresolvable revision raises a git error"""
+        os.chdir(temp_dir)
+        init_repo(temp_dir)
+
+        with pytest.raises(GitCommandError):
+            CodeScanner(Config(), jobs=1).scan_revision("no-such-ref")